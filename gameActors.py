@@ -0,0 +1,170 @@
+"""
+Game Actors Module
+
+This module contains the actor model of the game: a compact slotted Actor
+class whose role is an enum instead of a file name, and a BoatOccupancy
+object that keeps per bank and on boat head counts up to date on every
+board and unboard, so occupancy checks never rescan the actor list.
+It does not import pygame.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from enum import IntEnum
+
+LEFT = 0
+RIGHT = 1
+
+
+class Role(IntEnum):
+    """
+    Role of an actor; people roles double as indexes of head counts.
+    """
+    MISSIONARY = 0
+    CANNIBAL = 1
+    BOAT = 2
+
+    @property
+    def file(self):
+        """
+        Sprite file of the role.
+        """
+        return ROLE_FILES[self]
+
+
+ROLE_FILES = ("missionary.png", "cannibal.png", "boat.png")
+
+
+class Actor:
+    """
+    One missionary, cannibal or the boat.
+
+    Actors do not own surfaces: they refer to their areas of the sprite
+    atlas and draw the one of their orientation.
+
+    Attributes:
+    role: Role of the actor
+    sprites: Areas (unflipped, flipped) of the actor in the sprite atlas
+    flipped: True while the actor is drawn mirrored
+    rect: Pygame Rect with the actor position
+    on_boat: True while a person sits on the boat
+    right_side: True while the boat is on the right bank
+    original_position: Top left position of a person on the left bank
+    """
+    __slots__ = ("role", "sprites", "flipped", "rect", "on_boat",
+                 "right_side", "original_position")
+
+    def __init__(self, role, sprites=None, rect=None):
+        self.role = role
+        self.sprites = sprites
+        self.flipped = False
+        self.rect = rect
+        self.on_boat = False
+        self.right_side = False
+        self.original_position = None
+
+    @property
+    def file(self):
+        """
+        Sprite file of the actor.
+        """
+        return ROLE_FILES[self.role]
+
+    @property
+    def area(self):
+        """
+        Area of the sprite atlas drawn for the actor.
+        """
+        return self.sprites[self.flipped]
+
+    def flip(self):
+        """
+        Turn the actor around.
+        """
+        self.flipped = not self.flipped
+
+    def __repr__(self):
+        return f"Actor({self.role.name}, on_boat={self.on_boat})"
+
+
+class BoatOccupancy:
+    """
+    Head counts of both banks and of the boat, updated incrementally.
+
+    Attributes:
+    boat: Boat Actor
+    banks: Head counts [missionaries, cannibals] of the LEFT and RIGHT bank
+    on_board: Head counts [missionaries, cannibals] on the boat
+    passengers: List of the Actor objects on the boat, in boarding order
+    """
+    __slots__ = ("boat", "banks", "on_board", "passengers")
+
+    def __init__(self, actors):
+        self.boat = None
+        self.banks = ([0, 0], [0, 0])
+        self.on_board = [0, 0]
+        self.passengers = []
+        for actor in actors:
+            if actor.role is Role.BOAT:
+                self.boat = actor
+            elif actor.on_boat:
+                self.on_board[actor.role] += 1
+                self.passengers.append(actor)
+            else:
+                side = RIGHT if actor.right_side else LEFT
+                self.banks[side][actor.role] += 1
+
+    @property
+    def side(self):
+        """
+        Bank the boat is moored at, LEFT or RIGHT.
+        """
+        return RIGHT if self.boat.right_side else LEFT
+
+    @property
+    def count(self):
+        """
+        Number of people on the boat.
+        """
+        return len(self.passengers)
+
+    @property
+    def load(self):
+        """
+        Tuple (missionaries, cannibals) on the boat.
+        """
+        return (self.on_board[0], self.on_board[1])
+
+    def board(self, actor):
+        """
+        Move a person from the boat's bank onto the boat.
+
+        Parameters:
+        actor: Actor of a missionary or a cannibal
+        """
+        self.banks[self.side][actor.role] -= 1
+        self.on_board[actor.role] += 1
+        self.passengers.append(actor)
+        actor.on_boat = True
+
+    def unboard(self, actor):
+        """
+        Move a person from the boat onto the boat's bank.
+
+        Parameters:
+        actor: Actor of a missionary or a cannibal on the boat
+        """
+        self.on_board[actor.role] -= 1
+        self.banks[self.side][actor.role] += 1
+        self.passengers.remove(actor)
+        actor.on_boat = False
+        actor.right_side = self.boat.right_side
+
+    def cross(self):
+        """
+        Moor the boat, and everyone on it, at the other bank.
+        """
+        self.boat.right_side = not self.boat.right_side
+        for actor in self.passengers:
+            actor.right_side = self.boat.right_side
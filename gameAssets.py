@@ -0,0 +1,216 @@
+"""
+Game Assets Module
+
+This module contains the asset manager of the game. Every image and sound
+effect is decoded once and shared through a cache keyed by path, assets
+that are not needed for the first frame are decoded on a background
+thread, and music is streamed instead of decoded.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+
+import pygame
+
+
+class Deferred:
+    """
+    Asset decoded on the background thread of an AssetCache.
+
+    Attribute access is forwarded to the decoded asset, so a deferred
+    sound can be used like a pygame Sound; get() waits for the asset if
+    it is not decoded yet.
+    """
+
+    def __init__(self, future, finish=None):
+        self._future = future
+        self._finish = finish
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Return the asset, waiting for it if it is still being decoded.
+
+        Returns:
+        asset: Pygame Surface or Sound
+        """
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    value = self._future.result()
+                    if self._finish is not None:
+                        value = self._finish(value)
+                    self._value = value
+        return self._value
+
+    def ready(self):
+        """
+        Tell whether the asset finished decoding.
+        """
+        return self._future.done()
+
+    def when_ready(self, callback):
+        """
+        Call callback with the asset once it is decoded.
+
+        The callback may run on the background thread, so use it for
+        sounds only; images are converted on the display thread by get().
+
+        Parameters:
+        callback: Function taking the decoded asset
+        """
+        self._future.add_done_callback(lambda future: callback(self.get()))
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+class AssetCache:
+    """
+    Images and sounds shared by path, decoded once.
+
+    Attributes:
+    images: Dictionary from (path, alpha) to converted Surface
+    sounds: Dictionary from path to Sound
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.sounds = {}
+        self._deferred = {}
+        self._executor = None
+
+    def image(self, path, alpha=False):
+        """
+        Return an image converted to the display pixel format.
+
+        Parameters:
+        path: Image file path
+        alpha: True to keep per-pixel transparency
+
+        Returns:
+        surface: Converted Pygame Surface, shared by every caller
+        """
+        key = (path, alpha)
+        surface = self.images.get(key)
+        if surface is None:
+            deferred = self._deferred.pop(key, None)
+            if deferred is not None:
+                surface = deferred.get()
+            else:
+                surface = self._convert(pygame.image.load(path), alpha)
+            self.images[key] = surface
+        return surface
+
+    def sound(self, path):
+        """
+        Return a sound, decoding it on first use.
+
+        Parameters:
+        path: Sound file path
+
+        Returns:
+        sound: Pygame Sound, shared by every caller
+        """
+        sound = self.sounds.get(path)
+        if sound is None:
+            deferred = self._deferred.pop(path, None)
+            sound = deferred.get() if deferred else pygame.mixer.Sound(path)
+            self.sounds[path] = sound
+        return sound
+
+    @staticmethod
+    def _convert(surface, alpha):
+        if alpha:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def _submit(self, function, path):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="assets")
+        return self._executor.submit(function, path)
+
+    def prefetch_image(self, path, alpha=False):
+        """
+        Start decoding an image on the background thread.
+
+        The pixel format conversion needs the display, so it happens on
+        the thread that first calls get() on the result.
+
+        Parameters:
+        path: Image file path
+        alpha: True to keep per-pixel transparency
+
+        Returns:
+        image: Deferred image
+        """
+        key = (path, alpha)
+        if key in self.images:
+            return Deferred(self._done(self.images[key]))
+        deferred = self._deferred.get(key)
+        if deferred is None:
+            deferred = Deferred(self._submit(pygame.image.load, path),
+                                lambda surface: self._convert(surface, alpha))
+            self._deferred[key] = deferred
+        return deferred
+
+    def prefetch_sound(self, path):
+        """
+        Start decoding a sound on the background thread.
+
+        Parameters:
+        path: Sound file path
+
+        Returns:
+        sound: Deferred sound
+        """
+        if path in self.sounds:
+            return Deferred(self._done(self.sounds[path]))
+        deferred = self._deferred.get(path)
+        if deferred is None:
+            deferred = Deferred(self._submit(pygame.mixer.Sound, path))
+            self._deferred[path] = deferred
+        return deferred
+
+    @staticmethod
+    def _done(value):
+        future = Future()
+        future.set_result(value)
+        return future
+
+    def shutdown(self):
+        """
+        Stop the background thread once pending assets are decoded.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def play_music(path, volume, loops=-1):
+    """
+    Stream a music file instead of decoding it into memory.
+
+    pygame.mixer.music decodes the file in small chunks while playing,
+    so a long track costs neither load time nor a full PCM buffer.
+
+    Parameters:
+    path: Music file path
+    volume: Volume between 0 and 1
+    loops: Number of repeats, -1 to loop forever
+
+    Returns:
+    music: The pygame.mixer.music streaming player
+    """
+    pygame.mixer.music.load(path)
+    pygame.mixer.music.set_volume(volume)
+    pygame.mixer.music.play(loops)
+    return pygame.mixer.music
+
+
+assets = AssetCache()
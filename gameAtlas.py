@@ -0,0 +1,126 @@
+"""
+Game Atlas Module
+
+This module contains the sprite atlas of the game. The missionary,
+cannibal and boat images are packed into one converted surface when the
+game starts, together with the mirrored boat, so actors only refer to
+areas of that surface and an orientation flag. Turning the boat around at
+a bank switches areas instead of allocating a flipped surface.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from functools import lru_cache
+
+import pygame
+
+from gameActors import ROLE_FILES, Role
+
+ATLAS_WIDTH = 1024
+# Rows of an odd number of pixels take pygame's slow alpha blitter, so
+# the atlas width is rounded up to a multiple of this.
+WIDTH_MULTIPLE = 4
+# Roles whose sprite is also stored mirrored, for the trip back.
+FLIPPED_ROLES = (Role.BOAT,)
+
+
+def pack(sizes, width=ATLAS_WIDTH):
+    """
+    Place rectangles in shelves, tallest first.
+
+    Parameters:
+    sizes: List of (width, height) tuples
+    width: Width of the atlas; wider rectangles get a shelf of their own
+
+    Returns:
+    positions: List of (x, y) top left positions, in the order of sizes
+    size: (width, height) of the atlas
+    """
+    order = sorted(range(len(sizes)), key=lambda index: -sizes[index][1])
+    positions = [None] * len(sizes)
+    x = y = shelf_height = used_width = 0
+    for index in order:
+        w, h = sizes[index]
+        if x and x + w > width:
+            y += shelf_height
+            x = shelf_height = 0
+        positions[index] = (x, y)
+        x += w
+        used_width = max(used_width, x)
+        shelf_height = max(shelf_height, h)
+    return positions, (used_width, y + shelf_height)
+
+
+class SpriteAtlas:
+    """
+    Every actor sprite packed into one surface.
+
+    Attributes:
+    surface: Pygame Surface holding every sprite
+    areas: Dictionary from (role, flipped) to the Rect of that sprite in
+    surface; roles that are never flipped map both keys to one Rect
+    """
+
+    def __init__(self, images):
+        """
+        Pack the images of the roles, with the mirrored images of
+        FLIPPED_ROLES.
+
+        Parameters:
+        images: Dictionary from Role to Pygame Surface
+        """
+        sprites = [(role, False, image) for role, image in images.items()]
+        sprites += [(role, True, pygame.transform.flip(image, True, False))
+                    for role, image in images.items()
+                    if role in FLIPPED_ROLES]
+        positions, (width, height) = pack(
+            [image.get_size() for _, _, image in sprites])
+        width += -width % WIDTH_MULTIPLE
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.areas = {}
+        for (role, flipped, image), position in zip(sprites, positions):
+            self.areas[role, flipped] = self.surface.blit(image, position)
+        for role in images:
+            self.areas.setdefault((role, True), self.areas[role, False])
+
+    def sprites(self, role):
+        """
+        Return the areas of a role, unflipped and flipped.
+
+        Parameters:
+        role: Role of the actor
+
+        Returns:
+        sprites: Tuple of two Rect objects indexed by the flipped flag
+        """
+        return self.areas[role, False], self.areas[role, True]
+
+    def convert(self):
+        """
+        Convert the surface to the display pixel format.
+
+        Returns:
+        atlas: The atlas itself
+        """
+        self.surface = self.surface.convert_alpha()
+        return self
+
+
+@lru_cache(maxsize=None)
+def load_atlas(files=ROLE_FILES):
+    """
+    Build the atlas of the role sprites, only once.
+
+    The files are decoded straight into the atlas, so no other copy of
+    the sprites stays in memory.
+
+    Parameters:
+    files: Sprite file of every Role, in Role order
+
+    Returns:
+    atlas: SpriteAtlas converted to the display pixel format
+    """
+    images = {Role(index): pygame.image.load(path)
+              for index, path in enumerate(files)}
+    return SpriteAtlas(images).convert()
@@ -0,0 +1,307 @@
+"""
+Game Benchmark Module
+
+This module contains the benchmark suite of the game. It times the graph
+build, the solver, move resolution, click bursts and ferry frames with
+SDL's dummy video driver, so it runs without a display, and
+writes the results as JSON. A saved result file can be used as baseline
+to flag regressions. pygame is only imported for the click and frame
+benchmarks, which --headless skips.
+
+Usage:
+python gameBench.py [--output FILE] [--compare BASELINE] [--threshold 0.25]
+python gameBench.py --headless --quick
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+from time import perf_counter
+
+from gameActors import BoatOccupancy
+from gameCore import (GameCore, create_gamegraph, headless_passengers,
+                      passengersCombination)
+from gameSolver import Solver
+from stateGraph import StateGraph
+
+GRAPH_SIZES = ((3, 3, 2), (10, 10, 3), (100, 100, 4), (1000, 1000, 2))
+QUICK_GRAPH_SIZES = GRAPH_SIZES[:2]
+BURST_SIZE = 64
+FRAME_DT = 1 / 120
+THRESHOLD = 0.25
+OUTPUT_FILE = "bench_results.json"
+
+
+def timed(function, number=1, repeat=5):
+    """
+    Time a function the way timeit does, reporting per call seconds.
+
+    Parameters:
+    function: Function without arguments
+    number: Calls per measurement
+    repeat: Number of measurements
+
+    Returns:
+    result: Dictionary with the best and median seconds per call and
+    the number of calls per measurement
+    """
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            function()
+        times.append((perf_counter() - start) / number)
+    return {"best": min(times), "median": statistics.median(times),
+            "number": number}
+
+
+def bench_graph(results, sizes=GRAPH_SIZES):
+    """
+    Time StateGraph and create_gamegraph at increasing (M, C, K).
+    """
+    for m, c, k in sizes:
+        number = 200 if m < 50 else 1
+        results[f"graph.build[{m},{c},{k}]"] = timed(
+            lambda: StateGraph(m, c, k), number, 3)
+        results[f"graph.create_gamegraph[{m},{c},{k}]"] = timed(
+            lambda: create_gamegraph(m, c, k), number, 3)
+
+
+def bench_solver(results, sizes=GRAPH_SIZES):
+    """
+    Time the shortest path search on prebuilt graphs.
+    """
+    for m, c, k in sizes:
+        graph = StateGraph(m, c, k)
+        number = 200 if m < 50 else 1
+        results[f"solver.solve[{m},{c},{k}]"] = timed(
+            lambda: Solver(graph).min_moves(), number, 3)
+
+
+def bench_moves(results):
+    """
+    Time the move resolution of game_loop: matching the passengers on
+    the boat to a move and stepping the game state, for a whole
+    optimal game.
+    """
+    gamegraph = create_gamegraph()
+    core = GameCore(gamegraph, headless_passengers(), passengersCombination())
+    keys = ("m1c1", "m1", "c1c2", "c1", "m1m2", "m1c1",
+            "m1m2", "c1", "c1c2", "m1", "m1c1")
+    clicks = [core.passengers[key] for key in keys]
+    state, outcome = core.replay(map(core.resolve, clicks))
+    if outcome != "success":
+        raise RuntimeError(f"the benchmark game ended with {outcome!r}")
+
+    def resolve_and_step():
+        state = core.initial_state()
+        for clicked_actors in clicks:
+            state, _ = core.step(state, core.resolve(clicked_actors))
+
+    results["moves.game"] = timed(resolve_and_step, 2000)
+
+
+class _Scene:
+    """
+    Window, actors and renderer of a headless game.
+
+    pygame and the modules using it are imported here, with SDL's dummy
+    video driver unless another one is set, so the headless benchmarks
+    never load them.
+    """
+
+    def __init__(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        import gameFunctions
+        from gameInput import InputDispatcher
+        from gameRender import Renderer, load_image
+        self.pygame = pygame
+        self.game = gameFunctions
+        self._dispatcher = InputDispatcher
+        pygame.display.init()
+        pygame.font.init()
+        self.window = pygame.display.set_mode(
+            (gameFunctions.SCREEN_WIDTH, gameFunctions.SCREEN_HEIGHT))
+        self.arena = self.window.get_rect()
+        background = load_image("backGround.jpg")
+        self.renderer = Renderer(self.window, background,
+                                 background.get_rect(),
+                                 gameFunctions.MOVES_FONT_SIZE)
+        self.actors = gameFunctions.create_actors(self.arena)[0]
+
+    def reset(self):
+        self.game.reset_actors(self.actors, self.arena)
+        return BoatOccupancy(self.actors), self._dispatcher(self.actors)
+
+
+class _Silent:
+    """
+    Click sound that plays nothing, so the mixer thread does not add
+    noise to the input timings.
+    """
+
+    def play(self):
+        pass
+
+
+def bench_clicks(results, scene):
+    """
+    Time get_mouse_click on a burst of clicks in one frame.
+
+    The burst hits every person on the left bank in turn and some empty
+    water, so it covers boarding, full boat rejections and misses.
+    """
+    pygame = scene.pygame
+    game = scene.game
+    sound = _Silent()
+    people = [actor for actor in scene.actors if actor.original_position]
+    targets = [actor.rect.center for actor in people] + [(640, 40)]
+    events = [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1,
+                                 pos=targets[i % len(targets)])
+              for i in range(BURST_SIZE)]
+
+    def burst():
+        occupancy, dispatcher = scene.reset()
+        dispatcher.dispatch(events)
+        game.get_mouse_click(
+            dispatcher, scene.arena, game.BOAT_START_Y, [],
+            sound, occupancy)
+
+    results[f"input.click_burst[{BURST_SIZE}]"] = timed(burst, 200)
+
+
+def bench_frame(results, scene):
+    """
+    Time one ferry frame: moving the boat and two passengers, then
+    rendering the frame with the dirty rectangle renderer.
+    """
+    occupancy, _ = scene.reset()
+    for actor in scene.actors[:2]:
+        occupancy.board(actor)
+    scene.renderer.invalidate()
+    scene.renderer.draw(scene.actors, 0)
+    ferry = {"direction": 1, "x": float(occupancy.boat.rect.x)}
+
+    def frame():
+        done, ferry["x"] = scene.game.ferry(
+            occupancy, ferry["direction"], FRAME_DT, ferry["x"])
+        if done:
+            ferry["direction"] = -ferry["direction"]
+        scene.renderer.draw(scene.actors, 0)
+
+    results["frame.ferry_render"] = timed(frame, 500)
+
+    def idle_frame():
+        scene.renderer.draw(scene.actors, 0)
+
+    results["frame.idle_render"] = timed(idle_frame, 500)
+
+
+def run(quick=False, headless=False):
+    """
+    Run the whole suite.
+
+    Parameters:
+    quick: True to skip the large graph sizes
+    headless: True to skip the click and frame benchmarks, which need
+    pygame
+
+    Returns:
+    report: Dictionary with the environment under "meta" and the
+    timings under "results"
+    """
+    sizes = QUICK_GRAPH_SIZES if quick else GRAPH_SIZES
+    results = {}
+    meta = {"python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine()}
+    bench_graph(results, sizes)
+    bench_solver(results, sizes)
+    bench_moves(results)
+    if not headless:
+        scene = _Scene()
+        meta["pygame"] = scene.pygame.version.ver
+        bench_clicks(results, scene)
+        bench_frame(results, scene)
+    return {"meta": meta, "results": results}
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Find the benchmarks that got slower than a baseline.
+
+    The best time is compared, since it is the least sensitive to noise.
+
+    Parameters:
+    results: "results" dictionary of a report
+    baseline: "results" dictionary of the baseline report
+    threshold: Allowed slowdown, 0.25 for 25%
+
+    Returns:
+    rows: List of tuples (name, baseline seconds, seconds, ratio,
+    regressed) for the benchmarks found in both reports
+    """
+    rows = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]["best"]
+        ratio = result["best"] / base if base else float("inf")
+        rows.append((name, base, result["best"], ratio,
+                     ratio > 1 + threshold))
+    return rows
+
+
+def _format_time(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.2f} ms"
+    return f"{seconds * 1e6:9.2f} us"
+
+
+def main(argv=None):
+    """
+    Run the suite, save it and compare it to a baseline if asked.
+
+    Returns:
+    status: 1 if a benchmark regressed, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(
+        description="Time the graph, solver, input and frame code of the "
+                    "game and compare the results with a baseline.")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--compare", metavar="BASELINE")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--headless", action="store_true",
+                        help="skip the benchmarks needing pygame")
+    args = parser.parse_args(argv)
+
+    report = run(args.quick, args.headless)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    for name, result in report["results"].items():
+        print(f"{name:40} {_format_time(result['best'])}")
+    if not args.compare:
+        return 0
+    with open(args.compare) as file:
+        baseline = json.load(file)["results"]
+    status = 0
+    print()
+    for name, base, best, ratio, regressed in compare(
+            report["results"], baseline, args.threshold):
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:40} {_format_time(base)} -> {_format_time(best)}"
+              f" {ratio:6.2f}x {flag}")
+        status = status or int(regressed)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
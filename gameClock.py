@@ -0,0 +1,83 @@
+"""
+Game Clock Module
+
+This module contains the adaptive frame scheduler of the game loop. While
+an animation runs the loop is ticked at full frame rate; while the game
+only listens for input the scheduler blocks on the event queue, so an idle
+game uses almost no CPU.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from time import perf_counter
+
+import pygame
+
+ACTIVE_FPS = 120
+IDLE_TIMEOUT = 250
+MAX_FRAME_TIME = 0.05
+
+
+class FrameScheduler:
+    """
+    Decide how long each frame of the game loop waits.
+
+    Attributes:
+    active_fps: Frame rate used while something is animating
+    idle_timeout: Longest time in milliseconds an idle frame blocks
+    waiting for an event
+    max_frame_time: Upper bound in seconds of the returned frame time,
+    so the first frame after an idle wait does not jump
+    waited: Seconds the last next_frame() call spent blocked, which
+    the profiler does not count as event handling
+    """
+
+    def __init__(self, active_fps=ACTIVE_FPS, idle_timeout=IDLE_TIMEOUT,
+                 max_frame_time=MAX_FRAME_TIME):
+        self.active_fps = active_fps
+        self.idle_timeout = idle_timeout
+        self.max_frame_time = max_frame_time
+        self.clock = pygame.time.Clock()
+        self.waited = 0.0
+        self._active = False
+
+    def next_frame(self, active, timeout=None):
+        """
+        Wait for the next frame and collect its events.
+
+        Parameters:
+        active: True while an animation is running
+        timeout: Optional longest idle wait in milliseconds, for instance
+        until a timed screen ends; 0 or less only polls the queue
+
+        Returns:
+        events: List of Pygame events of this frame
+        dt: Elapsed time since the previous frame, in seconds
+        """
+        if active:
+            if not self._active:
+                # Restart timing so the idle wait before this frame does
+                # not count as animation time.
+                self.clock.tick()
+            start = perf_counter()
+            dt = self.clock.tick(self.active_fps) / 1000
+            self.waited = perf_counter() - start
+            events = pygame.event.get()
+        else:
+            wait = self.idle_timeout
+            if timeout is not None:
+                wait = min(wait, timeout)
+            start = perf_counter()
+            if wait > 0:
+                event = pygame.event.wait(wait)
+            else:
+                # pygame.event.wait(0) blocks until the next event.
+                event = pygame.event.Event(pygame.NOEVENT)
+            self.waited = perf_counter() - start
+            events = pygame.event.get()
+            if event.type != pygame.NOEVENT:
+                events.insert(0, event)
+            dt = self.clock.tick() / 1000
+        self._active = active
+        return events, min(dt, self.max_frame_time)
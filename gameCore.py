@@ -0,0 +1,300 @@
+"""
+Game Core Module
+
+This module contains the rules of the game without any rendering: the
+game graph, the passenger configurations and a pure state machine that
+applies boat loads to a game state. It does not import pygame, so games
+can be simulated and replayed without a window.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from collections import namedtuple
+
+from gameActors import Actor, Role
+from stateGraph import FAILURE as GRAPH_FAILURE
+from stateGraph import SUCCESS as GRAPH_SUCCESS
+from stateGraph import StateGraph, boat_loads, load_label
+
+BOAT_MAX_CAPACITY = 2
+START_STATE = (3, 3, 1)
+ILLEGAL = "illegal"
+MOVED = "moved"
+FAILURE = "failure"
+SUCCESS = "success"
+
+GameState = namedtuple("GameState", ["gamestate", "movement_count"])
+
+
+def create_gamegraph(missionaries=3, cannibals=3,
+                     capacity=BOAT_MAX_CAPACITY, cache=None):
+    """
+    Create the game graph representing possible states and transitions.
+
+    The graph is generated by stateGraph.StateGraph and returned as a
+    dictionary compatible view, so gamegraph[gamestate][move] keeps
+    working for any number of missionaries, cannibals and boat capacity.
+
+    Parameters:
+    missionaries: Number of missionaries
+    cannibals: Number of cannibals
+    capacity: Maximum number of people on the boat
+    cache: Optional graphStore.GraphCache to map the graph from, built
+    and saved there the first time
+
+    Returns:
+    gamegraph: Dictionary representing the game graph
+    """
+    if cache is not None:
+        graph, _ = cache.load(missionaries, cannibals, capacity)
+        return graph.as_gamegraph()
+    return StateGraph(missionaries, cannibals, capacity).as_gamegraph()
+
+
+def passengers(missionaries, cannibals, boat):
+    """
+    Define possible passenger configurations.
+
+    Parameters:
+    missionaries: List of missionary Actor objects
+    cannibals: List of cannibal Actor objects
+    boat: Actor representing the boat
+
+    Returns:
+    passengers: Dictionary representing possible passenger configurations
+    """
+    passengers = {
+        "m1": [missionaries[0], boat],
+        "m2": [missionaries[1], boat],
+        "m3": [missionaries[2], boat],
+        "c1": [cannibals[0], boat],
+        "c2": [cannibals[1], boat],
+        "c3": [cannibals[2], boat],
+        "m1m2": [missionaries[0], missionaries[1], boat],
+        "m1m3": [missionaries[0], missionaries[2], boat],
+        "m2m3": [missionaries[1], missionaries[2], boat],
+        "c1c2": [cannibals[0], cannibals[1], boat],
+        "c1c3": [cannibals[0], cannibals[2], boat],
+        "c2c3": [cannibals[1], cannibals[2], boat],
+        "m1c1": [missionaries[0], cannibals[0], boat],
+        "m1c2": [missionaries[0], cannibals[1], boat],
+        "m1c3": [missionaries[0], cannibals[2], boat],
+        "m2c1": [missionaries[1], cannibals[0], boat],
+        "m2c2": [missionaries[1], cannibals[1], boat],
+        "m2c3": [missionaries[1], cannibals[2], boat],
+        "m3c1": [missionaries[2], cannibals[0], boat],
+        "m3c2": [missionaries[2], cannibals[1], boat],
+        "m3c3": [missionaries[2], cannibals[2], boat],
+    }
+    return passengers
+
+
+def passengersCombination():
+    """
+    Define valid combinations of passengers.
+
+    Parameters:
+    None
+
+    Returns:
+    passengersCombination: Dictionary representing
+    valid combinations of passengers
+    """
+    passengersCombination = {
+        "m1": "m",
+        "m2": "m",
+        "m3": "m",
+        "c1": "c",
+        "c2": "c",
+        "c3": "c",
+        "m1m2": "2m",
+        "m1m3": "2m",
+        "m2m3": "2m",
+        "c1c2": "2c",
+        "c1c3": "2c",
+        "c2c3": "2c",
+        "m1c1": "mc",
+        "m1c2": "mc",
+        "m1c3": "mc",
+        "m2c1": "mc",
+        "m2c2": "mc",
+        "m2c3": "mc",
+        "m3c1": "mc",
+        "m3c2": "mc",
+        "m3c3": "mc"
+    }
+    return passengersCombination
+
+
+def build_move_index(capacity=BOAT_MAX_CAPACITY):
+    """
+    Map every canonical boat load to its move label.
+
+    Parameters:
+    capacity: Maximum number of people on the boat
+
+    Returns:
+    move_index: Dictionary from (missionaries, cannibals) on the boat
+    to the move label used by the game graph
+    """
+    return {load: load_label(*load) for load in boat_loads(capacity)}
+
+
+def headless_passengers():
+    """
+    Build the passenger configurations without loading any sprites.
+
+    Returns:
+    passengers: Dictionary of passenger configurations whose actors have
+    a role but no surface or rect
+    """
+    missionaries = [Actor(Role.MISSIONARY) for _ in range(3)]
+    cannibals = [Actor(Role.CANNIBAL) for _ in range(3)]
+    boat = Actor(Role.BOAT)
+    return passengers(missionaries, cannibals, boat)
+
+
+class GameCore:
+    """
+    Pure state machine of one game.
+
+    Attributes:
+    gamegraph: Dictionary representing the game graph
+    passengers: Dictionary representing possible passenger configurations
+    passengersCombination: Dictionary mapping passenger configurations
+    to move labels
+    start: Game state a new game starts from, by default the start of
+    a generated graph or START_STATE
+    move_index: Dictionary from passengers keys and boat loads to
+    move labels
+    """
+
+    def __init__(self, gamegraph, passengers, passengersCombination,
+                 start=None, capacity=None):
+        self.gamegraph = gamegraph
+        self.passengers = passengers
+        self.passengersCombination = passengersCombination
+        graph = getattr(gamegraph, "graph", None)
+        if start is None:
+            start = graph.decode(graph.start) if graph else START_STATE
+        self.start = start
+        if capacity is None:
+            capacity = graph.capacity if graph else BOAT_MAX_CAPACITY
+        # One lookup resolves either a passengers key such as "m1c2" or
+        # a (missionaries, cannibals) boat load to its move label.
+        self.move_index = build_move_index(capacity)
+        self.move_index.update(passengersCombination)
+        self._graph = graph
+
+    def initial_state(self):
+        """
+        Return the state of a new game.
+
+        Returns:
+        state: GameState at the start with no moves made
+        """
+        return GameState(self.start, 0)
+
+    def resolve(self, clicked_actors):
+        """
+        Find the boat load formed by the clicked actors.
+
+        Parameters:
+        clicked_actors: List of Actor objects, boat included
+
+        Returns:
+        load: Tuple (missionaries, cannibals) on the boat, or None if
+        it is not a legal boat load
+        """
+        counts = [0, 0, 0]
+        for actor in clicked_actors:
+            counts[actor.role] += 1
+        load = (counts[Role.MISSIONARY], counts[Role.CANNIBAL])
+        return load if load in self.move_index else None
+
+    def step(self, state, passengers):
+        """
+        Ferry one passenger configuration across the river.
+
+        Parameters:
+        state: Current GameState
+        passengers: Key of the passengers dictionary, such as "m1c2",
+        or a (missionaries, cannibals) boat load
+
+        Returns:
+        state: GameState after the move, unchanged if it is illegal
+        outcome: ILLEGAL, MOVED, FAILURE or SUCCESS
+        """
+        move = self.move_index.get(passengers)
+        if self._graph is not None:
+            return self._step_graph(state, move)
+        moves = self.gamegraph.get(state.gamestate)
+        if moves is None or isinstance(moves, str) or move is None or \
+                move not in moves:
+            return state, ILLEGAL
+        gamestate = moves[move]
+        state = GameState(gamestate, state.movement_count + 1)
+        outcome = self.gamegraph[gamestate]
+        if outcome == FAILURE:
+            return state, FAILURE
+        if outcome == SUCCESS:
+            return state, SUCCESS
+        return state, MOVED
+
+    def _step_graph(self, state, move):
+        """
+        Same as step, straight on the arrays of a generated graph
+        instead of through its dictionary view.
+        """
+        graph = self._graph
+        load_id = graph.label_ids.get(move)
+        try:
+            state_id = graph.encode(state.gamestate)
+        except (KeyError, TypeError, ValueError):
+            return state, ILLEGAL
+        if load_id is None or not graph.reachable[state_id]:
+            return state, ILLEGAL
+        target = graph.transition(state_id, load_id)
+        if target < 0:
+            return state, ILLEGAL
+        state = GameState(graph.decode(target), state.movement_count + 1)
+        kind = graph.kind[target]
+        if kind == GRAPH_FAILURE:
+            return state, FAILURE
+        if kind == GRAPH_SUCCESS:
+            return state, SUCCESS
+        return state, MOVED
+
+    def replay(self, moves, state=None):
+        """
+        Apply a sequence of passenger configurations until the game ends.
+
+        Parameters:
+        moves: Iterable of passengers dictionary keys or boat loads
+        state: GameState to start from, defaults to a new game
+
+        Returns:
+        state: Last GameState reached
+        outcome: Outcome of the last move, MOVED if moves was empty
+        """
+        if state is None:
+            state = self.initial_state()
+        outcome = MOVED
+        for passengers in moves:
+            state, outcome = self.step(state, passengers)
+            if outcome != MOVED:
+                break
+        return state, outcome
+
+
+def create_core():
+    """
+    Create a headless game core for the standard 3/3/2 game.
+
+    Returns:
+    core: GameCore built from create_gamegraph, headless_passengers
+    and passengersCombination
+    """
+    return GameCore(create_gamegraph(), headless_passengers(),
+                    passengersCombination())
@@ -11,12 +11,20 @@ Date: 18/12/2023
 """
 import sys
 import pygame
+from gameActors import Actor, BoatOccupancy, Role
+from gameAssets import assets, play_music
+from gameAtlas import load_atlas
+from gameClock import FrameScheduler
+from gameInput import InputDispatcher
+from gameProfiler import NULL_PROFILER, FrameProfiler
+from gameRecord import GameRecorder
+from gameScenes import Scene, SceneQueue
+from gameRender import ProfilerHud, Renderer, load_image, render_text
+from gameCore import BOAT_MAX_CAPACITY, ILLEGAL, GameCore
 FONT_SIZE_LARGE = 48
 FONT_SIZE_SMALL = 15
 LINE_HEIGHT = 25
 MOVES_FONT_SIZE = 24
-BOAT_MAX_CAPACITY = 2
-MOUSE_BUTTON_LEFT = 1
 WAIT_FAILURE = 3000
 WAIT_SUCCESS = 2000
 WAIT_GAME_EXPLANATION = 7000
@@ -26,7 +34,13 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 650
 BOAT_START_X = 480
 BOAT_START_Y = 250
+# Docks where the boat stops; the fixed 5 px step used to bounce back
+# to these positions after crossing the 480 and 970 limits.
+BOAT_LEFT_X = 485
+BOAT_RIGHT_X = 965
+BOAT_SPEED = 600
 LINE_SPACING_FACTOR = 10
+RECORD_FILE = "games.mcr"
 
 
 def initialize_game():
@@ -41,31 +55,32 @@ def initialize_game():
     Returns:
     window: Pygame window object
     arena: Pygame Rect object representing the game arena
-    backGroundMusic: Pygame Sound object for background music
+    backGroundMusic: pygame.mixer.music player streaming the music
     clickSound: Pygame Sound object for click sound
-    gameOverSound: Pygame Sound object for game over sound
-    winSound: Pygame Sound object for win sound
+    gameOverSound: Deferred Sound object for game over sound
+    winSound: Deferred Sound object for win sound
     background: Pygame Surface object for the game background
     backRec: Rect object for the background
-    winnerImg: Pygame Surface object for the winner image
-    winnerRec: Rect object for the winner image
+    winnerImg: Deferred Surface object for the winner image
+    winnerRec: Rect object with the position of the winner image
     """
     pygame.init()
     pygame.mixer.init()
     window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     arena = window.get_rect()
-    backGroundMusic = pygame.mixer.Sound("GameBackGroundSound.mp3")
-    clickSound = pygame.mixer.Sound("clickSound.wav")
-    gameOverSound = pygame.mixer.Sound("gameOver.wav")
-    winSound = pygame.mixer.Sound("winSound.wav")
-    backGroundMusic.set_volume(.1)
+    # Only the background and the click sound are needed for the first
+    # frames; the other effects are decoded on the asset thread meanwhile
+    # and the music is streamed.
+    backGroundMusic = play_music("GameBackGroundSound.mp3", .1)
+    gameOverSound = assets.prefetch_sound("gameOver.wav")
+    winSound = assets.prefetch_sound("winSound.wav")
+    winnerImg = assets.prefetch_image("winner.jpg")
+    winnerRec = pygame.Rect(0, 0, 0, 0)
+    clickSound = assets.sound("clickSound.wav")
     clickSound.set_volume(1)
-    gameOverSound.set_volume(.7)
-    backGroundMusic.play(-1)
-    background = pygame.image.load("backGround.jpg")
+    gameOverSound.when_ready(lambda sound: sound.set_volume(.7))
+    background = load_image("backGround.jpg")
     backRec = background.get_rect()
-    winnerImg = pygame.image.load("winner.jpg")
-    winnerRec = winnerImg.get_rect()
     return window, arena, backGroundMusic, clickSound, \
         gameOverSound, winSound, background, backRec, winnerImg, winnerRec
 
@@ -78,145 +93,209 @@ def create_actors(arena):
     arena: Pygame Rect object representing the game arena
 
     Returns:
-    actors: List of actor dictionaries
-    missionaries: List of missionary dictionaries
-    cannibals: List of cannibal dictionaries
-    boat_actor: Dictionary representing the boat actor
+    actors: List of Actor objects
+    missionaries: List of missionary Actor objects
+    cannibals: List of cannibal Actor objects
+    boat_actor: Actor representing the boat
     """
     actors_per_line = 3
     line_spacing = arena.height / LINE_SPACING_FACTOR
-    boat_right_side = False
-    cannibal1 = {"file": "cannibal.png"}
-    cannibal2 = {"file": "cannibal.png"}
-    cannibal3 = {"file": "cannibal.png"}
-    missionary1 = {"file": "missionary.png"}
-    missionary2 = {"file": "missionary.png"}
-    missionary3 = {"file": "missionary.png"}
-    boat = {"file": "boat.png"}
-    missionaries = [missionary1, missionary2, missionary3]
-    cannibals = [cannibal1, cannibal2, cannibal3]
-    boat_actor = boat
-    actors = [cannibal1, cannibal2, cannibal3, missionary1, missionary2,
-              missionary3, boat]
+    cannibals = [Actor(Role.CANNIBAL) for _ in range(3)]
+    missionaries = [Actor(Role.MISSIONARY) for _ in range(3)]
+    boat_actor = Actor(Role.BOAT)
+    actors = cannibals + missionaries + [boat_actor]
+    atlas = load_atlas()
     for i, actor in enumerate(actors):
-        if actor["file"] == "boat.png":
-            actor["surf"] = pygame.image.load(actor["file"])
-            actor["rect"] = actor["surf"].get_rect()
-            actor["rect"].midleft = (
+        actor.sprites = atlas.sprites(actor.role)
+        actor.rect = pygame.Rect((0, 0), actor.area.size)
+        if actor.role is Role.BOAT:
+            actor.rect.midleft = (
                 BOAT_START_X, arena.center[1] + BOAT_START_Y
                 )
-            actor["on_boat"] = False
-            actor["right_side"] = boat_right_side
         else:
-            actor["surf"] = pygame.image.load(actor["file"])
-            actor["rect"] = actor["surf"].get_rect()
             line = i // actors_per_line
             index_in_line = i % actors_per_line
-            actor["rect"].midleft = (
+            actor.rect.midleft = (
                 30*i,
                 (line * line_spacing) + (index_in_line + 5) * line_spacing)
-            actor["on_boat"] = False
-            actor["original_position"] = actor["rect"].topleft
-            actor["right_side"] = boat_right_side
+            actor.original_position = actor.rect.topleft
     return actors, missionaries, cannibals, boat_actor
 
 
+def reset_actors(actors, arena):
+    """
+    Put every actor back at its starting position for a new round.
+
+    Parameters:
+    actors: List of Actor objects
+    arena: Pygame Rect object representing the game arena
+
+    Returns:
+    None
+    """
+    for actor in actors:
+        actor.on_boat = False
+        actor.right_side = False
+        actor.flipped = False
+        if actor.role is Role.BOAT:
+            actor.rect.midleft = (
+                BOAT_START_X, arena.center[1] + BOAT_START_Y)
+        else:
+            actor.rect.topleft = actor.original_position
+
+
 def game_loop(window, arena, actors, gamegraph, passengers,
               passengersCombination, clickSound,
               gameOverSound, winSound, background, backRec, winnerImg,
-              winnerRec):
+              winnerRec, profile_hud=False, trace_path=None,
+              record_path=None):
     """
     Main game loop controlling the game's flow and actions.
 
     Parameters:
     window: Pygame window object
     arena: Pygame Rect object representing the game arena
-    actors: List of actor dictionaries
+    actors: List of Actor objects
     gamegraph: Dictionary representing the game graph for possible states
     passengers: Dictionary representing possible passenger configurations
     passengersCombination: Dictionary representing valid combinations
     of passengers
-    backGroundMusic: Pygame Sound object for background music
+    backGroundMusic: pygame.mixer.music player streaming the music
     clickSound: Pygame Sound object for click sound
-    gameOverSound: Pygame Sound object for game over sound
-    winSound: Pygame Sound object for win sound
+    gameOverSound: Deferred Sound object for game over sound
+    winSound: Deferred Sound object for win sound
     background: Pygame Surface object for the game background
     backRec: Rect object for the background
-    winnerImg: Pygame Surface object for the winner image
-    winnerRec: Rect object for the winner image
+    winnerImg: Deferred Surface object for the winner image
+    winnerRec: Rect object with the position of the winner image
+    profile_hud: True to show frame timings over the game
+    trace_path: Optional CSV or JSON file the frame timings are written
+    to when the game exits
+    record_path: Optional game record file every boat load is appended to
 
     Returns:
     None
     """
-    movement_count = 0
-    ferry_step = -5
-    action = "listen"
-    gamestate = (3, 3, 1)
-    fpsClock = pygame.time.Clock()
-    welcomeScreen(window, arena)
-    gameExplanationScreen(window, arena)
-    clicked_actors = []
+    core = GameCore(gamegraph, passengers, passengersCombination)
+    scheduler = FrameScheduler()
+    profiler = NULL_PROFILER
+    if profile_hud or trace_path:
+        profiler = FrameProfiler(record=trace_path is not None)
+    hud = ProfilerHud(profiler) if profile_hud else None
+    renderer = Renderer(window, background, backRec, MOVES_FONT_SIZE,
+                        profiler, hud, load_atlas())
+    recorder = None
+    if record_path:
+        recorder = GameRecorder(record_path, gamegraph.graph)
+    try:
+        _run_rounds(window, arena, actors, core, scheduler, renderer,
+                    profiler, recorder, clickSound, gameOverSound, winSound,
+                    winnerImg, winnerRec)
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if trace_path:
+            profiler.end_frame()
+            profiler.export(trace_path)
+
+
+def _run_rounds(window, arena, actors, core, scheduler, renderer, profiler,
+                recorder, clickSound, gameOverSound, winSound, winnerImg,
+                winnerRec):
+    """
+    Play rounds until the player quits; see game_loop.
+    """
+    scenes = SceneQueue()
+    scenes.push(Scene(lambda: welcomeScreen(window, arena), WAIT_QUIT))
+    scenes.push(Scene(lambda: gameExplanationScreen(window, arena),
+                      WAIT_GAME_EXPLANATION))
+    # Scenes are drawn as soon as they are queued, so the frame
+    # scheduler waits for their deadline instead of an event.
+    scenes.update(())
+    action = "new round"
     while True:
-        events = pygame.event.get()
+        profiler.begin_frame()
+        if action == "new round":
+            reset_actors(actors, arena)
+            occupancy = BoatOccupancy(actors)
+            dispatcher = InputDispatcher(actors)
+            state = core.initial_state()
+            if recorder is not None:
+                recorder.new_game()
+            clicked_actors = []
+            ferry_direction = -1
+            boat_x = float(BOAT_START_X)
+            outcome = None
+            action = "listen"
+            if not scenes.active:
+                renderer.draw(actors, state.movement_count)
+        events, dt = scheduler.next_frame(
+            action == "ferry", scenes.time_left())
+        dispatcher.dispatch(
+            events, accept_clicks=action == "listen" and not scenes.active)
+        profiler.mark("events", scheduler.waited)
+        if dispatcher.quit_requested:
+            sys.exit()
+        if scenes.active:
+            showing = scenes.update(events)
+            profiler.mark("display")
+            if showing:
+                continue
+            renderer.invalidate()
+            if action == "result":
+                action = "new round"
+                continue
         if action == "listen":
-            boat_objects_count = sum(
-                actor["on_boat"]
-                for actor in actors
-                if actor["file"] != "boat.png")
             clicked_actors, on_boat = get_mouse_click(
-                actors, events, arena,
-                BOAT_START_Y, clicked_actors, clickSound
+                dispatcher, arena,
+                BOAT_START_Y, clicked_actors, clickSound, occupancy
                             )
-            if clicked_actors and on_boat is not None:
-                travelers = [actor["file"] for actor in clicked_actors]
-                for key, value in passengers.items():
-                    clicked_actors_tuple = tuple(
-                        (actor["file"], actor.get("original_position"))
-                        for actor in clicked_actors)
-                    if set(clicked_actors_tuple) == set(
-                        (actor["file"], actor.get("original_position"))
-                        for actor in value
-                            ):
-                        for key2, values2 in passengersCombination.items():
-                            if (key == key2):
-                                if values2 in gamegraph[gamestate]:
-                                    gamestate = gamegraph[gamestate][values2]
-                                    ferry_who = clicked_actors
-                                    if on_boat and "boat.png" in travelers:
-                                        if boat_objects_count > 0:
-                                            ferry_step = -ferry_step
-                                            action = "ferry"
-                                            movement_count += 1
+            if on_boat and occupancy.boat in clicked_actors:
+                load = occupancy.load
+                if sum(load) > 0:
+                    previous = state.gamestate
+                    state, outcome = core.step(state, load)
+                    if recorder is not None:
+                        recorder.record(previous, load, state.gamestate,
+                                        outcome)
+                    if outcome != ILLEGAL:
+                        ferry_direction = -ferry_direction
+                        action = "ferry"
+            profiler.mark("input")
         if action == "ferry":
-            done = ferry(actors, ferry_step)
+            done, boat_x = ferry(occupancy, ferry_direction, dt, boat_x)
             if done:
-                if gamegraph[gamestate] == "failure":
-                    action = "failure"
-                elif gamegraph[gamestate] == "success":
-                    action = "success"
+                dispatcher.grid.update(occupancy.boat)
+                for actor in occupancy.passengers:
+                    dispatcher.grid.update(actor)
+                if outcome in ("failure", "success"):
+                    action = outcome
                 else:
                     action = "listen"
-
-        if action == "failure":
-            failure(window, arena, gameOverSound)
-            sys.exit()
-
-        if action == "success":
-            success(window, winnerImg, winnerRec, winSound)
-            sys.exit()
-
-        window.blit(background, backRec)
-        display_movement_count(window, movement_count)
-        for actor in actors:
-            window.blit(actor["surf"], actor["rect"])
-
-        pygame.display.flip()
-        fpsClock.tick(120)
+            profiler.mark("ferry")
+
+        if action in ("failure", "success"):
+            # Show the final position, then the result screen; a new
+            # round starts when the screen goes away.
+            renderer.draw(actors, state.movement_count)
+            if action == "failure":
+                scenes.push(Scene(
+                    lambda: failure(window, arena, gameOverSound),
+                    WAIT_FAILURE))
+            else:
+                scenes.push(Scene(
+                    lambda: success(window, winnerImg, winnerRec, winSound),
+                    WAIT_SUCCESS))
+            scenes.update(())
+            action = "result"
+            continue
+
+        renderer.draw(actors, state.movement_count)
 
 
 def failure(window, arena, gameOverSound):
     """
-    Display failure message and handle failure state.
+    Draw the failure message and play the game over sound.
 
     Parameters:
     window: Pygame window object
@@ -227,37 +306,33 @@ def failure(window, arena, gameOverSound):
     None
     """
     gameOverSound.play()
-    myfont = pygame.font.Font('freesansbold.ttf', FONT_SIZE_LARGE)
-    msg = myfont.render("OOOOOOOOOH NOOOOOOOOO!!!!!!!!!", True, (255, 0, 0))
+    msg = render_text(
+        "OOOOOOOOOH NOOOOOOOOO!!!!!!!!!", FONT_SIZE_LARGE, (255, 0, 0))
     msg_box = msg.get_rect()
     msg_box.center = arena.center
     window.blit(msg, msg_box)
-    pygame.display.flip()
-    pygame.time.wait(WAIT_FAILURE)
 
 
 def success(window, winnerImg, winnerRec, winSound):
     """
-    Display success message and handle success state.
+    Draw the winner image and play the win sound.
 
     Parameters:
     window: Pygame window object
-    winnerImg: Pygame Surface object for the winner image
-    winnerRec: Rect object for the winner image
+    winnerImg: Deferred Surface object for the winner image
+    winnerRec: Rect object with the position of the winner image
     winSound: Pygame Sound object for win sound
 
     Returns:
     None
     """
     winSound.play()
-    window.blit(winnerImg, winnerRec)
-    pygame.display.flip()
-    pygame.time.wait(WAIT_SUCCESS)
+    window.blit(winnerImg.get(), winnerRec)
 
 
 def welcomeScreen(window, arena):
     """
-    Display the welcome screen message.
+    Draw the welcome screen message.
 
     Parameters:
     window: Pygame window object
@@ -266,18 +341,15 @@ def welcomeScreen(window, arena):
     Returns:
     None
     """
-    myfont = pygame.font.Font('freesansbold.ttf', FONT_SIZE_LARGE)
-    msg = myfont.render("Welcome to our game : ", True, (255, 0, 0))
+    msg = render_text("Welcome to our game : ", FONT_SIZE_LARGE, (255, 0, 0))
     msg_box = msg.get_rect()
     msg_box.center = (arena.center[0], arena.center[1] - 50)
     window.blit(msg, msg_box)
-    pygame.display.flip()
-    pygame.time.wait(WAIT_QUIT)
 
 
 def gameExplanationScreen(window, arena):
     """
-    Display the game explanation screen with rules and objectives.
+    Draw the game explanation screen with rules and objectives.
 
     Parameters:
     window: Pygame window object
@@ -286,273 +358,145 @@ def gameExplanationScreen(window, arena):
     Returns:
     None
     """
-    myfont = pygame.font.Font('freesansbold.ttf', FONT_SIZE_SMALL)
     explanationLine = ["Game roles To Win: ",
                        "1.Three missionaries and three cannibals are on one side of a river that they wish to cross.",
                        "2.A boat is available that can hold at most two people and at leaskt one.",
                        "3.You must never leave a group of missionaries outnumbered by cannibals on the same bank."]
 
     for i, line in enumerate(explanationLine):
-        msg = myfont.render(line, True, (0, 255, 0))
+        msg = render_text(line, FONT_SIZE_SMALL, (0, 255, 0))
         msg_box = msg.get_rect()
         msg_box.center = (arena.center[0], arena.center[1] + i * LINE_HEIGHT)
         window.blit(msg, msg_box)
-    pygame.display.flip()
-    pygame.time.wait(WAIT_GAME_EXPLANATION)
 
 
-def display_movement_count(window, movement_count):
+def get_mouse_click(dispatcher, arena,
+                    boat_y_offset, clicked_actors, clickSound, occupancy):
     """
-    Display the current movement count on the screen.
+    Handle the queued mouse clicks and update clicked actors.
+
+    Clicks are handled in order until the boat is clicked with people on
+    board; later clicks stay queued for when the boat has crossed.
 
     Parameters:
-    window: Pygame window object
-    movement_count: Current movement count
+    dispatcher: InputDispatcher holding the queued clicks
+    arena: Pygame Rect object representing the game arena
+    boat_y_offset: Vertical offset for the boat position
+    clicked_actors: List of currently clicked actors
+    clickSound: Pygame Sound object for click sound
+    occupancy: BoatOccupancy of the actors, updated on board and unboard
 
     Returns:
-    None
+    clicked_actors: Updated list of clicked actors
+    on_boat: Boolean indicating if an actor is on the boat
     """
-    myfont = pygame.font.Font('freesansbold.ttf', MOVES_FONT_SIZE)
-    text = myfont.render(f"Moves: {movement_count}", True, (0, 0, 0))
-    window.blit(text, (10, 10))
+    boat = occupancy.boat
+    on_boat = None
+    while dispatcher.clicks:
+        actor = dispatcher.grid.hit(dispatcher.clicks.popleft())
+        if actor is None:
+            continue
+        clickSound.play()
+        if actor is boat:
+            if actor not in clicked_actors:
+                clicked_actors.append(actor)
+            on_boat = occupancy.count > 0
+            if on_boat:
+                break
+        elif not actor.on_boat:
+            if occupancy.count >= BOAT_MAX_CAPACITY or \
+                    actor.right_side != boat.right_side:
+                continue
+            if boat in clicked_actors:
+                clicked_actors.remove(boat)
+            board_actor(occupancy, actor, arena, boat_y_offset)
+            dispatcher.grid.update(actor)
+            if actor not in clicked_actors:
+                clicked_actors.append(actor)
+            on_boat = True
+        else:
+            unboard_actor(occupancy, actor)
+            dispatcher.grid.update(actor)
+            if actor in clicked_actors:
+                clicked_actors.remove(actor)
+            if boat in clicked_actors:
+                clicked_actors.remove(boat)
+            on_boat = False
+    return clicked_actors, on_boat
 
 
-def create_gamegraph():
+def board_actor(occupancy, actor, arena, boat_y_offset=BOAT_START_Y):
     """
-    Create the game graph representing possible states and transitions.
+    Seat a person on the boat, behind the passengers already on it.
 
     Parameters:
-    None
+    occupancy: BoatOccupancy of the actors
+    actor: Actor of a missionary or a cannibal on the boat's bank
+    arena: Pygame Rect object representing the game arena
+    boat_y_offset: Vertical offset for the boat position
 
     Returns:
-    gamegraph: Dictionary representing the game graph
-    """
-    gamegraph = {
-                (3, 3, 1): {"m": (2, 3, 0), "c": (3, 2, 0), "2m": (1, 3, 0),
-                            "2c": (3, 1, 0), "mc": (2, 2, 0)},
-                (3, 2, 0): {"c": (3, 3, 1)},
-                (3, 1, 0): {"c": (3, 2, 1), "2c": (3, 3, 1)},
-                (2, 2, 0): {"m": (3, 2, 1), "c": (2, 3, 1), "mc": (3, 3, 1)},
-                (3, 2, 1): {"m": (2, 2, 0), "c": (3, 1, 0),
-                            "2m": (1, 2, 0), "2c": (3, 0, 0), "mc": (2, 1, 0)},
-                (3, 0, 0): {"c": (3, 1, 1), "2c": (3, 2, 1)},
-                (3, 1, 1): {"m": (2, 1, 0), "c": (3, 0, 0),
-                            "2m": (1, 1, 0), "mc": (2, 0, 0)},
-                (2, 2, 1): {"m": (1, 2, 0), "c": (2, 2, 0),
-                            "2m": (0, 2, 0), "2c": (2, 0, 0), "mc": (1, 1, 0)},
-                (1, 1, 0): {"m": (2, 1, 1), "c": (1, 2, 1),
-                            "2m": (3, 1, 0), "2c": (1, 3, 0), "mc": (2, 2, 1)},
-                (1, 1, 1): {"m": (0, 1, 0), "c": (1, 0, 0), "mc": (0, 0, 0)},
-                (0, 3, 1): {"c": (0, 2, 0), "2c": (0, 1, 0)},
-                (0, 2, 0): {"m": (1, 2, 1), "c": (0, 3, 1),
-                            "2m": (2, 2, 1), "mc": (1, 3, 1)},
-                (0, 1, 0): {"m": (1, 1, 1), "c": (0, 2, 1),
-                            "2m": (2, 1, 1), "2c": (0, 3, 1), "mc": (1, 2, 1)},
-                (0, 2, 1): {"c": (0, 1, 0), "2c": (0, 0, 0)},
-                (2, 3, 0): "failure",
-                (2, 3, 1): "failure",
-                (1, 3, 0): "failure",
-                (1, 3, 1): "failure",
-                (1, 2, 0): "failure",
-                (1, 2, 1): "failure",
-                (2, 1, 0): "failure",
-                (2, 1, 1): "failure",
-                (1, 0, 0): "failure",
-                (2, 0, 0): "failure",
-                (2, 0, 1): "failure",
-                (0, 0, 0): "success"}
-    return gamegraph
-
-
-def passengers(missionaries, cannibals, boat):
+    None
     """
-    Define possible passenger configurations.
+    offset = occupancy.count * BOAT_MOVE_STEP
+    x = 980 if occupancy.boat.right_side else 500
+    occupancy.board(actor)
+    actor.rect.midleft = (x + offset, arena.center[1] + boat_y_offset - 50)
 
-    Parameters:
-    missionaries: List of missionary dictionaries
-    cannibals: List of cannibal dictionaries
-    boat: Dictionary representing the boat actor
 
-    Returns:
-    passengers: Dictionary representing possible passenger configurations
-    """
-    passengers = {
-        "m1": [missionaries[0], boat],
-        "m2": [missionaries[1], boat],
-        "m3": [missionaries[2], boat],
-        "c1": [cannibals[0], boat],
-        "c2": [cannibals[1], boat],
-        "c3": [cannibals[2], boat],
-        "m1m2": [missionaries[0], missionaries[1], boat],
-        "m1m3": [missionaries[0], missionaries[2], boat],
-        "m2m3": [missionaries[1], missionaries[2], boat],
-        "c1c2": [cannibals[0], cannibals[1], boat],
-        "c1c3": [cannibals[0], cannibals[2], boat],
-        "c2c3": [cannibals[1], cannibals[2], boat],
-        "m1c1": [missionaries[0], cannibals[0], boat],
-        "m1c2": [missionaries[0], cannibals[1], boat],
-        "m1c3": [missionaries[0], cannibals[2], boat],
-        "m2c1": [missionaries[1], cannibals[0], boat],
-        "m2c2": [missionaries[1], cannibals[1], boat],
-        "m2c3": [missionaries[1], cannibals[2], boat],
-        "m3c1": [missionaries[2], cannibals[0], boat],
-        "m3c2": [missionaries[2], cannibals[1], boat],
-        "m3c3": [missionaries[2], cannibals[2], boat],
-    }
-    return passengers
-
-
-def passengersCombination():
+def unboard_actor(occupancy, actor):
     """
-    Define valid combinations of passengers.
+    Put a person from the boat back on the bank the boat is moored at.
 
     Parameters:
-    None
+    occupancy: BoatOccupancy of the actors
+    actor: Actor of a missionary or a cannibal on the boat
 
     Returns:
-    passengersCombination: Dictionary representing
-    valid combinations of passengers
-    """
-    passengersCombination = {
-        "m1": "m",
-        "m2": "m",
-        "m3": "m",
-        "c1": "c",
-        "c2": "c",
-        "c3": "c",
-        "m1m2": "2m",
-        "m1m3": "2m",
-        "m2m3": "2m",
-        "c1c2": "2c",
-        "c1c3": "2c",
-        "c2c3": "2c",
-        "m1c1": "mc",
-        "m1c2": "mc",
-        "m1c3": "mc",
-        "m2c1": "mc",
-        "m2c2": "mc",
-        "m2c3": "mc",
-        "m3c1": "mc",
-        "m3c2": "mc",
-        "m3c3": "mc"
-    }
-    return passengersCombination
-
-
-def get_mouse_click(actors, events, arena,
-                    boat_y_offset, clicked_actors, clickSound):
+    None
     """
-    Handle mouse click events and update clicked actors.
+    occupancy.unboard(actor)
+    if actor.right_side:
+        mirrored_x = actor.rect.x + actor.rect.width
+        actor.rect.topleft = (mirrored_x+50, actor.original_position[1])
+    else:
+        actor.rect.topleft = actor.original_position
 
-    Parameters:
-    actors: List of actor dictionaries
-    events: List of Pygame events
-    arena: Pygame Rect object representing the game arena
-    boat_y_offset: Vertical offset for the boat position
-    clicked_actors: List of currently clicked actors
-    clickSound: Pygame Sound object for click sound
 
-    Returns:
-    clicked_actors: Updated list of clicked actors
-    on_boat: Boolean indicating if an actor is on the boat
-    """
-    boat_objects_count = sum(
-        actor["on_boat"]
-        for actor in actors
-        if actor["file"] != "boat.png")
-    for event in events:
-        for event in events:
-            if event.type == pygame.QUIT:
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    sys.exit()
-        if event.type == pygame.MOUSEBUTTONDOWN and \
-                event.button == MOUSE_BUTTON_LEFT:
-            mouse_pos = pygame.mouse.get_pos()
-            for actor in actors:
-                if actor["rect"].collidepoint(mouse_pos):
-                    clickSound.play()
-                    if actor["file"] == "boat.png":
-                        if actor not in clicked_actors:
-                            clicked_actors.append(actor)
-                        return clicked_actors, any(
-                            actor["on_boat"]
-                            for actor in actors
-                            if actor["file"] != "boat.png")
-                    elif not actor["on_boat"] and \
-                            actor["file"] != "boat.png" and \
-                            boat_objects_count < BOAT_MAX_CAPACITY:
-                        for clicked_actor in clicked_actors:
-                            if clicked_actor["file"] == "boat.png":
-                                clicked_actors.remove(clicked_actor)
-                        offset = sum(
-                            actor["on_boat"]
-                            for actor in actors
-                            if actor["file"] != "boat.png"
-                            and actor["on_boat"]) * BOAT_MOVE_STEP
-                        if actor["rect"].midleft[0] > arena.centerx:
-                            if actors[6]["right_side"]:
-                                actor["on_boat"] = True
-                                actor["rect"].midleft = (
-                                    980+offset,
-                                    arena.center[1] + boat_y_offset - 50)
-                                if actor not in clicked_actors:
-                                    clicked_actors.append(actor)
-                            else:
-                                continue
-                        else:
-                            if not actors[6]["right_side"]:
-                                actor["on_boat"] = True
-                                actor["rect"].midleft = (
-                                    500+offset,
-                                    arena.center[1] + boat_y_offset - 50)
-                                if actor not in clicked_actors:
-                                    clicked_actors.append(actor)
-                            else:
-                                continue
-                        return clicked_actors, True
-                    elif actor["on_boat"]:
-                        actor["on_boat"] = False
-                        if actor["rect"].midleft[0] > arena.centerx:
-                            mirrored_x = (
-                                actor["rect"].midleft[0] + actor["rect"].width)
-                            actor["rect"].topleft = (
-                                mirrored_x+50, actor["original_position"][1])
-                            if actor in clicked_actors:
-                                clicked_actors.remove(actor)
-
-                        else:
-                            actor["rect"].topleft = actor["original_position"]
-                            if actor in clicked_actors:
-                                clicked_actors.remove(actor)
-                        for clicked_actor in clicked_actors:
-                            if clicked_actor["file"] == "boat.png":
-                                clicked_actors.remove(clicked_actor)
-                        return clicked_actors, False
-    return clicked_actors, None
-
-
-def ferry(actors, step):
+def ferry(occupancy, direction, dt, boat_x):
     """
     Perform the ferry action, moving the boat and actors.
 
+    The boat moves BOAT_SPEED pixels per second, so crossings take the
+    same time whatever the frame rate is. The caller keeps the exact
+    boat position, so slow and fast frames add up to the same distance
+    despite integer rect coordinates.
+
     Parameters:
-    actors: List of actor dictionaries
-    step: Horizontal step for the boat movement
+    occupancy: BoatOccupancy holding the boat and its passengers
+    direction: 1 to cross to the right bank, -1 to go back to the left
+    dt: Elapsed time since the previous frame, in seconds
+    boat_x: Exact horizontal position of the boat
 
     Returns:
     done: Boolean indicating if the ferry action is completed
+    boat_x: New exact horizontal position of the boat
     """
-    done = False
-    for actor in actors:
-        if actor["on_boat"] or actor["file"] == "boat.png":
-            actor["rect"] = actor["rect"].move((step, 0))
-            if actor["file"] == "boat.png" and not (
-                            480 < actor["rect"].midleft[0] < 970):
-                actor["rect"] = actor["rect"].move((-step, 0))
-                actor["surf"] = pygame.transform.flip(
-                                        actor["surf"], True, False)
-                actor["right_side"] = not actor["right_side"]
-                done = True
-    return done
+    boat = occupancy.boat
+    boat_x += direction * BOAT_SPEED * dt
+    if direction > 0:
+        done = boat_x >= BOAT_RIGHT_X
+        dock = BOAT_RIGHT_X
+    else:
+        done = boat_x <= BOAT_LEFT_X
+        dock = BOAT_LEFT_X
+    if done:
+        boat_x = dock
+    shift = int(boat_x) - boat.rect.x
+    boat.rect.move_ip(shift, 0)
+    for actor in occupancy.passengers:
+        actor.rect.move_ip(shift, 0)
+    if done:
+        boat.flip()
+        occupancy.cross()
+    return done, boat_x
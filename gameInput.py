@@ -0,0 +1,112 @@
+"""
+Game Input Module
+
+This module contains the input layer of the game: a dispatcher that looks
+at every event exactly once and queues every left click of a frame, and a
+spatial grid over the actor rects so a click is hit-tested only against
+the actors of its grid cell.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from collections import deque
+
+import pygame
+
+MOUSE_BUTTON_LEFT = 1
+GRID_CELL_SIZE = 64
+
+
+class SpatialGrid:
+    """
+    Bucketed index of actor rects on a grid of square cells.
+
+    Attributes:
+    cell_size: Side of a grid cell in pixels
+    """
+
+    def __init__(self, actors, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self._buckets = {}
+        self._cells = {}
+        self._order = {}
+        for order, actor in enumerate(actors):
+            self._order[actor] = order
+            self.update(actor)
+
+    def _cells_of(self, rect):
+        size = self.cell_size
+        return [(x, y)
+                for x in range(rect.left // size, (rect.right - 1) // size + 1)
+                for y in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+    def update(self, actor):
+        """
+        Re-index an actor after its rect moved.
+
+        Parameters:
+        actor: Actor already passed to the grid
+        """
+        for cell in self._cells.get(actor, ()):
+            self._buckets[cell].remove(actor)
+        cells = self._cells_of(actor.rect)
+        for cell in cells:
+            self._buckets.setdefault(cell, []).append(actor)
+        self._cells[actor] = cells
+
+    def hit(self, pos):
+        """
+        Return the actor under a point.
+
+        When actors overlap the one earliest in the actor list wins,
+        like the linear scan this replaces.
+
+        Parameters:
+        pos: Tuple (x, y) in window coordinates
+
+        Returns:
+        actor: Actor under the point, or None
+        """
+        cell = (pos[0] // self.cell_size, pos[1] // self.cell_size)
+        found = None
+        for actor in self._buckets.get(cell, ()):
+            if actor.rect.collidepoint(pos) and (
+                    found is None or self._order[actor] < self._order[found]):
+                found = actor
+        return found
+
+
+class InputDispatcher:
+    """
+    Handle each event once and queue the clicks of every frame.
+
+    Attributes:
+    grid: SpatialGrid used to resolve clicks to actors
+    clicks: Queue of click positions not processed yet
+    quit_requested: True once the window was closed or Return pressed
+    """
+
+    def __init__(self, actors):
+        self.grid = SpatialGrid(actors)
+        self.clicks = deque()
+        self.quit_requested = False
+
+    def dispatch(self, events, accept_clicks=True):
+        """
+        Look at every event of a frame once.
+
+        Parameters:
+        events: List of Pygame events
+        accept_clicks: False to ignore clicks, for instance while the
+        boat is crossing
+        """
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.quit_requested = True
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN:
+                    self.quit_requested = True
+            elif event.type == pygame.MOUSEBUTTONDOWN and accept_clicks \
+                    and event.button == MOUSE_BUTTON_LEFT:
+                self.clicks.append(event.pos)
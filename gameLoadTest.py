@@ -0,0 +1,211 @@
+"""
+Game Load Test Module
+
+This module contains the load-test client of the game server. It opens a
+number of connections, runs many sessions over each of them, and plays
+the optimal game in every session again and again, measuring the latency
+of every request. It reports the number of moves per second and the
+latency percentiles as JSON. With --spawn it starts a local server on a
+Unix socket first.
+
+Usage:
+python gameLoadTest.py --spawn --sessions 10000
+python gameLoadTest.py --port 8765 --sessions 1000 --games 5
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+import argparse
+import asyncio
+from collections import deque
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from time import perf_counter, sleep
+
+from gameProfiler import percentile
+from gameServer import DEFAULT_PORT, decode_message, encode_message
+from gameSolver import solve
+
+CONNECTIONS = 100
+SESSIONS = 10000
+GAMES = 3
+
+
+class Connection:
+    """
+    Client connection sending requests and matching replies in order.
+    """
+
+    def __init__(self, reader, writer):
+        self.writer = writer
+        self._pending = deque()
+        self._reading = asyncio.ensure_future(self._read(reader))
+
+    async def _read(self, reader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            self._pending.popleft().set_result(decode_message(line.decode()))
+        for future in self._pending:
+            future.set_exception(ConnectionError("server closed"))
+
+    async def request(self, message):
+        """
+        Send one request and wait for its reply.
+
+        Returns:
+        reply: Decoded JSON reply
+        latency: Seconds between sending and receiving
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(future)
+        start = perf_counter()
+        self.writer.write(encode_message(message).encode() + b"\n")
+        reply = await future
+        return reply, perf_counter() - start
+
+    async def close(self):
+        self.writer.close()
+        await self._reading
+
+
+async def connect(host="127.0.0.1", port=DEFAULT_PORT, unix=None):
+    """
+    Open a connection to a game server.
+    """
+    if unix is not None:
+        reader, writer = await asyncio.open_unix_connection(unix)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    return Connection(reader, writer)
+
+
+def solution_loads():
+    """
+    Return the boat loads of an optimal 3/3/2 game.
+    """
+    solver = solve()
+    graph = solver.graph
+    return [list(graph.loads[graph.label_ids[label]])
+            for label in solver.solution()]
+
+
+async def play(connection, games, loads, latencies):
+    """
+    Play games in one session, recording every request latency.
+
+    Returns:
+    moves: Number of crossings made
+    """
+    reply, latency = await connection.request({"op": "new"})
+    latencies.append(latency)
+    session = reply["session"]
+    moves = 0
+    for game in range(games):
+        if game:
+            _, latency = await connection.request(
+                {"op": "reset", "session": session})
+            latencies.append(latency)
+        for load in loads:
+            reply, latency = await connection.request(
+                {"op": "move", "session": session, "load": load})
+            latencies.append(latency)
+            if not reply["ok"]:
+                raise RuntimeError(reply["error"])
+            moves += 1
+        if reply["outcome"] != "success":
+            raise RuntimeError(f"session {session} did not win")
+    await connection.request({"op": "close", "session": session})
+    return moves
+
+
+async def load_test(sessions=SESSIONS, connections=CONNECTIONS, games=GAMES,
+                    host="127.0.0.1", port=DEFAULT_PORT, unix=None):
+    """
+    Run sessions spread over connections and measure the server.
+
+    Returns:
+    report: Dictionary with the number of moves, the moves per second
+    and the p50 and p99 request latency in milliseconds
+    """
+    loads = solution_loads()
+    opened = [await connect(host, port, unix)
+              for _ in range(min(connections, sessions))]
+    latencies = []
+    start = perf_counter()
+    moves = await asyncio.gather(*(
+        play(opened[index % len(opened)], games, loads, latencies)
+        for index in range(sessions)))
+    elapsed = perf_counter() - start
+    for connection in opened:
+        await connection.close()
+    total = sum(moves)
+    return {"sessions": sessions, "connections": len(opened),
+            "requests": len(latencies), "moves": total,
+            "seconds": round(elapsed, 3),
+            "moves_per_second": round(total / elapsed),
+            "p50_ms": round(1000 * percentile(latencies, 0.5), 3),
+            "p99_ms": round(1000 * percentile(latencies, 0.99), 3)}
+
+
+def spawn_server(path):
+    """
+    Start a game server process on a Unix socket and wait for it.
+
+    Returns:
+    process: subprocess.Popen of the server
+    """
+    server = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "gameServer.py")
+    process = subprocess.Popen([sys.executable, server, "--unix", path])
+    for _ in range(500):
+        if os.path.exists(path):
+            return process
+        if process.poll() is not None:
+            break
+        sleep(0.01)
+    process.kill()
+    raise RuntimeError("the game server did not start")
+
+
+def main(argv=None):
+    """
+    Run a load test and print its report as JSON.
+    """
+    parser = argparse.ArgumentParser(
+        description="Load test a game server with concurrent sessions.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("--spawn", action="store_true",
+                        help="start a local server on a Unix socket")
+    parser.add_argument("--sessions", type=int, default=SESSIONS)
+    parser.add_argument("--connections", type=int, default=CONNECTIONS)
+    parser.add_argument("--games", type=int, default=GAMES)
+    args = parser.parse_args(argv)
+    process = None
+    if args.spawn:
+        directory = tempfile.mkdtemp()
+        args.unix = os.path.join(directory, "game.sock")
+        process = spawn_server(args.unix)
+    try:
+        report = asyncio.run(load_test(
+            args.sessions, args.connections, args.games,
+            args.host, args.port, args.unix))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+            os.unlink(args.unix)
+            os.rmdir(directory)
+    print(json.dumps(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
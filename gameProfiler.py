@@ -0,0 +1,181 @@
+"""
+Game Profiler Module
+
+This module contains the frame profiler of the game loop. Every frame is
+split into phases (event polling, input and move resolution, ferry, blits,
+move counter text and display update) timed with perf_counter. The last
+frames are kept in fixed size arrays for the on-screen HUD, and the whole
+run can be exported as a CSV or JSON trace. It does not import pygame.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from array import array
+import csv
+import json
+from time import perf_counter
+
+PHASES = ("events", "input", "ferry", "blit", "text", "display")
+HISTORY = 600
+
+
+def percentile(values, fraction):
+    """
+    Return the value below which the given fraction of values fall.
+
+    Parameters:
+    values: Sequence of numbers
+    fraction: Number between 0 and 1
+
+    Returns:
+    value: Nearest-rank percentile, 0.0 for an empty sequence
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(fraction * len(ordered)), len(ordered) - 1)
+    return ordered[index]
+
+
+class FrameProfiler:
+    """
+    Per-phase timings of the game loop frames.
+
+    Call begin_frame() when a frame starts and mark(phase) after the code
+    of each phase; begin_frame() also stores the previous frame, and
+    end_frame() stores the last one. Time spent blocked waiting for
+    events or for the frame rate limit is passed to mark() and excluded
+    from the frame cost.
+
+    Attributes:
+    history: Number of frames kept for statistics
+    record: True to keep every frame for export
+    trace: List of per-frame rows when record is True
+    """
+
+    def __init__(self, history=HISTORY, record=False):
+        self.history = history
+        self.record = record
+        self.trace = []
+        self.frames = 0
+        self._phases = {phase: array("d", bytes(8 * history))
+                        for phase in PHASES}
+        self._cost = array("d", bytes(8 * history))
+        self._interval = array("d", bytes(8 * history))
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self._waited = 0.0
+        self._start = None
+        self._last = None
+        self._previous_start = None
+
+    def begin_frame(self):
+        """
+        Store the previous frame, if any, and start timing a new one.
+        """
+        if self._start is not None:
+            self.end_frame()
+        now = perf_counter()
+        self._previous_start = self._start
+        self._start = self._last = now
+        self._waited = 0.0
+        for phase in PHASES:
+            self._current[phase] = 0.0
+
+    def mark(self, phase, waited=0.0):
+        """
+        Charge the time since the previous mark to a phase.
+
+        Parameters:
+        phase: One of PHASES
+        waited: Seconds of that time spent blocked, not charged
+        """
+        now = perf_counter()
+        self._current[phase] += now - self._last - waited
+        self._waited += waited
+        self._last = now
+
+    def end_frame(self):
+        """
+        Store the timings of the current frame.
+        """
+        if self._start is None or self._last is None:
+            return
+        waited = self._waited
+        slot = self.frames % self.history
+        cost = sum(self._current.values())
+        interval = 0.0
+        if self._previous_start is not None:
+            interval = self._start - self._previous_start
+        for phase in PHASES:
+            self._phases[phase][slot] = self._current[phase]
+        self._cost[slot] = cost
+        self._interval[slot] = interval
+        if self.record:
+            row = {"frame": self.frames, "interval": interval,
+                   "waited": waited, "cost": cost}
+            row.update(self._current)
+            self.trace.append(row)
+        self.frames += 1
+        self._last = None
+
+    def _window(self, values):
+        count = min(self.frames, self.history)
+        return values[:count] if count < self.history else values
+
+    def stats(self):
+        """
+        Summarize the frames kept in the history.
+
+        Returns:
+        stats: Dictionary with fps, p50 and p99 frame cost in
+        milliseconds and the mean cost of every phase in milliseconds
+        """
+        cost = self._window(self._cost)
+        intervals = [value for value in self._window(self._interval)
+                     if value > 0]
+        mean_interval = sum(intervals) / len(intervals) if intervals else 0
+        count = max(len(cost), 1)
+        return {
+            "fps": 1 / mean_interval if mean_interval else 0.0,
+            "p50": 1000 * percentile(cost, 0.5),
+            "p99": 1000 * percentile(cost, 0.99),
+            "phases": {
+                phase: 1000 * sum(self._window(self._phases[phase])) / count
+                for phase in PHASES},
+        }
+
+    def export(self, path):
+        """
+        Write the recorded frames as CSV, or JSON if path ends in .json.
+
+        Parameters:
+        path: Output file path
+        """
+        if path.endswith(".json"):
+            with open(path, "w") as file:
+                json.dump({"phases": PHASES, "frames": self.trace}, file)
+            return
+        fields = ["frame", "interval", "waited", "cost"] + list(PHASES)
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.trace)
+
+
+class NullProfiler:
+    """
+    Profiler that records nothing, used when profiling is off.
+    """
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase, waited=0.0):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
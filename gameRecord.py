@@ -0,0 +1,347 @@
+"""
+Game Record Module
+
+This module contains the game recording format. Every boat load sent
+across the river is appended to a binary log as a fixed width record
+holding the game number, the encoded state before and after the move,
+the boat load and the outcome. The log is read back in chunks through
+mmap, and the replay validator checks millions of recorded games against
+the transition table of a StateGraph in bounded memory. It does not
+import pygame.
+
+Usage:
+python gameRecord.py games.mcr
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+import argparse
+from collections import Counter
+import json
+import mmap
+import os
+import struct
+import sys
+
+from gameCore import FAILURE, ILLEGAL, MOVED, SUCCESS
+from stateGraph import FAILURE as FAILURE_STATE
+from stateGraph import SUCCESS as SUCCESS_STATE
+from stateGraph import StateGraph
+
+MAGIC = b"MCREC\x00\x00\x01"
+# magic, missionaries, cannibals, capacity, record size
+HEADER = struct.Struct("<8sIIII")
+# game, state before, state after, missionaries and cannibals on the
+# boat, outcome, padding
+RECORD = struct.Struct("<IIIBBBx")
+OUTCOMES = (ILLEGAL, MOVED, FAILURE, SUCCESS)
+OUTCOME_CODES = {outcome: code for code, outcome in enumerate(OUTCOMES)}
+CHUNK_RECORDS = 65536
+BUFFER_RECORDS = 256
+MAX_ERROR_SAMPLES = 10
+
+
+class RecordError(ValueError):
+    """
+    Raised when a file is not a game record or does not match the game.
+    """
+
+
+def read_header(file):
+    """
+    Read and check the header of a record file.
+
+    Parameters:
+    file: Binary file object positioned at the start
+
+    Returns:
+    header: Tuple (missionaries, cannibals, capacity)
+    """
+    data = file.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise RecordError("file too short for a game record header")
+    magic, missionaries, cannibals, capacity, size = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise RecordError("not a game record file")
+    if size != RECORD.size:
+        raise RecordError(f"unsupported record size {size}")
+    return missionaries, cannibals, capacity
+
+
+class GameRecorder:
+    """
+    Append-only writer of a game record file.
+
+    Records are buffered and written when the buffer is full or a game
+    ends, so a crash loses at most the unfinished game.
+
+    Attributes:
+    path: Record file path
+    graph: StateGraph the recorded states are encoded with
+    game: Number of the game being recorded, -1 before the first one
+    """
+
+    def __init__(self, path, graph, buffer_records=BUFFER_RECORDS):
+        self.path = path
+        self.graph = graph
+        self.buffer_records = buffer_records
+        self._buffer = bytearray()
+        self._pending = 0
+        self.game = -1
+        header = (graph.missionaries, graph.cannibals, graph.capacity)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size:
+            with open(path, "r+b") as file:
+                if read_header(file) != header:
+                    raise RecordError(
+                        f"{path} records a {header} game")
+                # Drop a record cut short by a crash while appending.
+                end = size - (size - HEADER.size) % RECORD.size
+                if end != size:
+                    file.truncate(end)
+                if end > HEADER.size:
+                    file.seek(end - RECORD.size)
+                    self.game = RECORD.unpack(file.read(RECORD.size))[0]
+        self._file = open(path, "ab")
+        if not size:
+            self._file.write(HEADER.pack(MAGIC, *header, RECORD.size))
+            self._file.flush()
+
+    def new_game(self):
+        """
+        Start recording a new game.
+
+        Returns:
+        game: Number of the new game
+        """
+        self.flush()
+        self.game += 1
+        return self.game
+
+    def record(self, gamestate, load, next_gamestate, outcome):
+        """
+        Append one boat load sent across the river.
+
+        Parameters:
+        gamestate: Tuple (missionaries, cannibals, boat) before the move
+        load: Tuple (missionaries, cannibals) on the boat
+        next_gamestate: Game state after the move, the same as gamestate
+        for an ILLEGAL move
+        outcome: ILLEGAL, MOVED, FAILURE or SUCCESS
+        """
+        encode = self.graph.encode
+        self._buffer += RECORD.pack(
+            self.game, encode(gamestate), encode(next_gamestate),
+            load[0], load[1], OUTCOME_CODES[outcome])
+        self._pending += 1
+        if outcome in (FAILURE, SUCCESS) or \
+                self._pending >= self.buffer_records:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered records to the file.
+        """
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer.clear()
+            self._pending = 0
+
+    def close(self):
+        """
+        Write the buffered records and close the file.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_records(path, chunk_records=CHUNK_RECORDS):
+    """
+    Iterate over the records of a file, one chunk in memory at a time.
+
+    A record cut short at the end of the file is ignored.
+
+    Parameters:
+    path: Record file path
+    chunk_records: Number of records unpacked at a time
+
+    Returns:
+    iterator of tuples (game, state, next_state, missionaries,
+    cannibals, outcome code)
+    """
+    with open(path, "rb") as file:
+        read_header(file)
+        size = os.path.getsize(path)
+        end = size - (size - HEADER.size) % RECORD.size
+        if end == HEADER.size:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            step = chunk_records * RECORD.size
+            for start in range(HEADER.size, end, step):
+                yield from RECORD.iter_unpack(
+                    data[start:min(start + step, end)])
+
+
+class ReplayStats:
+    """
+    Totals of a validated record file.
+
+    Attributes:
+    games: Number of recorded games
+    successes: Games ending with everyone across
+    failures: Games ending with missionaries outnumbered
+    abandoned: Games with no final move, for instance quit mid-game
+    invalid: Games with a record that breaks the rules
+    moves: Legal moves of all games
+    illegal: Boat loads refused by the game
+    move_counts: Counter from number of moves to successful games
+    errors: List of (record index, message) samples of invalid records
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.successes = 0
+        self.failures = 0
+        self.abandoned = 0
+        self.invalid = 0
+        self.moves = 0
+        self.illegal = 0
+        self.move_counts = Counter()
+        self.errors = []
+
+    def error(self, index, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_ERROR_SAMPLES:
+            self.errors.append((index, message))
+
+    def as_dict(self):
+        """
+        Return the totals and the move statistics of successful games.
+        """
+        solved = sum(self.move_counts.values())
+        total = sum(moves * count for moves, count in self.move_counts.items())
+        return {
+            "games": self.games, "successes": self.successes,
+            "failures": self.failures, "abandoned": self.abandoned,
+            "invalid": self.invalid, "moves": self.moves,
+            "illegal": self.illegal,
+            "min_moves": min(self.move_counts) if solved else None,
+            "max_moves": max(self.move_counts) if solved else None,
+            "mean_moves": total / solved if solved else None,
+            "move_counts": dict(sorted(self.move_counts.items())),
+            "errors": self.errors,
+        }
+
+
+def validate(path, chunk_records=CHUNK_RECORDS):
+    """
+    Replay every recorded game against the transition table.
+
+    Each record must continue from the state the previous record of its
+    game reached, from the start state for the first one; legal moves
+    must reach the recorded state with the recorded outcome and refused
+    loads must really be illegal.
+
+    Parameters:
+    path: Record file path
+    chunk_records: Number of records unpacked at a time
+
+    Returns:
+    stats: ReplayStats of the file
+    """
+    with open(path, "rb") as file:
+        graph = StateGraph(*read_header(file))
+    load_ids = {load: load_id for load_id, load in enumerate(graph.loads)}
+    transition = graph.transition
+    kind = graph.kind
+    expected_codes = {FAILURE_STATE: OUTCOME_CODES[FAILURE],
+                      SUCCESS_STATE: OUTCOME_CODES[SUCCESS]}
+    moved = OUTCOME_CODES[MOVED]
+    illegal = OUTCOME_CODES[ILLEGAL]
+    stats = ReplayStats()
+    game = None
+    state = moves = None
+    finished = broken = True
+    for index, (record_game, source, target, dm, dc, code) in enumerate(
+            read_records(path, chunk_records)):
+        if record_game != game:
+            if game is not None and record_game < game:
+                stats.error(index, f"game {record_game} after game {game}")
+                continue
+            if not finished and not broken:
+                stats.abandoned += 1
+            game = record_game
+            stats.games += 1
+            state, moves = graph.start, 0
+            finished = broken = False
+        if broken:
+            continue
+        if finished:
+            stats.error(index, f"game {game} continues after its end")
+            broken = True
+            continue
+        if source != state:
+            stats.error(index, f"game {game} does not continue from "
+                               f"{graph.decode(state)}")
+            broken = True
+            continue
+        load_id = load_ids.get((dm, dc))
+        reached = -1 if load_id is None else transition(source, load_id)
+        if code == illegal:
+            if reached != -1 or target != source:
+                stats.error(index, f"game {game} refused a legal load")
+                broken = True
+            else:
+                stats.illegal += 1
+            continue
+        if reached != target or code != expected_codes.get(kind[target],
+                                                           moved):
+            stats.error(index, f"game {game} made an illegal move "
+                               f"{(dm, dc)} from {graph.decode(source)}")
+            broken = True
+            continue
+        state = target
+        moves += 1
+        stats.moves += 1
+        if kind[target] == SUCCESS_STATE:
+            stats.successes += 1
+            stats.move_counts[moves] += 1
+            finished = True
+        elif kind[target] == FAILURE_STATE:
+            stats.failures += 1
+            finished = True
+    if game is not None and not finished and not broken:
+        stats.abandoned += 1
+    return stats
+
+
+def main(argv=None):
+    """
+    Validate record files and print their statistics as JSON.
+
+    Returns:
+    status: 1 if a file has invalid games, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(
+        description="Validate recorded games against the game rules.")
+    parser.add_argument("paths", nargs="+", metavar="FILE")
+    args = parser.parse_args(argv)
+    status = 0
+    for path in args.paths:
+        stats = validate(path)
+        print(json.dumps({"file": path, **stats.as_dict()}))
+        status = status or int(stats.invalid > 0)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
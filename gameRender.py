@@ -0,0 +1,252 @@
+"""
+Game Render Module
+
+This module contains the render layer of the game: cached fonts and text
+surfaces, image loading with pixel format conversion, and a renderer that
+only redraws and sends to the display the rectangles that changed since
+the previous frame.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from functools import lru_cache
+
+import pygame
+
+from gameAssets import assets
+from gameAtlas import load_atlas
+from gameProfiler import NULL_PROFILER, PHASES
+
+FONT_FILE = 'freesansbold.ttf'
+MOVES_POSITION = (10, 10)
+MOVES_COLOR = (0, 0, 0)
+HUD_POSITION = (1270, 10)
+HUD_FONT_SIZE = 14
+HUD_COLOR = (255, 255, 0)
+HUD_BACKGROUND = (0, 0, 0, 160)
+HUD_REFRESH = 500
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """
+    Return the game font at the given size, loading it only once.
+
+    Parameters:
+    size: Font size in points
+
+    Returns:
+    font: Pygame Font object
+    """
+    return pygame.font.Font(FONT_FILE, size)
+
+
+@lru_cache(maxsize=256)
+def render_text(text, size, color):
+    """
+    Render a line of text, reusing the surface of identical requests.
+
+    Parameters:
+    text: String to render
+    size: Font size in points
+    color: RGB tuple of the text color
+
+    Returns:
+    surface: Pygame Surface with the rendered text
+    """
+    return get_font(size).render(text, True, color)
+
+
+def load_image(path, alpha=False):
+    """
+    Load an image converted to the display pixel format.
+
+    Images are shared through the asset cache, so every path is decoded
+    only once.
+
+    Parameters:
+    path: Image file path
+    alpha: True to keep per-pixel transparency
+
+    Returns:
+    surface: Converted Pygame Surface
+    """
+    return assets.image(path, alpha)
+
+
+class ProfilerHud:
+    """
+    On-screen summary of a FrameProfiler.
+
+    The text is rendered again only every HUD_REFRESH milliseconds, so
+    the HUD itself costs next to nothing in the frames it measures.
+
+    Attributes:
+    profiler: FrameProfiler shown
+    surf: Pygame Surface of the HUD, None before the first refresh
+    rect: Rect of the HUD in the window
+    """
+
+    def __init__(self, profiler, position=HUD_POSITION, refresh=HUD_REFRESH):
+        self.profiler = profiler
+        self.position = position
+        self.refresh = refresh
+        self.surf = None
+        self.rect = None
+        self._next_refresh = 0
+
+    def update(self, now=None):
+        """
+        Render the HUD again when its refresh time has come.
+
+        Parameters:
+        now: Current tick in milliseconds, defaults to the pygame clock
+
+        Returns:
+        changed: True when surf and rect were replaced
+        """
+        if now is None:
+            now = pygame.time.get_ticks()
+        if now < self._next_refresh:
+            return False
+        self._next_refresh = now + self.refresh
+        stats = self.profiler.stats()
+        lines = [f"FPS {stats['fps']:.0f}",
+                 f"p50 {stats['p50']:.2f} ms  p99 {stats['p99']:.2f} ms"]
+        lines += [f"{phase} {stats['phases'][phase]:.3f} ms"
+                  for phase in PHASES]
+        # Not render_text: these strings change every refresh and would
+        # push the game text out of its cache.
+        font = get_font(HUD_FONT_SIZE)
+        surfaces = [font.render(line, True, HUD_COLOR) for line in lines]
+        width = max(surface.get_width() for surface in surfaces) + 8
+        height = sum(surface.get_height() for surface in surfaces) + 8
+        surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        surf.fill(HUD_BACKGROUND)
+        y = 4
+        for surface in surfaces:
+            surf.blit(surface, (4, y))
+            y += surface.get_height()
+        self.surf = surf
+        self.rect = surf.get_rect(topright=self.position)
+        return True
+
+
+class Renderer:
+    """
+    Dirty rectangle renderer for the game scene.
+
+    Every frame only the areas covered by actors that moved or changed
+    sprite, and by the move counter when it changed, are restored from
+    the background, redrawn and passed to pygame.display.update.
+
+    Attributes:
+    window: Pygame window object
+    background: Pygame Surface object for the game background
+    backRec: Rect object for the background
+    profiler: FrameProfiler charged with the text, blit and display
+    phases of every frame
+    hud: Optional ProfilerHud drawn over the scene
+    atlas: SpriteAtlas the actor sprites are drawn from
+    present: False to only draw on window, for instance an offscreen
+    surface, without updating the display
+    """
+
+    def __init__(self, window, background, backRec, moves_font_size,
+                 profiler=NULL_PROFILER, hud=None, atlas=None, present=True):
+        self.window = window
+        self.background = background
+        self.backRec = backRec
+        self.moves_font_size = moves_font_size
+        self.profiler = profiler
+        self.hud = hud
+        self.atlas = atlas if atlas is not None else load_atlas()
+        self.present = present
+        self._actor_state = {}
+        self._moves_rect = None
+        self._movement_count = None
+        self._full_redraw = True
+
+    def invalidate(self):
+        """
+        Force the next frame to redraw and update the whole window,
+        for instance after another screen was drawn over the scene.
+        """
+        self._full_redraw = True
+
+    def _restore_background(self, rect):
+        """
+        Copy the background back over one area of the window.
+        """
+        area = rect.move(-self.backRec.x, -self.backRec.y)
+        self.window.blit(self.background, rect, area)
+
+    def draw(self, actors, movement_count):
+        """
+        Redraw the parts of the scene that changed and update them.
+
+        Parameters:
+        actors: List of Actor objects
+        movement_count: Current movement count
+
+        Returns:
+        dirty: List of Rect objects sent to the display
+        """
+        window = self.window
+        profiler = self.profiler
+        hud = self.hud
+        moves_surf = render_text(
+            f"Moves: {movement_count}", self.moves_font_size, MOVES_COLOR)
+        moves_rect = moves_surf.get_rect(topleft=MOVES_POSITION)
+        profiler.mark("text")
+        dirty = []
+        actor_state = self._actor_state
+        if self._full_redraw:
+            dirty.append(window.get_rect())
+            actor_state.clear()
+        elif movement_count != self._movement_count:
+            dirty.append(self._moves_rect.union(moves_rect))
+        if hud is not None:
+            previous_hud = hud.rect
+            if hud.update() and not self._full_redraw:
+                dirty.append(hud.rect.union(previous_hud)
+                             if previous_hud else hud.rect.copy())
+        for actor in actors:
+            previous = actor_state.get(id(actor))
+            if previous is not None and previous[0] is actor.area \
+                    and previous[1] == actor.rect:
+                continue
+            if not self._full_redraw:
+                dirty.append(actor.rect.union(previous[1])
+                             if previous else actor.rect.copy())
+            actor_state[id(actor)] = (actor.area, actor.rect.copy())
+        self._movement_count = movement_count
+        self._moves_rect = moves_rect
+        if not dirty:
+            profiler.mark("blit")
+            return dirty
+        # Clip to each dirty area so partially covered actors do not
+        # paint over parts of the window that are not being updated.
+        sprites = self.atlas.surface
+        for rect in dirty:
+            window.set_clip(rect)
+            self._restore_background(rect)
+            if moves_rect.colliderect(rect):
+                window.blit(moves_surf, moves_rect)
+            for actor in actors:
+                if actor.rect.colliderect(rect):
+                    window.blit(sprites, actor.rect, actor.area)
+            if hud is not None and hud.rect.colliderect(rect):
+                window.blit(hud.surf, hud.rect)
+        window.set_clip(None)
+        profiler.mark("blit")
+        if not self.present:
+            self._full_redraw = False
+        elif self._full_redraw:
+            self._full_redraw = False
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        profiler.mark("display")
+        return dirty
@@ -0,0 +1,339 @@
+"""
+Game Rollout Module
+
+This module contains the Monte-Carlo player of the game. It plays large
+batches of games at once over the transition arrays of a StateGraph: the
+current state of every unfinished game is one NumPy array, and every step
+picks a move for all of them with a few array operations. Players pick
+random legal moves, biased by a skill (the probability of playing the
+solver's best move) and a caution (the probability of refusing a move
+that loses at once). The results tell how often such players fail, how
+many moves they need to win and which moves lose most games.
+
+Usage:
+python gameRollout.py --games 1000000
+python gameRollout.py --missionaries 5 --cannibals 5 --capacity 3 \
+    --skill 0.5 --workers 4
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import json
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from gameSolver import Solver
+from stateGraph import FAILURE, NORMAL, SUCCESS, StateGraph
+
+BATCH_GAMES = 1 << 18
+MAX_MOVES = 200
+TOP_FAILURES = 10
+
+
+class RolloutTables:
+    """
+    NumPy arrays of a graph read by the rollouts.
+
+    Attributes:
+    graph: StateGraph the tables come from
+    offsets, targets: CSR transition arrays of the graph
+    kind: Class of every state
+    counts: Number of legal moves of every state
+    safe_offsets, safe_edges: CSR rows of the edges of every state that
+    do not lead to a failure state
+    best_edge: Edge of the solver's best move of every state, -1 when
+    the state cannot be solved
+    """
+
+    def __init__(self, graph, solver=None):
+        """
+        Parameters:
+        graph: StateGraph, or the view returned by create_gamegraph
+        solver: Optional Solver of the graph, solved here when omitted
+        """
+        graph = getattr(graph, "graph", graph)
+        if solver is None:
+            solver = Solver(graph)
+        states = graph.state_count
+        self.graph = graph
+        self.offsets = np.asarray(graph.offsets).astype(np.int64)
+        self.targets = np.asarray(graph.targets).astype(np.int64)
+        self.kind = np.frombuffer(bytes(graph.kind), dtype=np.uint8)
+        self.counts = np.diff(self.offsets)
+        sources = np.repeat(np.arange(states, dtype=np.int64), self.counts)
+        safe = self.kind[self.targets] != FAILURE
+        self.safe_edges = np.flatnonzero(safe)
+        self.safe_offsets = np.zeros(states + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources[safe], minlength=states),
+                  out=self.safe_offsets[1:])
+        moves = np.asarray(graph.moves).astype(np.int64)
+        next_move = np.asarray(solver.next_move).astype(np.int64)
+        best = np.flatnonzero(moves == next_move[sources])
+        self.best_edge = np.full(states, -1, dtype=np.int64)
+        self.best_edge[sources[best]] = best
+
+
+class RolloutStats:
+    """
+    Outcomes of a number of rollouts; stats of batches add up.
+
+    Attributes:
+    games: Number of games played
+    successes: Number of games won
+    failures: Number of games lost
+    abandoned: Number of games with no outcome after max_moves moves
+    or with no legal move left
+    success_moves: Number of games won in every number of moves
+    failure_edges: Number of games lost by every transition
+    """
+
+    def __init__(self, edge_count, max_moves=MAX_MOVES):
+        self.games = 0
+        self.successes = 0
+        self.failures = 0
+        self.abandoned = 0
+        self.success_moves = np.zeros(max_moves + 1, dtype=np.int64)
+        self.failure_edges = np.zeros(edge_count, dtype=np.int64)
+
+    def merge(self, other):
+        """
+        Add the counts of other to these stats.
+
+        Returns:
+        stats: These stats
+        """
+        self.games += other.games
+        self.successes += other.successes
+        self.failures += other.failures
+        self.abandoned += other.abandoned
+        self.success_moves += other.success_moves
+        self.failure_edges += other.failure_edges
+        return self
+
+    @property
+    def failure_rate(self):
+        """
+        Share of the games that were lost.
+        """
+        return self.failures / self.games if self.games else 0.0
+
+    def summary(self, graph, top=TOP_FAILURES):
+        """
+        Summarize the stats as a JSON friendly dictionary.
+
+        Parameters:
+        graph: StateGraph the rollouts were played on
+        top: Number of losing moves listed
+
+        Returns:
+        summary: Dictionary with the outcome counts and rates, the
+        distribution of moves to success and the moves that lost the
+        most games
+        """
+        moves = {}
+        if self.successes:
+            counts = self.success_moves
+            cumulative = np.cumsum(counts)
+            p50, p90, p99 = np.searchsorted(
+                cumulative, np.array([0.5, 0.9, 0.99]) * self.successes)
+            moves = {"min": int(np.flatnonzero(counts)[0]),
+                     "mean": round(float(counts @ np.arange(len(counts))) /
+                                   self.successes, 3),
+                     "p50": int(p50), "p90": int(p90), "p99": int(p99),
+                     "histogram": {int(count): int(counts[count])
+                                   for count in np.flatnonzero(counts)}}
+        sources = np.searchsorted(np.asarray(graph.offsets),
+                                  np.arange(len(self.failure_edges)),
+                                  side="right") - 1
+        order = np.argsort(-self.failure_edges, kind="stable")[:top]
+        losing = [{"state": graph.decode(int(sources[edge])),
+                   "move": graph.labels[graph.moves[edge]],
+                   "games": int(self.failure_edges[edge]),
+                   "share": round(float(self.failure_edges[edge]) /
+                                  self.failures, 4)}
+                  for edge in order if self.failure_edges[edge]]
+        return {"games": self.games, "successes": self.successes,
+                "failures": self.failures, "abandoned": self.abandoned,
+                "success_rate": round(self.successes / self.games, 6)
+                if self.games else 0.0,
+                "failure_rate": round(self.failure_rate, 6),
+                "moves_to_success": moves, "losing_moves": losing}
+
+
+def simulate(tables, games, skill=0.0, caution=0.0, max_moves=MAX_MOVES,
+             rng=None):
+    """
+    Play games from the start state, all of them at once.
+
+    Every step each unfinished game plays the solver's best move with
+    probability skill, otherwise a random move that does not lose at
+    once with probability caution, otherwise any random legal move.
+    Finished games are dropped from the arrays, so later steps only cost
+    as much as the games still running.
+
+    Parameters:
+    tables: RolloutTables of the graph
+    games: Number of games
+    skill: Probability of playing the best move
+    caution: Probability of avoiding a losing move when there is another
+    max_moves: Moves after which a game is abandoned
+    rng: numpy.random.Generator, a new unseeded one when omitted
+
+    Returns:
+    stats: RolloutStats of the games
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    stats = RolloutStats(len(tables.targets), max_moves)
+    stats.games = games
+    offsets, counts, targets = tables.offsets, tables.counts, tables.targets
+    current = np.full(games, tables.graph.start, dtype=np.int64)
+    lost_edges = []
+    for move in range(1, max_moves + 1):
+        count = counts[current]
+        stuck = count == 0
+        if stuck.any():
+            stats.abandoned += int(stuck.sum())
+            current = current[~stuck]
+            count = count[~stuck]
+        if not len(current):
+            break
+        edges = offsets[current] + (rng.random(len(current)) *
+                                    count).astype(np.int64)
+        if caution:
+            first = tables.safe_offsets[current]
+            safe_count = tables.safe_offsets[current + 1] - first
+            careful = np.flatnonzero((rng.random(len(current)) < caution) &
+                                     (safe_count > 0))
+            picks = (rng.random(len(careful)) *
+                     safe_count[careful]).astype(np.int64)
+            edges[careful] = tables.safe_edges[first[careful] + picks]
+        if skill:
+            best = tables.best_edge[current]
+            skilled = (rng.random(len(current)) < skill) & (best >= 0)
+            edges[skilled] = best[skilled]
+        current = targets[edges]
+        kind = tables.kind[current]
+        won = int(np.count_nonzero(kind == SUCCESS))
+        stats.successes += won
+        stats.success_moves[move] += won
+        lost = edges[kind == FAILURE]
+        if len(lost):
+            stats.failures += len(lost)
+            lost_edges.append(lost)
+        current = current[kind == NORMAL]
+    stats.abandoned += len(current)
+    if lost_edges:
+        # Counted once at the end: a bincount per step would cost the
+        # edge count of the graph every move.
+        stats.failure_edges += np.bincount(np.concatenate(lost_edges),
+                                           minlength=len(targets))
+    return stats
+
+
+@lru_cache(maxsize=8)
+def _tables(missionaries, cannibals, capacity):
+    # Built once per worker process and configuration.
+    return RolloutTables(StateGraph(missionaries, cannibals, capacity))
+
+
+def rollout_batch(task):
+    """
+    Play one batch of games in a worker process.
+
+    Parameters:
+    task: Tuple (configuration, games, skill, caution, max_moves, seed)
+    where configuration is (missionaries, cannibals, capacity)
+
+    Returns:
+    stats: RolloutStats of the batch
+    """
+    configuration, games, skill, caution, max_moves, seed = task
+    return simulate(_tables(*configuration), games, skill, caution,
+                    max_moves, np.random.default_rng(seed))
+
+
+def rollouts(missionaries=3, cannibals=3, capacity=2, games=BATCH_GAMES,
+             skill=0.0, caution=0.0, max_moves=MAX_MOVES, workers=1,
+             batch=BATCH_GAMES, seed=None):
+    """
+    Play games in batches, in parallel when workers is more than one.
+
+    Every batch gets its own random stream spawned from seed, so results
+    only depend on seed and batch, not on the number of workers.
+
+    Parameters:
+    missionaries: Number of missionaries
+    cannibals: Number of cannibals
+    capacity: Maximum number of people on the boat
+    games: Number of games
+    skill, caution, max_moves: Player model, see simulate
+    workers: Number of worker processes, all cores when None; 1 plays
+    in this process
+    batch: Games played at once by one task
+    seed: Optional seed
+
+    Returns:
+    stats: RolloutStats of every game
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    configuration = (missionaries, cannibals, capacity)
+    sizes = [min(batch, games - first) for first in range(0, games, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(configuration, size, skill, caution, max_moves, child)
+             for size, child in zip(sizes, seeds)]
+    stats = RolloutStats(len(_tables(*configuration).targets), max_moves)
+    if workers == 1:
+        for result in map(rollout_batch, tasks):
+            stats.merge(result)
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(rollout_batch, tasks):
+            stats.merge(result)
+    return stats
+
+
+def main(argv=None):
+    """
+    Play rollouts and print their summary as JSON.
+    """
+    parser = argparse.ArgumentParser(
+        description="Play random games to measure how hard a puzzle is.")
+    parser.add_argument("--missionaries", type=int, default=3)
+    parser.add_argument("--cannibals", type=int, default=3)
+    parser.add_argument("--capacity", type=int, default=2)
+    parser.add_argument("--games", type=int, default=1000000)
+    parser.add_argument("--skill", type=float, default=0.0,
+                        help="probability of playing the best move")
+    parser.add_argument("--caution", type=float, default=0.0,
+                        help="probability of avoiding a losing move")
+    parser.add_argument("--max-moves", type=int, default=MAX_MOVES)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch", type=int, default=BATCH_GAMES)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--top", type=int, default=TOP_FAILURES)
+    args = parser.parse_args(argv)
+    start = perf_counter()
+    stats = rollouts(args.missionaries, args.cannibals, args.capacity,
+                     args.games, args.skill, args.caution, args.max_moves,
+                     args.workers, args.batch, args.seed)
+    elapsed = perf_counter() - start
+    summary = stats.summary(
+        _tables(args.missionaries, args.cannibals, args.capacity).graph,
+        args.top)
+    summary["seconds"] = round(elapsed, 3)
+    summary["games_per_second"] = round(args.games / elapsed)
+    print(json.dumps(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
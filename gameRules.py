@@ -0,0 +1,484 @@
+"""
+Game Rules Module
+
+This module contains the rule variants of the puzzle as data and the
+compiler turning them into state graphs. A RuleSet lists the types of
+people and how many there are of each, the places they stand on (both
+banks and the islands between them), the boat capacity of every leg, the
+smallest crew able to row and the safety rule of a group of people.
+
+RuleGraph checks the safety rule once for every possible group into a
+lookup table and explores the states reachable from the start into the
+same CSR arrays as StateGraph, so the Solver, the rollouts, the graph
+files and the dictionary view work on every variant, and a move costs a
+few table lookups whatever the number of people.
+
+A state of a variant is the tuple (places, boat): places holds the head
+count of every type on every place, from the starting bank to the far
+bank, and boat is the index of the place the boat is moored at.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from array import array
+from itertools import product
+
+from stateGraph import FAILURE, NORMAL, SUCCESS, StateGraph
+
+FORWARD = ">"
+BACK = "<"
+# States are numbered as the search finds them; the goal keeps the
+# second number even when it cannot be reached.
+START_ID = 0
+GOAL_ID = 1
+# The safety table holds one byte per group, the product of every head
+# count plus one: 2 ** people when every person is distinct, as with
+# jealous couples. Larger rule sets are refused.
+MAX_GROUPS = 1 << 24
+# Packed state keys are stored as unsigned 64-bit integers.
+MAX_KEY = 1 << 64
+
+
+def outnumbered(missionaries, cannibals):
+    """
+    Build the classic rule: missionaries must not be outnumbered by the
+    cannibals of a place.
+
+    Parameters:
+    missionaries: Indexes of the types counted as missionaries
+    cannibals: Indexes of the types counted as cannibals
+
+    Returns:
+    safe: Function telling whether a group, given as the head count of
+    every type, is safe
+    """
+    def safe(group):
+        m = sum(group[index] for index in missionaries)
+        return not m or sum(group[index] for index in cannibals) <= m
+    return safe
+
+
+def jealous(couples):
+    """
+    Build the jealous couples rule: no wife may be with another husband
+    unless her own husband is there too.
+
+    Parameters:
+    couples: List of (husband type, wife type) index pairs
+
+    Returns:
+    safe: Function telling whether a group, given as the head count of
+    every type, is safe
+    """
+    def safe(group):
+        if not any(group[husband] for husband, _ in couples):
+            return True
+        return all(group[husband] or not group[wife]
+                   for husband, wife in couples)
+    return safe
+
+
+class RuleSet:
+    """
+    Rule variant of the puzzle.
+
+    Attributes:
+    name: Name of the variant, used as rule set of graph files
+    types: Label of every type of person, used in move labels
+    counts: Number of people of every type
+    safe: Function telling whether a group, given as the head count of
+    every type, is safe
+    capacities: Boat capacity of every leg, leg i joining place i and
+    place i + 1
+    places: Number of places, both banks and the islands
+    min_crew: Fewest people able to take the boat across
+    check_boat: True when the people on the boat must be safe too
+    size: (missionaries, cannibals, capacity) the variant was made from
+    """
+
+    def __init__(self, name, types, counts, safe, capacities, min_crew=1,
+                 check_boat=False, size=None):
+        if len(types) != len(counts) or not sum(counts) or \
+                min(counts) < 0:
+            raise ValueError("every type needs a head count, one at least")
+        if not capacities or min(capacities) < min_crew or min_crew < 1:
+            raise ValueError("every leg must carry the minimum crew")
+        self.name = name
+        self.types = tuple(types)
+        self.counts = tuple(counts)
+        self.safe = safe
+        self.capacities = tuple(capacities)
+        self.places = len(self.capacities) + 1
+        self.min_crew = min_crew
+        self.check_boat = check_boat
+        if size is None:
+            size = (sum(counts), 0, max(capacities))
+        self.size = size
+
+    def __repr__(self):
+        return f"RuleSet({self.name!r}, {self.size})"
+
+
+def classic(missionaries=3, cannibals=3, capacity=2, islands=0,
+            min_crew=1, name="classic"):
+    """
+    Build the classic rules, optionally with islands or a larger crew.
+
+    Parameters:
+    missionaries: Number of missionaries
+    cannibals: Number of cannibals
+    capacity: Maximum number of people on the boat
+    islands: Number of islands between the banks
+    min_crew: Fewest people able to take the boat across
+    name: Name of the variant
+
+    Returns:
+    rules: RuleSet
+    """
+    return RuleSet(name, ("m", "c"), (missionaries, cannibals),
+                   outnumbered((0,), (1,)), (capacity,) * (islands + 1),
+                   min_crew, size=(missionaries, cannibals, capacity))
+
+
+def jealous_couples(couples=3, capacity=2, islands=0):
+    """
+    Build the jealous couples puzzle: every person is distinct, and the
+    rule also applies on the boat.
+
+    Parameters:
+    couples: Number of couples
+    capacity: Maximum number of people on the boat
+    islands: Number of islands between the banks
+
+    Returns:
+    rules: RuleSet with the types h1, w1, h2, w2, ...
+    """
+    types = []
+    for couple in range(1, couples + 1):
+        types += [f"h{couple}", f"w{couple}"]
+    pairs = [(2 * couple, 2 * couple + 1) for couple in range(couples)]
+    name = "jealous-couples" if not islands else "jealous-island"
+    return RuleSet(name, types, (1,) * len(types), jealous(pairs),
+                   (capacity,) * (islands + 1), check_boat=True,
+                   size=(couples, couples, capacity))
+
+
+def _couples(missionaries, cannibals, capacity, islands=0):
+    if missionaries != cannibals:
+        raise ValueError("jealous couples need as many husbands as wives")
+    return jealous_couples(missionaries, capacity, islands)
+
+
+VARIANTS = {
+    "classic": classic,
+    "island": lambda m, c, k: classic(m, c, k, islands=1, name="island"),
+    "two-rowers": lambda m, c, k: classic(m, c, k, min_crew=2,
+                                          name="two-rowers"),
+    "jealous-couples": _couples,
+    "jealous-island": lambda m, c, k: _couples(m, c, k, islands=1),
+}
+
+
+def variant(name, missionaries=3, cannibals=3, capacity=2):
+    """
+    Build a named variant of VARIANTS for a puzzle size.
+
+    Parameters:
+    name: Name of the variant
+    missionaries: Number of missionaries, or of husbands
+    cannibals: Number of cannibals, or of wives
+    capacity: Maximum number of people on the boat
+
+    Returns:
+    rules: RuleSet
+    """
+    try:
+        build = VARIANTS[name]
+    except KeyError:
+        raise ValueError(f"unknown rule set {name!r}") from None
+    return build(missionaries, cannibals, capacity)
+
+
+def group_label(types, group):
+    """
+    Build the move label of a boat load ("m", "2c", "h1w1", ...).
+    """
+    return "".join(("" if count == 1 else str(count)) + label
+                   for label, count in zip(types, group) if count)
+
+
+class RuleGraph(StateGraph):
+    """
+    State graph compiled from a RuleSet.
+
+    A group of people is numbered in mixed radix by the head count of
+    every type; the safety of every group number is checked once into a
+    table. A state is packed into one integer key from the group number
+    of every place but the last and the boat place, and states are
+    numbered in the order the search from the start finds them.
+
+    Attributes:
+    rules: RuleSet compiled
+    loads: Move of every load index, a (group, step) tuple where group
+    holds the head counts on the boat and step is 1 toward the far bank,
+    -1 back, or 0 to the other bank when there is no island
+    keys: Packed key of every state
+    (and the attributes of StateGraph)
+
+    The safety table has one entry per group, so at most MAX_GROUPS
+    groups, about 24 distinct people, and every packed key must fit in
+    64 bits; other rule sets raise ValueError.
+    """
+
+    def __init__(self, rules):
+        self._set_rules(rules)
+        self._compile()
+
+    def _set_rules(self, rules):
+        """
+        Set every attribute but the arrays.
+        """
+        self.rules = rules
+        self.missionaries, self.cannibals, self.capacity = rules.size
+        self._radix = []
+        groups = 1
+        for count in rules.counts:
+            self._radix.append(groups)
+            groups *= count + 1
+        if groups > MAX_GROUPS:
+            raise ValueError(
+                f"{rules.name} has {groups} groups of people, more than "
+                f"the {MAX_GROUPS} the safety table holds")
+        if groups ** (rules.places - 1) * rules.places > MAX_KEY:
+            raise ValueError(f"the states of {rules.name} do not fit in "
+                             f"64-bit keys")
+        self._groups = groups
+        self._everyone = self._group_id(rules.counts)
+        self._safe = bytearray(groups)
+        # product varies its last factor fastest, and the first type is
+        # the lowest digit, so group numbers come in order.
+        ranges = [range(count + 1) for count in reversed(rules.counts)]
+        for group_id, group in enumerate(product(*ranges)):
+            self._safe[group_id] = bool(rules.safe(group[::-1]))
+        steps = (0,) if rules.places == 2 else (1, -1)
+        self.loads = []
+        for group in product(*[range(count + 1) for count in rules.counts]):
+            size = sum(group)
+            if rules.min_crew <= size <= max(rules.capacities) and \
+                    (not rules.check_boat or self._safe[
+                        self._group_id(group)]):
+                self.loads += [(group, step) for step in steps]
+        # By size, then first types first, then forward before back.
+        self.loads.sort(key=lambda load: (
+            sum(load[0]), [-people for people in load[0]], -load[1]))
+        self.labels = [
+            group_label(rules.types, group) +
+            (FORWARD if step > 0 else BACK if step < 0 else "")
+            for group, step in self.loads]
+        self.label_ids = {
+            label: load_id for load_id, label in enumerate(self.labels)}
+        self.start = START_ID
+        self.goal = GOAL_ID
+        self._key_ids = None
+        self._move_table = None
+
+    def _group_id(self, group):
+        return sum(count * radix for count, radix in zip(group, self._radix))
+
+    def _group(self, group_id):
+        group = []
+        for count in self.rules.counts:
+            group_id, people = divmod(group_id, count + 1)
+            group.append(people)
+        return tuple(group)
+
+    def _pack(self, groups, boat):
+        key = 0
+        for group_id in groups[:-1]:
+            key = key * self._groups + group_id
+        return key * self.rules.places + boat
+
+    def _unpack(self, key):
+        key, boat = divmod(key, self.rules.places)
+        groups = []
+        for _ in range(self.rules.places - 1):
+            key, group_id = divmod(key, self._groups)
+            groups.append(group_id)
+        groups.reverse()
+        groups.append(self._everyone - sum(groups))
+        return groups, boat
+
+    def _kind(self, groups, boat):
+        safe = self._safe
+        if not all(safe[group_id] for group_id in groups):
+            return FAILURE
+        if boat == self.rules.places - 1 and groups[-1] == self._everyone:
+            return SUCCESS
+        return NORMAL
+
+    def _compile(self):
+        """
+        Explore the reachable states into the CSR transition arrays.
+        """
+        rules = self.rules
+        last = rules.places - 1
+        start = [self._everyone] + [0] * last
+        goal = [0] * last + [self._everyone]
+        keys = array("Q", [self._pack(start, 0), self._pack(goal, last)])
+        key_ids = {key: state_id for state_id, key in enumerate(keys)}
+        kind = bytearray([self._kind(start, 0), self._kind(goal, last)])
+        reachable = bytearray([1, 0])
+        offsets = array("I", [0])
+        targets = array("I")
+        moves = array("H" if len(self.loads) >= 1 << 8 else "B")
+        moves_out = [
+            (load_id, self._group_id(group), sum(group), step)
+            for load_id, (group, step) in enumerate(self.loads)]
+        fitting = {}
+        state_id = 0
+        while state_id < len(keys):
+            if not reachable[state_id] or kind[state_id] != NORMAL:
+                offsets.append(len(targets))
+                state_id += 1
+                continue
+            groups, boat = self._unpack(keys[state_id])
+            here = groups[boat]
+            fits = fitting.get(here)
+            if fits is None:
+                fits = fitting[here] = self._fitting(here)
+            for load_id, load, size, step in moves_out:
+                if not fits[load_id]:
+                    continue
+                there = last - boat if not step else boat + step
+                if not 0 <= there <= last or \
+                        size > rules.capacities[min(boat, there)]:
+                    continue
+                next_groups = list(groups)
+                next_groups[boat] -= load
+                next_groups[there] += load
+                key = self._pack(next_groups, there)
+                target = key_ids.get(key)
+                if target is None:
+                    target = key_ids[key] = len(keys)
+                    keys.append(key)
+                    kind.append(self._kind(next_groups, there))
+                    reachable.append(1)
+                elif not reachable[target]:
+                    reachable[target] = 1
+                targets.append(target)
+                moves.append(load_id)
+            offsets.append(len(targets))
+            state_id += 1
+        self.state_count = len(keys)
+        self.keys = keys
+        self._key_ids = key_ids
+        self.kind = kind
+        self.reachable = reachable
+        self.offsets = offsets
+        self.targets = targets
+        self.moves = moves
+
+    def _fitting(self, group_id):
+        """
+        Tell for every load whether it can board from a group.
+        """
+        group = self._group(group_id)
+        return [all(people <= present
+                    for people, present in zip(load, group))
+                for load, _ in self.loads]
+
+    @classmethod
+    def from_arrays(cls, rules, kind, offsets, targets, moves, reachable,
+                    keys):
+        """
+        Wrap arrays compiled earlier, for instance mapped from a graph
+        file, without exploring anything.
+
+        Parameters:
+        rules: RuleSet the arrays were compiled from
+        kind, offsets, targets, moves, reachable, keys: Indexable arrays
+        laid out like the attributes of the same name
+
+        Returns:
+        graph: RuleGraph using the given arrays
+        """
+        graph = cls.__new__(cls)
+        graph._set_rules(rules)
+        graph.state_count = len(keys)
+        graph.keys = keys
+        graph.kind = kind
+        graph.offsets = offsets
+        graph.targets = targets
+        graph.moves = moves
+        graph.reachable = reachable
+        return graph
+
+    def encode(self, gamestate):
+        """
+        Return the number of a (places, boat) state.
+
+        Raises ValueError for a state that is not reachable, except the
+        goal, which always has a number.
+        """
+        places, boat = gamestate
+        counts = self.rules.counts
+        if len(places) != self.rules.places or \
+                not 0 <= boat < self.rules.places or \
+                any(len(place) != len(counts) or min(place) < 0
+                    for place in places) or \
+                tuple(map(sum, zip(*places))) != counts:
+            raise ValueError(f"invalid state {gamestate!r}")
+        groups = [self._group_id(place) for place in places]
+        if self._key_ids is None:
+            self._key_ids = {key: state_id
+                             for state_id, key in enumerate(self.keys)}
+        state_id = self._key_ids.get(self._pack(groups, boat))
+        if state_id is None:
+            raise ValueError(f"unreachable state {gamestate!r}")
+        return state_id
+
+    def decode(self, state_id):
+        """
+        Return the (places, boat) state of a number.
+        """
+        groups, boat = self._unpack(self.keys[state_id])
+        return tuple(self._group(group_id) for group_id in groups), boat
+
+    def transition(self, state_id, load_id):
+        """
+        Return the state reached by a move, or -1 if it is not allowed,
+        in O(1).
+
+        Variant states have no arithmetic numbering, so the first call
+        expands the CSR rows into a dense table holding the target of
+        every state and load, -1 for the moves that are not allowed.
+        """
+        table = self._move_table
+        if table is None:
+            table = self._move_table = self._build_move_table()
+        return table[state_id * len(self.loads) + load_id]
+
+    def _build_move_table(self):
+        """
+        Build the dense (state, load) -> target table of transition.
+        """
+        load_count = len(self.loads)
+        table = array("i", [-1]) * (self.state_count * load_count)
+        offsets, targets, moves = self.offsets, self.targets, self.moves
+        for state_id in range(self.state_count):
+            row = state_id * load_count
+            for edge in range(offsets[state_id], offsets[state_id + 1]):
+                table[row + moves[edge]] = targets[edge]
+        return table
+
+    @property
+    def nbytes(self):
+        """
+        Memory used by the state and transition arrays, in bytes, with
+        the move table of transition once it is built.
+        """
+        nbytes = super().nbytes + self.keys.itemsize * len(self.keys)
+        if self._move_table is not None:
+            nbytes += self._move_table.itemsize * len(self._move_table)
+        return nbytes
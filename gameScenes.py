@@ -0,0 +1,108 @@
+"""
+Game Scenes Module
+
+This module contains the scene scheduler of the game. Full screen
+messages such as the welcome, explanation, failure and success screens
+are scenes with a deadline: they are drawn once and stay on screen while
+the main loop keeps processing events, until their time is up or the
+player clicks or presses a key.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from collections import deque
+
+import pygame
+
+SKIP_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)
+
+
+class Scene:
+    """
+    One timed screen.
+
+    Attributes:
+    draw: Function drawing the screen, called once when it is shown
+    duration: Time in milliseconds the screen stays up
+    """
+
+    def __init__(self, draw, duration):
+        self.draw = draw
+        self.duration = duration
+
+
+class SceneQueue:
+    """
+    Queue of scenes shown one after the other without blocking.
+
+    Attributes:
+    scenes: Scenes waiting to be shown, the current one first
+    deadline: Tick in milliseconds when the current scene ends
+    """
+
+    def __init__(self):
+        self.scenes = deque()
+        self.deadline = None
+
+    @property
+    def active(self):
+        """
+        True while a scene is on screen or waiting to be shown.
+        """
+        return bool(self.scenes)
+
+    def push(self, scene):
+        """
+        Queue a scene after the ones already waiting.
+
+        Parameters:
+        scene: Scene to show
+        """
+        self.scenes.append(scene)
+
+    def time_left(self, now=None):
+        """
+        Milliseconds until the current scene ends.
+
+        Returns:
+        time: Milliseconds, the whole duration of a scene not drawn yet,
+        0 once the deadline has passed, or None when no scene is queued
+        """
+        if not self.scenes:
+            return None
+        if self.deadline is None:
+            return self.scenes[0].duration
+        if now is None:
+            now = pygame.time.get_ticks()
+        return max(self.deadline - now, 0)
+
+    def update(self, events, now=None):
+        """
+        Show, keep or end the current scene.
+
+        A click or a key press ends the current scene early.
+
+        Parameters:
+        events: List of Pygame events of this frame
+        now: Current tick in milliseconds, defaults to the pygame clock
+
+        Returns:
+        active: True while a scene is still on screen
+        """
+        if now is None:
+            now = pygame.time.get_ticks()
+        while self.scenes:
+            scene = self.scenes[0]
+            if self.deadline is None:
+                scene.draw()
+                pygame.display.flip()
+                self.deadline = now + scene.duration
+                return True
+            skipped = any(event.type in SKIP_EVENTS for event in events)
+            if now < self.deadline and not skipped:
+                return True
+            self.scenes.popleft()
+            self.deadline = None
+            events = ()
+        return False
@@ -0,0 +1,348 @@
+"""
+Game Server Module
+
+This module contains a multi-session game server built on asyncio. Many
+players are hosted by one process; every session only keeps its game
+state, boat contents and move count, and all sessions share one GameCore
+and its read-only transition table. Clients speak line-delimited JSON
+over TCP or a Unix socket, and a connection can run any number of
+sessions. It does not import pygame.
+
+Requests are JSON objects with an "op" field, answered in order with one
+JSON object per line:
+{"op": "new"}                                  start a session
+{"op": "board", "session": 1, "role": "m"}     put a person on the boat
+{"op": "unboard", "session": 1, "role": "c"}   take a person off the boat
+{"op": "cross", "session": 1}                  ferry the boat contents
+{"op": "move", "session": 1, "load": [1, 1]}   board a load and cross
+{"op": "move", "session": 1, "passengers": "m1c2"}
+{"op": "state", "session": 1}
+{"op": "reset", "session": 1}                  start the game again
+{"op": "close", "session": 1}
+
+Usage:
+python gameServer.py --port 8765
+python gameServer.py --unix /tmp/mc.sock
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+import argparse
+import asyncio
+from itertools import count
+import json
+import sys
+
+from gameCore import (FAILURE, ILLEGAL, SUCCESS, GameCore, headless_passengers,
+                      passengersCombination)
+from stateGraph import StateGraph
+
+ROLES = {"m": 0, "c": 1}
+# Shared coder objects: json.dumps with options builds a new encoder on
+# every call.
+encode_message = json.JSONEncoder(separators=(",", ":")).encode
+decode_message = json.JSONDecoder().decode
+READ_BYTES = 1 << 16
+# Longest request line; a connection sending more without a newline is
+# closed instead of buffered.
+MAX_LINE_BYTES = 1 << 16
+DRAIN_BYTES = 1 << 16
+DEFAULT_PORT = 8765
+
+
+class SessionError(Exception):
+    """
+    Raised for a request that does not fit the state of its session.
+    """
+
+
+class Session:
+    """
+    State of one player: game state, move count and boat contents.
+
+    Passengers stay on the boat after a crossing, like in game_loop,
+    until they are taken off.
+
+    Attributes:
+    state: GameState of the game
+    boat: Head counts [missionaries, cannibals] on the boat
+    outcome: Outcome of the last crossing
+    """
+    __slots__ = ("state", "boat", "outcome")
+
+    def __init__(self, state):
+        self.state = state
+        self.boat = [0, 0]
+        self.outcome = None
+
+    @property
+    def finished(self):
+        return self.outcome in (FAILURE, SUCCESS)
+
+
+class GameServer:
+    """
+    Sessions of every connection and the request handlers.
+
+    Attributes:
+    core: GameCore shared by every session
+    sessions: Number of open sessions
+    moves: Number of crossings made
+    """
+
+    def __init__(self, core):
+        self.core = core
+        self.missionaries, self.cannibals = core.start[:2]
+        self.capacity = core.gamegraph.graph.capacity
+        self.sessions = 0
+        self.moves = 0
+        self._ids = count(1)
+        self._handlers = {
+            "board": self._board, "unboard": self._unboard,
+            "cross": self._cross, "move": self._move,
+            "state": self._state, "reset": self._reset,
+            "close": self._close,
+        }
+
+    def _bank(self, session):
+        # People on the bank where the boat is moored, boat included.
+        m, c, boat = session.state.gamestate
+        if boat:
+            return m, c
+        return self.missionaries - m, self.cannibals - c
+
+    def _reply(self, session_id, session):
+        return {"ok": True, "session": session_id,
+                "state": session.state.gamestate,
+                "moves": session.state.movement_count,
+                "boat": session.boat, "outcome": session.outcome}
+
+    @staticmethod
+    def _role(request):
+        role = request.get("role")
+        role = ROLES.get(role) if isinstance(role, str) else None
+        if role is None:
+            raise SessionError('role must be "m" or "c"')
+        return role
+
+    def _new(self, sessions):
+        session_id = next(self._ids)
+        sessions[session_id] = Session(self.core.initial_state())
+        self.sessions += 1
+        return session_id
+
+    def _board(self, sessions, request, session_id, session):
+        role = self._role(request)
+        if sum(session.boat) >= self.capacity:
+            raise SessionError("the boat is full")
+        if self._bank(session)[role] <= session.boat[role]:
+            raise SessionError("nobody left to board")
+        session.boat[role] += 1
+
+    def _unboard(self, sessions, request, session_id, session):
+        role = self._role(request)
+        if not session.boat[role]:
+            raise SessionError("nobody to take off the boat")
+        session.boat[role] -= 1
+
+    def _cross(self, sessions, request, session_id, session):
+        if not sum(session.boat):
+            raise SessionError("the boat is empty")
+        state, outcome = self.core.step(session.state, tuple(session.boat))
+        if outcome == ILLEGAL:
+            raise SessionError("illegal move")
+        session.state = state
+        session.outcome = outcome
+        self.moves += 1
+
+    def _move(self, sessions, request, session_id, session):
+        if "passengers" in request:
+            passengers = request["passengers"]
+            clicked = self.core.passengers.get(passengers) \
+                if isinstance(passengers, str) else None
+            load = self.core.resolve(clicked) if clicked else None
+        else:
+            load = request.get("load")
+        if not isinstance(load, (list, tuple)) or len(load) != 2 or \
+                not all(type(people) is int for people in load):
+            raise SessionError("unknown load")
+        bank = self._bank(session)
+        if not (0 <= load[0] <= bank[0] and 0 <= load[1] <= bank[1]) or \
+                not 0 < load[0] + load[1] <= self.capacity:
+            raise SessionError("these people cannot board")
+        session.boat = [load[0], load[1]]
+        self._cross(sessions, request, session_id, session)
+
+    def _state(self, sessions, request, session_id, session):
+        pass
+
+    def _reset(self, sessions, request, session_id, session):
+        sessions[session_id] = Session(self.core.initial_state())
+
+    def _close(self, sessions, request, session_id, session):
+        del sessions[session_id]
+        self.sessions -= 1
+        return {"ok": True, "session": session_id}
+
+    def handle(self, sessions, request):
+        """
+        Answer one request of a connection.
+
+        Parameters:
+        sessions: Dictionary of the sessions of the connection
+        request: Decoded JSON request
+
+        Returns:
+        reply: Dictionary to send back
+        """
+        op = request.get("op")
+        if op == "new":
+            session_id = self._new(sessions)
+            return self._reply(session_id, sessions[session_id])
+        handler = self._handlers.get(op) if isinstance(op, str) else None
+        if handler is None:
+            return {"ok": False, "error": "unknown op"}
+        session_id = request.get("session")
+        # Session ids are integers; other JSON values, lists included,
+        # cannot be dictionary keys.
+        session = sessions.get(session_id) \
+            if type(session_id) is int else None
+        if session is None:
+            return {"ok": False, "error": "unknown session"}
+        if session.finished and op in ("board", "unboard", "cross", "move"):
+            return {"ok": False, "error": "the game is over",
+                    "session": session_id}
+        try:
+            reply = handler(sessions, request, session_id, session)
+        except SessionError as error:
+            return {"ok": False, "error": str(error), "session": session_id}
+        if reply is None:
+            reply = self._reply(session_id, sessions[session_id])
+        return reply
+
+    def _answer(self, sessions, line):
+        try:
+            request = decode_message(line.decode())
+        except ValueError:
+            reply = {"ok": False, "error": "invalid JSON"}
+        else:
+            if not isinstance(request, dict):
+                reply = {"ok": False, "error": "invalid request"}
+            else:
+                try:
+                    reply = self.handle(sessions, request)
+                except Exception:
+                    # One bad request must not drop the connection, its
+                    # sessions and the other replies of its batch.
+                    reply = {"ok": False, "error": "server error"}
+        return encode_message(reply)
+
+    async def serve_connection(self, reader, writer):
+        """
+        Answer the requests of one connection until it closes.
+
+        Every complete line received so far is answered, and the replies
+        are sent with one write, so a busy connection costs one pass of
+        the event loop per batch instead of per request. A line longer
+        than MAX_LINE_BYTES is answered with an error and closes the
+        connection.
+        """
+        sessions = {}
+        pending = b""
+        try:
+            while True:
+                data = await reader.read(READ_BYTES)
+                if not data:
+                    break
+                lines = (pending + data).split(b"\n")
+                pending = lines.pop()
+                replies = [self._answer(sessions, line) for line in lines]
+                if len(pending) > MAX_LINE_BYTES:
+                    replies.append(encode_message(
+                        {"ok": False, "error": "line too long"}))
+                if not replies:
+                    continue
+                writer.write(("\n".join(replies) + "\n").encode())
+                if len(pending) > MAX_LINE_BYTES:
+                    await writer.drain()
+                    break
+                if writer.transport.get_write_buffer_size() > DRAIN_BYTES:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= len(sessions)
+            writer.close()
+
+
+def create_server_core(missionaries=3, cannibals=3, capacity=2, cache=None):
+    """
+    Build the GameCore shared by every session.
+
+    Parameters:
+    missionaries: Number of missionaries
+    cannibals: Number of cannibals
+    capacity: Maximum number of people on the boat
+    cache: Optional graphStore.GraphCache to map the graph from
+
+    Returns:
+    core: GameCore over a read-only graph view
+    """
+    if cache is not None:
+        graph, _ = cache.load(missionaries, cannibals, capacity)
+    else:
+        graph = StateGraph(missionaries, cannibals, capacity)
+    return GameCore(graph.as_gamegraph(), headless_passengers(),
+                    passengersCombination())
+
+
+async def start_server(server, host="127.0.0.1", port=DEFAULT_PORT,
+                       unix=None):
+    """
+    Start listening for connections.
+
+    Parameters:
+    server: GameServer answering the requests
+    host, port: TCP address, used when unix is None
+    unix: Optional Unix socket path
+
+    Returns:
+    listener: asyncio Server
+    """
+    if unix is not None:
+        return await asyncio.start_unix_server(
+            server.serve_connection, path=unix)
+    return await asyncio.start_server(server.serve_connection, host, port)
+
+
+def main(argv=None):
+    """
+    Run the server until interrupted.
+    """
+    parser = argparse.ArgumentParser(
+        description="Host missionaries and cannibals games over JSON lines.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("--missionaries", type=int, default=3)
+    parser.add_argument("--cannibals", type=int, default=3)
+    parser.add_argument("--capacity", type=int, default=2)
+    args = parser.parse_args(argv)
+    server = GameServer(create_server_core(
+        args.missionaries, args.cannibals, args.capacity))
+
+    async def run():
+        listener = await start_server(server, args.host, args.port, args.unix)
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Game Solver Module
+
+This module solves a generated game graph with a single reverse breadth
+first search from the success state (0, 0, 0). The distance to the goal
+and the best next move of every state are stored in flat arrays, so hints
+and minimum move counts are answered in constant time during play.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from array import array
+
+from stateGraph import StateGraph
+
+UNSOLVABLE = -1
+
+
+class Solver:
+    """
+    Distance-to-goal table and optimal move hints for a StateGraph.
+
+    Attributes:
+    graph: StateGraph being solved
+    distance_table: Number of moves to the goal for every state,
+    UNSOLVABLE when the goal cannot be reached
+    next_move: Load index of the best move for every state, or
+    len(graph.loads) when there is none
+    """
+
+    def __init__(self, graph):
+        # Accept the dictionary view returned by create_gamegraph too.
+        self.graph = getattr(graph, "graph", graph)
+        self._no_move = len(self.graph.loads)
+        self._solve()
+
+    @classmethod
+    def from_tables(cls, graph, distance_table, next_move):
+        """
+        Wrap tables solved earlier, for instance mapped from a graph file,
+        without searching again.
+
+        Parameters:
+        graph: StateGraph the tables belong to
+        distance_table: Indexable distance of every state to the goal
+        next_move: Indexable best load index of every state
+
+        Returns:
+        solver: Solver using the given tables
+        """
+        solver = cls.__new__(cls)
+        solver.graph = getattr(graph, "graph", graph)
+        solver._no_move = len(solver.graph.loads)
+        solver.distance_table = distance_table
+        solver.next_move = next_move
+        return solver
+
+    def _reverse_edges(self):
+        """
+        Build the reverse CSR arrays (predecessors of every state).
+
+        Returns:
+        offsets, sources, moves: Arrays indexed like the forward graph
+        """
+        graph = self.graph
+        state_count = graph.state_count
+        forward_offsets = graph.offsets
+        targets = graph.targets
+        counts = array("I", bytes(4 * (state_count + 1)))
+        for target in targets:
+            counts[target + 1] += 1
+        for state_id in range(state_count):
+            counts[state_id + 1] += counts[state_id]
+        offsets = array(counts.typecode, counts)
+        sources = array(targets.typecode, bytes(
+            targets.itemsize * len(targets)))
+        moves = array(graph.moves.typecode, bytes(
+            graph.moves.itemsize * len(graph.moves)))
+        for source in range(state_count):
+            for edge in range(forward_offsets[source],
+                              forward_offsets[source + 1]):
+                target = targets[edge]
+                slot = counts[target]
+                counts[target] = slot + 1
+                sources[slot] = source
+                moves[slot] = graph.moves[edge]
+        return offsets, sources, moves
+
+    def _solve(self):
+        """
+        Run the reverse breadth first search from the goal state.
+        """
+        graph = self.graph
+        offsets, sources, moves = self._reverse_edges()
+        distance = array("i", [UNSOLVABLE]) * graph.state_count
+        next_move = array(
+            "B" if self._no_move < 1 << 8 else "H",
+            [self._no_move]) * graph.state_count
+        distance[graph.goal] = 0
+        frontier = [graph.goal]
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for state_id in frontier:
+                for edge in range(offsets[state_id], offsets[state_id + 1]):
+                    source = sources[edge]
+                    if distance[source] == UNSOLVABLE:
+                        distance[source] = depth
+                        next_move[source] = moves[edge]
+                        next_frontier.append(source)
+            frontier = next_frontier
+        self.distance_table = distance
+        self.next_move = next_move
+
+    def distance(self, gamestate):
+        """
+        Return the minimum number of moves from a state to the goal.
+
+        Parameters:
+        gamestate: Tuple (missionaries, cannibals, boat)
+
+        Returns:
+        moves: Minimum move count, or None if the state is unsolvable
+        """
+        moves = self.distance_table[self.graph.encode(gamestate)]
+        return None if moves == UNSOLVABLE else moves
+
+    def is_solvable(self, gamestate):
+        """
+        Tell whether the goal can still be reached from a state.
+
+        Parameters:
+        gamestate: Tuple (missionaries, cannibals, boat)
+
+        Returns:
+        solvable: Boolean
+        """
+        return self.distance_table[self.graph.encode(gamestate)] \
+            != UNSOLVABLE
+
+    def min_moves(self):
+        """
+        Return the minimum number of moves from the start state.
+
+        Returns:
+        moves: Minimum move count, or None if the puzzle is unsolvable
+        """
+        moves = self.distance_table[self.graph.start]
+        return None if moves == UNSOLVABLE else moves
+
+    def hint(self, gamestate):
+        """
+        Return the optimal move label for a state.
+
+        Parameters:
+        gamestate: Tuple (missionaries, cannibals, boat)
+
+        Returns:
+        move: Move label such as "mc", or None when the state is the
+        goal or the goal cannot be reached
+        """
+        load_id = self.next_move[self.graph.encode(gamestate)]
+        if load_id == self._no_move:
+            return None
+        return self.graph.labels[load_id]
+
+    def solution(self, gamestate=None):
+        """
+        Return an optimal sequence of moves from a state to the goal.
+
+        Parameters:
+        gamestate: Tuple (missionaries, cannibals, boat), defaults to
+        the start state
+
+        Returns:
+        moves: List of move labels, or None if the state is unsolvable
+        """
+        graph = self.graph
+        if gamestate is None:
+            state_id = graph.start
+        else:
+            state_id = graph.encode(gamestate)
+        if self.distance_table[state_id] == UNSOLVABLE:
+            return None
+        moves = []
+        while state_id != graph.goal:
+            load_id = self.next_move[state_id]
+            moves.append(graph.labels[load_id])
+            state_id = graph.transition(state_id, load_id)
+        return moves
+
+
+def solve(missionaries=3, cannibals=3, capacity=2):
+    """
+    Generate and solve the game graph of one configuration.
+
+    Parameters:
+    missionaries: Number of missionaries
+    cannibals: Number of cannibals
+    capacity: Maximum number of people on the boat
+
+    Returns:
+    solver: Solver for the generated graph
+    """
+    return Solver(StateGraph(missionaries, cannibals, capacity))
@@ -0,0 +1,196 @@
+"""
+Game Sweep Module
+
+This module contains the parameter sweep of the game. Every configuration
+(missionaries, cannibals, boat capacity) of the requested ranges is built
+into a StateGraph and solved, and one CSV row per configuration tells
+whether it is solvable, its minimum number of crossings, its state count
+and the build and solve times. Configurations are sent in small chunks to
+a pool of worker processes, with a bounded number of chunks in flight, and
+rows are written as soon as their chunk is done.
+
+Usage:
+python gameSweep.py --missionaries 1-50 --cannibals 1-50 --capacity 1-6
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import csv
+from itertools import islice, product
+import os
+import sys
+from time import perf_counter
+
+from gameSolver import Solver
+from stateGraph import StateGraph
+
+FIELDS = ("missionaries", "cannibals", "capacity", "solvable", "min_moves",
+          "states", "reachable", "build_seconds", "solve_seconds")
+CHUNK_SIZE = 16
+CHUNKS_PER_WORKER = 4
+
+
+def parse_range(text):
+    """
+    Parse "A", "A-B" or "A-B:STEP" into a range, bounds included.
+
+    Parameters:
+    text: Range text
+
+    Returns:
+    values: range object
+    """
+    bounds, _, step = text.partition(":")
+    first, _, last = bounds.partition("-")
+    return range(int(first), int(last or first) + 1, int(step or 1))
+
+
+def configurations(missionaries, cannibals, capacities, equal=False):
+    """
+    Iterate over the configurations of a sweep, skipping the empty one.
+
+    Parameters:
+    missionaries: Iterable of missionary counts
+    cannibals: Iterable of cannibal counts
+    capacities: Iterable of boat capacities
+    equal: True to keep only as many cannibals as missionaries
+
+    Returns:
+    iterator of (missionaries, cannibals, capacity) tuples
+    """
+    for m, c, k in product(missionaries, cannibals, capacities):
+        if m + c and k >= 1 and (not equal or m == c):
+            yield m, c, k
+
+
+def sweep_one(configuration):
+    """
+    Build and solve one configuration.
+
+    Parameters:
+    configuration: Tuple (missionaries, cannibals, capacity)
+
+    Returns:
+    row: Dictionary with the FIELDS of the configuration
+    """
+    m, c, k = configuration
+    start = perf_counter()
+    graph = StateGraph(m, c, k)
+    built = perf_counter()
+    moves = Solver(graph).min_moves()
+    solved = perf_counter()
+    return {"missionaries": m, "cannibals": c, "capacity": k,
+            "solvable": moves is not None,
+            "min_moves": "" if moves is None else moves,
+            "states": graph.state_count, "reachable": sum(graph.reachable),
+            "build_seconds": round(built - start, 6),
+            "solve_seconds": round(solved - built, 6)}
+
+
+def sweep_chunk(chunk):
+    """
+    Build and solve a chunk of configurations in a worker process.
+
+    Parameters:
+    chunk: List of (missionaries, cannibals, capacity) tuples
+
+    Returns:
+    rows: List of result dictionaries
+    """
+    return [sweep_one(configuration) for configuration in chunk]
+
+
+def chunked(iterable, size):
+    """
+    Split an iterable into lists of at most size items, lazily.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def sweep(configs, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Solve configurations in parallel, yielding rows as chunks finish.
+
+    At most CHUNKS_PER_WORKER chunks per worker are queued at a time,
+    so huge sweeps are never expanded in memory and the pool stays busy
+    while finished rows are written. Rows come in completion order.
+
+    Parameters:
+    configs: Iterable of (missionaries, cannibals, capacity) tuples
+    workers: Number of worker processes, all cores by default; 1 runs
+    in this process
+    chunk_size: Configurations sent to a worker at a time
+
+    Returns:
+    iterator of result dictionaries
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = chunked(configs, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from sweep_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in islice(chunks, workers * CHUNKS_PER_WORKER):
+            pending.add(executor.submit(sweep_chunk, chunk))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.add(executor.submit(sweep_chunk, chunk))
+                yield from future.result()
+
+
+def main(argv=None):
+    """
+    Run a sweep and stream its rows to a CSV file.
+    """
+    parser = argparse.ArgumentParser(
+        description="Sweep puzzle sizes for solvability and move counts.")
+    parser.add_argument("--missionaries", type=parse_range,
+                        default=parse_range("1-10"), metavar="A-B[:STEP]")
+    parser.add_argument("--cannibals", type=parse_range,
+                        default=parse_range("1-10"), metavar="A-B[:STEP]")
+    parser.add_argument("--capacity", type=parse_range,
+                        default=parse_range("1-4"), metavar="A-B[:STEP]")
+    parser.add_argument("--equal", action="store_true",
+                        help="only as many cannibals as missionaries")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--output", default="-",
+                        help="CSV file, - for standard output")
+    args = parser.parse_args(argv)
+
+    configs = configurations(args.missionaries, args.cannibals,
+                             args.capacity, args.equal)
+    start = perf_counter()
+    file = sys.stdout if args.output == "-" else \
+        open(args.output, "w", newline="")
+    count = 0
+    try:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in sweep(configs, args.workers, args.chunk_size):
+            writer.writerow(row)
+            count += 1
+    finally:
+        if file is not sys.stdout:
+            file.close()
+    print(f"{count} configurations in {perf_counter() - start:.2f} s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
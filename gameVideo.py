@@ -0,0 +1,505 @@
+"""
+Game Video Module
+
+This module renders solutions as video frames without a window. The
+moves are applied to the actors of create_actors and every crossing is
+animated with ferry, as in the game, on an offscreen surface drawn by
+the dirty rectangle renderer. Frames are streamed to numbered PNG files
+or as raw RGB to a pipe: they are encoded and written on a thread pool
+while the next frames are drawn, and at most a fixed number of frames
+wait for it, so memory stays bounded whatever the length of the clip.
+
+Usage:
+python gameVideo.py --output frames
+python gameVideo.py --output - | ffmpeg -f rawvideo -pixel_format rgb24 \
+    -video_size 1280x650 -framerate 30 -i - solution.mp4
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import shutil
+import struct
+import sys
+from time import perf_counter
+import zlib
+
+import pygame
+
+from gameActors import BoatOccupancy, Role
+from gameCore import ILLEGAL, MOVED, create_core
+from gameFunctions import (MOVES_FONT_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH,
+                           board_actor, create_actors, ferry, unboard_actor)
+from gameRender import Renderer, load_image
+from gameSolver import Solver
+
+FPS = 30
+# Seconds the scene is held after boarding and after landing, and at
+# the end of the clip.
+PAUSE = 0.4
+HOLD = 1.0
+FRAME_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
+QUEUE_FRAMES = 8
+FRAME_PATTERN = "frame_{:05d}.png"
+PNG_LEVEL = 1
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Rows compressed together; bands that did not change since an earlier
+# frame reuse their compressed bytes.
+BAND_ROWS = 16
+MAX_BANDS = 1024
+# zlib stream header (deflate, 32 KB window) and an empty final block.
+ZLIB_HEADER = b"\x78\x01"
+FINAL_BLOCK = b"\x03\x00"
+
+
+def solution_loads(graph):
+    """
+    Return an optimal solution of a graph as boat loads.
+
+    Parameters:
+    graph: StateGraph of the game
+
+    Returns:
+    loads: List of (missionaries, cannibals) tuples
+
+    Raises:
+    ValueError: If the game cannot be solved
+    """
+    labels = Solver(graph).solution()
+    if labels is None:
+        raise ValueError("the game cannot be solved")
+    return [graph.loads[graph.label_ids[label]] for label in labels]
+
+
+def offscreen_stage():
+    """
+    Create the offscreen surface, renderer and actors of a game.
+
+    The display is only initialized, hidden and with SDL's dummy video
+    driver unless another one is set, because the sprites are converted
+    to its pixel format.
+
+    Returns:
+    surface: Pygame Surface the frames are drawn on
+    renderer: Renderer drawing on surface without updating the display
+    actors: List of Actor objects from create_actors
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    surface = pygame.Surface(FRAME_SIZE)
+    background = load_image("backGround.jpg")
+    renderer = Renderer(surface, background, background.get_rect(),
+                        MOVES_FONT_SIZE, present=False)
+    actors = create_actors(surface.get_rect())[0]
+    return surface, renderer, actors
+
+
+def solution_frames(moves=None, fps=FPS, pause=PAUSE, hold=HOLD):
+    """
+    Play moves on the offscreen stage, yielding every frame.
+
+    Every move boards its passengers from the boat's bank, crosses with
+    ferry at the game's boat speed and lands them, until the moves run
+    out or the game is won or lost.
+
+    Parameters:
+    moves: List of (missionaries, cannibals) boat loads, an optimal
+    solution by default
+    fps: Frames per second of the clip
+    pause: Seconds held after boarding and after landing
+    hold: Seconds held at the start and at the end
+
+    Returns:
+    iterator of (surface, changed) tuples for each frame: the Pygame
+    Surface holding the frame, drawn over by the next one, and False
+    when the frame is the same as the previous one
+
+    Raises:
+    ValueError: If a move is illegal
+    """
+    core = create_core()
+    if moves is None:
+        moves = solution_loads(core.gamegraph.graph)
+    surface, renderer, actors = offscreen_stage()
+    occupancy = BoatOccupancy(actors)
+    boat = occupancy.boat
+    boat_x = float(boat.rect.x)
+    direction = 1
+    state = core.initial_state()
+
+    def still(seconds):
+        for _ in range(round(seconds * fps)):
+            yield surface, bool(renderer.draw(actors, state.movement_count))
+
+    yield from still(hold)
+    for load in moves:
+        for role, count in zip((Role.MISSIONARY, Role.CANNIBAL), load):
+            people = [actor for actor in actors if actor.role is role and
+                      not actor.on_boat and
+                      actor.right_side == boat.right_side]
+            for actor in people[:count]:
+                board_actor(occupancy, actor, surface.get_rect())
+        previous = state.gamestate
+        state, outcome = core.step(state, occupancy.load)
+        if outcome == ILLEGAL:
+            raise ValueError(f"illegal move {load} from {previous}")
+        yield from still(pause)
+        done = False
+        while not done:
+            done, boat_x = ferry(occupancy, direction, 1 / fps, boat_x)
+            yield surface, bool(renderer.draw(actors, state.movement_count))
+        direction = -direction
+        for actor in list(occupancy.passengers):
+            unboard_actor(occupancy, actor)
+        yield from still(pause)
+        if outcome != MOVED:
+            break
+    yield from still(hold - pause)
+
+
+def adler32_combine(first, second, length):
+    """
+    Return the Adler-32 checksum of two buffers from their checksums,
+    like zlib's adler32_combine.
+
+    Parameters:
+    first: Checksum of the first buffer
+    second: Checksum of the second buffer
+    length: Length of the second buffer
+
+    Returns:
+    checksum: Checksum of the buffers one after the other
+    """
+    base = 65521
+    remainder = length % base
+    low = ((first & 0xffff) + (second & 0xffff) + base - 1) % base
+    high = (remainder * (first & 0xffff) + (first >> 16) + (second >> 16) +
+            base - remainder) % base
+    return low | high << 16
+
+
+def _deflate_band(pixels, stride, level):
+    # Every row starts with its filter type, 0 for none. A compressor of
+    # its own, flushed to a byte boundary, keeps the band independent of
+    # the rows before it.
+    band = b"\x00" + b"\x00".join(
+        pixels[row:row + stride] for row in range(0, len(pixels), stride))
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return (compressor.compress(band) + compressor.flush(zlib.Z_SYNC_FLUSH),
+            zlib.adler32(band), len(band))
+
+
+def encode_png(data, width, height, level=PNG_LEVEL, bands=None):
+    """
+    Encode RGB pixels as a PNG file.
+
+    The image is deflated in bands of BAND_ROWS rows, each one on its
+    own, so a band already compressed for an earlier frame is copied
+    from bands instead of compressed again: while the boat crosses,
+    only the rows it covers change. zlib and the hashes release the GIL,
+    so frames encoded on several threads are compressed in parallel.
+
+    Parameters:
+    data: Bytes of the pixels, 3 per pixel, row by row
+    width, height: Size of the image
+    level: zlib compression level
+    bands: Optional dictionary from band digest to compressed band,
+    shared by the frames of a clip
+
+    Returns:
+    png: Bytes of the PNG file
+    """
+    stride = width * 3
+    pixels = memoryview(data)
+    parts = [ZLIB_HEADER]
+    checksum = zlib.adler32(b"")
+    for top in range(0, height * stride, BAND_ROWS * stride):
+        rows = pixels[top:top + BAND_ROWS * stride]
+        if bands is None:
+            deflated, adler, length = _deflate_band(rows, stride, level)
+        else:
+            digest = hashlib.blake2b(rows, digest_size=16).digest()
+            band = bands.get(digest)
+            if band is None:
+                band = _deflate_band(rows, stride, level)
+                if len(bands) >= MAX_BANDS:
+                    bands.clear()
+                bands[digest] = band
+            deflated, adler, length = band
+        parts.append(deflated)
+        checksum = adler32_combine(checksum, adler, length)
+    parts += (FINAL_BLOCK, struct.pack(">I", checksum))
+
+    def chunk(kind, body):
+        return (struct.pack(">I", len(body)) + kind + body +
+                struct.pack(">I", zlib.crc32(body, zlib.crc32(kind))))
+
+    return (PNG_SIGNATURE +
+            chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2,
+                                       0, 0, 0)) +
+            chunk(b"IDAT", b"".join(parts)) +
+            chunk(b"IEND", b""))
+
+
+class PngSink:
+    """
+    Frames written as numbered PNG files, in any order.
+
+    Attributes:
+    directory: Directory of the files
+    size: (width, height) of the frames
+    pattern: Format string of the file names, given the frame index
+    level: zlib compression level
+    bands: Compressed bands shared by the frames, see encode_png
+    """
+    ordered = False
+
+    def __init__(self, directory, size=FRAME_SIZE, pattern=FRAME_PATTERN,
+                 level=PNG_LEVEL):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.size = size
+        self.pattern = pattern
+        self.level = level
+        self.bands = {}
+
+    def write(self, index, data):
+        """
+        Encode and write one frame.
+
+        Parameters:
+        index: Number of the frame
+        data: RGB bytes of the frame
+        """
+        png = encode_png(data, *self.size, self.level, self.bands)
+        path = os.path.join(self.directory, self.pattern.format(index))
+        with open(path, "wb") as file:
+            file.write(png)
+
+    def repeat(self, index, source, data):
+        """
+        Write one frame as a copy of an earlier, identical one.
+
+        Parameters:
+        index: Number of the frame
+        source: Number of the frame already written with the same data
+        data: RGB bytes of the frame
+        """
+        shutil.copyfile(
+            os.path.join(self.directory, self.pattern.format(source)),
+            os.path.join(self.directory, self.pattern.format(index)))
+
+    def close(self):
+        pass
+
+
+class RawSink:
+    """
+    Frames written as raw RGB bytes to a binary stream, in order.
+
+    Attributes:
+    stream: Binary file object, such as the standard input of an encoder
+    """
+    ordered = True
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, index, data):
+        """
+        Write one frame.
+
+        Parameters:
+        index: Number of the frame
+        data: RGB bytes of the frame
+        """
+        self.stream.write(data)
+
+    def repeat(self, index, source, data):
+        """
+        Write one frame identical to an earlier one.
+        """
+        self.stream.write(data)
+
+    def close(self):
+        self.stream.flush()
+
+
+class FrameWriter:
+    """
+    Thread pool writing frames to a sink while the next ones are drawn.
+
+    At most queue_size frames are waiting or being written: write
+    blocks on the oldest one beyond that. Sinks that need their frames
+    in order get a single thread. Frames given the same bytes object as
+    the previous one are not encoded again but repeated by the sink.
+
+    Attributes:
+    sink: PngSink, RawSink or any object with write(index, data),
+    repeat(index, source, data), close() and an ordered flag
+    queue_size: Maximum number of frames in flight
+    frames: Number of frames written so far
+    """
+
+    def __init__(self, sink, workers=None, queue_size=QUEUE_FRAMES):
+        """
+        Parameters:
+        sink: Sink the frames are written to
+        workers: Number of threads, all cores by default
+        queue_size: Maximum number of frames in flight
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.sink = sink
+        self.queue_size = queue_size
+        self.frames = 0
+        self._pending = deque()
+        self._source = (None, None, None)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1 if sink.ordered else workers,
+            thread_name_prefix="frames")
+
+    def write(self, data):
+        """
+        Queue one frame, waiting for the oldest one when the queue is full.
+
+        Parameters:
+        data: RGB bytes of the frame; they must not change afterwards.
+        Passing the bytes of the previous frame again repeats it.
+
+        Raises:
+        Exception: The error of a frame the sink failed to write
+        """
+        if len(self._pending) >= self.queue_size:
+            self._pending.popleft().result()
+        source_data, source, written = self._source
+        if data is source_data:
+            future = self._executor.submit(
+                self._repeat, self.frames, source, written, data)
+        else:
+            future = self._executor.submit(self.sink.write, self.frames, data)
+            self._source = (data, self.frames, future)
+        self._pending.append(future)
+        self.frames += 1
+
+    def _repeat(self, index, source, written, data):
+        # The source frame was submitted first, so it is already being
+        # written by another thread of the pool or is done.
+        written.result()
+        self.sink.repeat(index, source, data)
+
+    def close(self):
+        """
+        Wait for every frame, then close the sink.
+        """
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+            self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def export(sink, moves=None, fps=FPS, pause=PAUSE, workers=None,
+           queue_size=QUEUE_FRAMES):
+    """
+    Render a solution and write its frames to a sink.
+
+    Parameters:
+    sink: PngSink, RawSink or compatible sink
+    moves, fps, pause: Clip to render, see solution_frames
+    workers, queue_size: Thread pool of the sink, see FrameWriter
+
+    Returns:
+    frames: Number of frames written
+    """
+    data = None
+    with FrameWriter(sink, workers, queue_size) as writer:
+        for surface, changed in solution_frames(moves, fps, pause):
+            if changed or data is None:
+                data = pygame.image.tobytes(surface, "RGB")
+            writer.write(data)
+    return writer.frames
+
+
+def parse_moves(text, graph):
+    """
+    Parse a comma separated list of move labels, such as "mc,m,2c".
+
+    Parameters:
+    text: Move labels of the graph
+    graph: StateGraph of the game
+
+    Returns:
+    loads: List of (missionaries, cannibals) tuples
+    """
+    try:
+        return [graph.loads[graph.label_ids[label.strip()]]
+                for label in text.split(",")]
+    except KeyError as error:
+        raise ValueError(f"unknown move {error}") from None
+
+
+def main(argv=None):
+    """
+    Render a solution to PNG files or a raw RGB stream.
+    """
+    parser = argparse.ArgumentParser(
+        description="Render the solution of the game as video frames.")
+    parser.add_argument("--output", default="frames",
+                        help="directory of the PNG files, - for raw RGB "
+                             "frames on standard output")
+    parser.add_argument("--moves", default=None,
+                        help="comma separated move labels, an optimal "
+                             "solution by default")
+    parser.add_argument("--fps", type=int, default=FPS)
+    parser.add_argument("--pause", type=float, default=PAUSE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--queue", type=int, default=QUEUE_FRAMES)
+    parser.add_argument("--level", type=int, default=PNG_LEVEL,
+                        choices=range(10),
+                        help="zlib level of the PNG files, 0 to store "
+                             "them uncompressed")
+    args = parser.parse_args(argv)
+    moves = None
+    if args.moves:
+        try:
+            moves = parse_moves(args.moves, create_core().gamegraph.graph)
+        except ValueError as error:
+            parser.error(str(error))
+    if args.output == "-":
+        sink = RawSink(sys.stdout.buffer)
+        report = sys.stderr
+    else:
+        sink = PngSink(args.output, level=args.level)
+        report = sys.stdout
+    start = perf_counter()
+    frames = export(sink, moves, args.fps, args.pause, args.workers,
+                    args.queue)
+    elapsed = perf_counter() - start
+    print(json.dumps({"frames": frames, "size": list(FRAME_SIZE),
+                      "fps": args.fps,
+                      "video_seconds": round(frames / args.fps, 3),
+                      "seconds": round(elapsed, 3),
+                      "speed": round(frames / args.fps / elapsed, 2)}),
+          file=report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+Graph Store Module
+
+This module contains the on-disk format of solved state graphs and a
+cache directory of graph files keyed by (missionaries, cannibals,
+capacity, rule set). A graph file holds the state classes, the CSR
+transition arrays, the move labels and the solver tables. It is opened
+with mmap and its arrays are used in place through memoryviews, so
+opening a graph costs the same whatever its size, and processes opening
+the same file share its pages. Graphs of the other rule sets of
+gameRules also store the packed key of every state.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from gameRules import VARIANTS, RuleGraph, variant
+from gameSolver import Solver
+from stateGraph import StateGraph
+
+# The last byte of the magic is the format version.
+MAGIC = b"MCGRAPH\x01"
+# magic, byte order, missionaries, cannibals, capacity, rule set,
+# section count
+HEADER = struct.Struct("<8s1s3xIII16sI")
+# name, typecode, offset, item count
+SECTION = struct.Struct("<8s1s7xQQ")
+ALIGNMENT = 8
+RULE_SETS = tuple(VARIANTS)
+DEFAULT_RULES = "classic"
+SUFFIX = ".mcg"
+CACHE_MAX_BYTES = 1 << 30
+CACHE_DIRECTORY = os.environ.get("MC_GRAPH_CACHE", os.path.join(
+    os.path.expanduser("~"), ".cache", "missionaries-cannibals"))
+BYTE_ORDER = b"<" if sys.byteorder == "little" else b">"
+
+
+class GraphFileError(ValueError):
+    """
+    Raised when a file is not a graph file this machine can map.
+    """
+
+
+def _sections(graph, solver):
+    labels = json.dumps(graph.labels).encode()
+    return (("kind", "B", graph.kind),
+            ("reach", "B", graph.reachable),
+            ("offsets", graph.offsets.typecode, graph.offsets),
+            ("targets", graph.targets.typecode, graph.targets),
+            ("moves", graph.moves.typecode, graph.moves),
+            ("distance", solver.distance_table.typecode,
+             solver.distance_table),
+            ("next", solver.next_move.typecode, solver.next_move),
+            ("labels", "B", labels)) + \
+        ((("keys", graph.keys.typecode, graph.keys),)
+         if isinstance(graph, RuleGraph) else ())
+
+
+def write_graph(path, graph, solver=None, rules=None):
+    """
+    Save a solved graph, replacing path atomically.
+
+    The file is written under a temporary name in the same directory
+    and renamed, so other processes never map a half written file.
+
+    Parameters:
+    path: Graph file path
+    graph: StateGraph or RuleGraph built in memory
+    solver: Solver of the graph, solved here when omitted
+    rules: Name of the rule set the graph was built with, by default
+    the one of a RuleGraph or DEFAULT_RULES
+
+    Returns:
+    size: Size of the file in bytes
+    """
+    if rules is None:
+        rules = graph.rules.name if isinstance(graph, RuleGraph) \
+            else DEFAULT_RULES
+    if rules not in RULE_SETS:
+        raise ValueError(f"unknown rule set {rules!r}")
+    if solver is None:
+        solver = Solver(graph)
+    sections = _sections(graph, solver)
+    table = bytearray()
+    offset = HEADER.size + SECTION.size * len(sections)
+    for name, typecode, values in sections:
+        offset += -offset % ALIGNMENT
+        count = len(values)
+        table += SECTION.pack(name.encode(), typecode.encode(), offset,
+                              count)
+        offset += count * struct.calcsize(typecode)
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(HEADER.pack(
+                MAGIC, BYTE_ORDER, graph.missionaries, graph.cannibals,
+                graph.capacity, rules.encode(), len(sections)))
+            file.write(table)
+            for name, typecode, values in sections:
+                file.write(bytes(-file.tell() % ALIGNMENT))
+                file.write(memoryview(values).cast("B"))
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return os.path.getsize(path)
+
+
+def open_graph(path):
+    """
+    Map a graph file and use its arrays in place.
+
+    Parameters:
+    path: Graph file path
+
+    Returns:
+    graph: StateGraph, or RuleGraph for the other rule sets, whose
+    arrays are memoryviews of the file
+    solver: Solver whose tables are memoryviews of the file
+    rules: Name of the rule set of the graph
+
+    Raises:
+    GraphFileError: If the file is not a graph file of this format
+    version and byte order, or is truncated or corrupt
+    """
+    with open(path, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise GraphFileError(f"{path} is empty") from None
+    if len(data) < HEADER.size:
+        raise GraphFileError(f"{path} is not a graph file")
+    magic, order, missionaries, cannibals, capacity, rules, count = \
+        HEADER.unpack_from(data)
+    if magic[:-1] == MAGIC[:-1] and magic != MAGIC:
+        raise GraphFileError(
+            f"{path} has format version {magic[-1]}, not {MAGIC[-1]}")
+    if magic != MAGIC:
+        raise GraphFileError(f"{path} is not a graph file")
+    if order != BYTE_ORDER:
+        raise GraphFileError(f"{path} was written on another byte order")
+    try:
+        return _map_sections(path, data, missionaries, cannibals, capacity,
+                             rules, count)
+    except GraphFileError:
+        raise
+    except (KeyError, IndexError, TypeError, ValueError,
+            struct.error) as error:
+        raise GraphFileError(f"{path} is corrupt: {error}") from None
+
+
+def _map_sections(path, data, missionaries, cannibals, capacity, rules,
+                  count):
+    # Errors of damaged sections surface as whatever the array casts,
+    # the JSON decoder or the graph checks raise; open_graph turns them
+    # into GraphFileError.
+    view = memoryview(data)
+    arrays = {}
+    for index in range(count):
+        name, typecode, offset, items = SECTION.unpack_from(
+            data, HEADER.size + index * SECTION.size)
+        typecode = typecode.decode()
+        end = offset + items * struct.calcsize(typecode)
+        if end > len(data):
+            raise GraphFileError(f"{path} is truncated")
+        arrays[name.rstrip(b"\0").decode()] = \
+            view[offset:end].cast(typecode)
+    rules = rules.rstrip(b"\0").decode()
+    if rules == DEFAULT_RULES:
+        graph = StateGraph.from_arrays(
+            missionaries, cannibals, capacity, arrays["kind"],
+            arrays["offsets"], arrays["targets"], arrays["moves"],
+            arrays["reach"])
+    else:
+        try:
+            rule_set = variant(rules, missionaries, cannibals, capacity)
+            keys = arrays["keys"]
+        except (KeyError, ValueError):
+            raise GraphFileError(
+                f"{path} has an unknown rule set {rules!r}") from None
+        graph = RuleGraph.from_arrays(
+            rule_set, arrays["kind"], arrays["offsets"], arrays["targets"],
+            arrays["moves"], arrays["reach"], keys)
+    labels = json.loads(bytes(arrays["labels"]))
+    if labels != graph.labels:
+        raise GraphFileError(f"{path} has other move labels")
+    states = graph.state_count
+    if (len(graph.kind) != states or len(graph.reachable) != states or
+            len(graph.offsets) != states + 1 or
+            graph.offsets[-1] != len(graph.targets) or
+            len(graph.moves) != len(graph.targets) or
+            len(arrays["distance"]) != states or
+            len(arrays["next"]) != states):
+        raise GraphFileError(f"{path} has sections of the wrong size")
+    solver = Solver.from_tables(graph, arrays["distance"], arrays["next"])
+    return graph, solver, rules
+
+
+class GraphCache:
+    """
+    Directory of graph files keyed by puzzle size and rule set.
+
+    Files are named after their key and written atomically, so several
+    processes can share the directory. When the files exceed max_bytes
+    the least recently opened ones are removed.
+
+    Attributes:
+    directory: Cache directory path
+    max_bytes: Size the files of the directory are kept under
+    """
+
+    def __init__(self, directory=CACHE_DIRECTORY, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, missionaries, cannibals, capacity, rules=DEFAULT_RULES):
+        """
+        Return the file path of a key.
+        """
+        return os.path.join(
+            self.directory,
+            f"{rules}-{missionaries}-{cannibals}-{capacity}{SUFFIX}")
+
+    def load(self, missionaries=3, cannibals=3, capacity=2,
+             rules=DEFAULT_RULES):
+        """
+        Open the graph of a key, building and saving it on first use.
+
+        Parameters:
+        missionaries: Number of missionaries
+        cannibals: Number of cannibals
+        capacity: Maximum number of people on the boat
+        rules: Name of the rule set
+
+        Returns:
+        graph: StateGraph or RuleGraph mapped from the cache file
+        solver: Solver mapped from the cache file
+        """
+        if rules not in RULE_SETS:
+            raise ValueError(f"unknown rule set {rules!r}")
+        path = self.path(missionaries, cannibals, capacity, rules)
+        try:
+            graph, solver, _ = open_graph(path)
+        except (FileNotFoundError, GraphFileError):
+            # Missing, damaged or older files are built again.
+            if rules == DEFAULT_RULES:
+                graph = StateGraph(missionaries, cannibals, capacity)
+            else:
+                graph = RuleGraph(
+                    variant(rules, missionaries, cannibals, capacity))
+            write_graph(path, graph, rules=rules)
+            self.evict(keep=path)
+            graph, solver, _ = open_graph(path)
+        else:
+            # The modification time orders files for eviction.
+            os.utime(path)
+        return graph, solver
+
+    def entries(self):
+        """
+        List the graph files of the cache, least recently used first.
+
+        Returns:
+        entries: List of (modification time, size, path) tuples
+        """
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        return entries
+
+    def evict(self, keep=None):
+        """
+        Remove the least recently used files until the cache fits.
+
+        Files mapped by a running process stay readable by it until it
+        closes them.
+
+        Parameters:
+        keep: Optional path never removed, such as the file just written
+
+        Returns:
+        removed: List of removed paths
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed.append(path)
+        return removed
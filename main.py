@@ -1,27 +1,39 @@
 """
 Main Game Script
 
-This script initializes and runs the game, controlling the game's main loop.
+This script is the entry point of the game and of its tools. Without a
+command, or with "play", it initializes and runs the game. The other
+commands never import pygame nor load any asset, so scripts can call
+them cheaply:
+
+python main.py                      play the game
+python main.py solve --missionaries 5 --cannibals 5 --capacity 3
+python main.py sweep --missionaries 1-20 --capacity 1-4
+python main.py replay games.mcr
+python main.py bench --headless --quick
+python main.py video --output frames
+
+Every command accepts --help.
 
 Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
 Date: 18/12/2023
 
 """
+import argparse
+import json
+import os
 import sys
-import pygame
-from gameFunctions import *
 
 
-def main():
+def play(argv):
     """
-    Main Game Script
-
-    This script initializes and runs the game, controlling the game's main loop.
-
-    Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
-    Date: 18/12/2023
-
+    Initialize the game and run its main loop.
     """
+    argparse.ArgumentParser(
+        prog="main.py play", description="Play the game.").parse_args(argv)
+    from gameCore import create_gamegraph, passengers, passengersCombination
+    from gameFunctions import (RECORD_FILE, create_actors, game_loop,
+                               initialize_game)
     window, arena, backGroundMusic, clickSound, \
         gameOverSound, winSound, background, \
         backRec, winnerImg, winnerRec = initialize_game()
@@ -34,8 +46,113 @@ def main():
     game_loop(window, arena, actors, gamegraph, passengers_dict,
               passengers_combination_dict, clickSound,
               gameOverSound, winSound, background, backRec, winnerImg,
-              winnerRec)
+              winnerRec,
+              profile_hud=bool(os.environ.get("MC_PROFILE_HUD")),
+              trace_path=os.environ.get("MC_PROFILE_TRACE"),
+              record_path=os.environ.get("MC_RECORD", RECORD_FILE))
+    return 0
+
+
+def solve(argv):
+    """
+    Solve one configuration and print the result as JSON.
+
+    Returns:
+    status: 0 when solvable, 1 otherwise; invalid sizes or rules exit
+    with status 2
+    """
+    from gameRules import VARIANTS
+    parser = argparse.ArgumentParser(
+        prog="main.py solve",
+        description="Print the minimum moves and an optimal solution.")
+    parser.add_argument("--missionaries", type=int, default=3)
+    parser.add_argument("--cannibals", type=int, default=3)
+    parser.add_argument("--capacity", type=int, default=2)
+    parser.add_argument("--rules", choices=VARIANTS, default="classic")
+    parser.add_argument("--cache", action="store_true",
+                        help="map the solved graph from the graph cache")
+    args = parser.parse_args(argv)
+    size = (args.missionaries, args.cannibals, args.capacity)
+    try:
+        if args.cache:
+            from graphStore import GraphCache
+            _, solver = GraphCache().load(*size, rules=args.rules)
+        else:
+            from gameSolver import Solver
+            if args.rules == "classic":
+                from stateGraph import StateGraph
+                graph = StateGraph(*size)
+            else:
+                from gameRules import RuleGraph, variant
+                graph = RuleGraph(variant(args.rules, *size))
+            solver = Solver(graph)
+    except ValueError as error:
+        # Sizes or rules that make no puzzle.
+        parser.error(str(error))
+    print(json.dumps({"missionaries": args.missionaries,
+                      "cannibals": args.cannibals,
+                      "capacity": args.capacity, "rules": args.rules,
+                      "min_moves": solver.min_moves(),
+                      "solution": solver.solution()}))
+    return 0 if solver.min_moves() is not None else 1
+
+
+def sweep(argv):
+    """
+    Run gameSweep; see its --help.
+    """
+    import gameSweep
+    return gameSweep.main(argv)
+
+
+def replay(argv):
+    """
+    Validate game records with gameRecord; see its --help.
+    """
+    import gameRecord
+    return gameRecord.main(argv)
+
+
+def bench(argv):
+    """
+    Run the benchmark suite of gameBench; see its --help.
+    """
+    import gameBench
+    return gameBench.main(argv)
+
+
+def video(argv):
+    """
+    Render the solution as video frames with gameVideo; see its --help.
+    """
+    import gameVideo
+    return gameVideo.main(argv)
+
+
+COMMANDS = {"play": play, "solve": solve, "sweep": sweep,
+            "replay": replay, "bench": bench, "video": video}
+
+
+def main(argv=None):
+    """
+    Run a command, the game by default.
+
+    Parameters:
+    argv: Command line arguments, sys.argv[1:] by default
+
+    Returns:
+    status: Exit status of the command
+    """
+    parser = argparse.ArgumentParser(
+        description="Missionaries and cannibals: play the game or run "
+                    "one of its tools.")
+    parser.add_argument("command", nargs="?", default="play",
+                        choices=COMMANDS)
+    parser.add_argument("arguments", nargs=argparse.REMAINDER,
+                        help="arguments of the command")
+    args = parser.parse_args(argv)
+    return COMMANDS[args.command](args.arguments)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
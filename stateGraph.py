@@ -0,0 +1,445 @@
+"""
+State Graph Module
+
+This module generates the game graph of the missionaries and cannibals
+puzzle for any number of missionaries, cannibals and any boat capacity.
+States are encoded as integers and the transitions are stored in flat
+arrays (compressed sparse rows) instead of nested dictionaries, so build
+time and memory grow linearly with the number of states.
+
+A state is the tuple (missionaries, cannibals, boat) counted on the
+starting bank, where boat is 1 while the boat is on the starting bank.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from array import array
+from collections.abc import Mapping
+from itertools import repeat
+
+NORMAL = 0
+FAILURE = 1
+SUCCESS = 2
+# Smaller graphs build faster in pure Python than NumPy can start up.
+VECTORIZE_MIN_STATES = 4096
+
+
+def boat_loads(capacity):
+    """
+    List every legal boat load for the given capacity.
+
+    Loads are ordered by size, and inside one size the pure missionary
+    load comes first, then the pure cannibal load, then the mixed ones,
+    which reproduces the move order of the original 3/3/2 graph.
+
+    Parameters:
+    capacity: Maximum number of people on the boat
+
+    Returns:
+    loads: List of (missionaries, cannibals) tuples
+    """
+    loads = []
+    for size in range(1, capacity + 1):
+        loads.append((size, 0))
+        loads.append((0, size))
+        for dm in range(size - 1, 0, -1):
+            loads.append((dm, size - dm))
+    return loads
+
+
+def load_label(dm, dc):
+    """
+    Build the move label of a boat load ("m", "2c", "mc", "m2c", ...).
+
+    Parameters:
+    dm: Number of missionaries on the boat
+    dc: Number of cannibals on the boat
+
+    Returns:
+    label: Move label used as key in the game graph
+    """
+    label = ""
+    if dm:
+        label += ("" if dm == 1 else str(dm)) + "m"
+    if dc:
+        label += ("" if dc == 1 else str(dc)) + "c"
+    return label
+
+
+def _load_kernel():
+    """
+    Return the vectorized stateKernel module, or None without NumPy.
+    """
+    import stateKernel
+    return stateKernel if stateKernel.np is not None else None
+
+
+def _compact_typecode(limit):
+    """
+    Return the smallest unsigned array typecode able to hold limit.
+    """
+    if limit < 1 << 8:
+        return "B"
+    if limit < 1 << 16:
+        return "H"
+    if limit < 1 << 32:
+        return "I"
+    return "Q"
+
+
+class StateGraph:
+    """
+    Generated game graph for (missionaries, cannibals, capacity).
+
+    Attributes:
+    missionaries: Number of missionaries
+    cannibals: Number of cannibals
+    capacity: Maximum number of people on the boat
+    loads: List of (missionaries, cannibals) boat loads
+    labels: Move label of every load
+    label_ids: Dictionary from move label to load index
+    kind: bytearray with NORMAL, FAILURE or SUCCESS for every state
+    offsets: Row offsets of every state into targets and moves
+    targets: Target state of every transition
+    moves: Load index of every transition
+    reachable: bytearray marking states reachable from the start
+    start: Encoded start state
+    goal: Encoded success state
+    """
+
+    def __init__(self, missionaries=3, cannibals=3, capacity=2):
+        self._set_size(missionaries, cannibals, capacity)
+        kernel = None
+        if self.state_count >= VECTORIZE_MIN_STATES:
+            kernel = _load_kernel()
+        if kernel is not None:
+            self._build_vectorized(kernel)
+        else:
+            self._build()
+            self._mark_reachable()
+
+    def _set_size(self, missionaries, cannibals, capacity):
+        """
+        Check the puzzle size and set every attribute but the arrays.
+        """
+        if missionaries < 0 or cannibals < 0 or capacity < 1:
+            raise ValueError(
+                "missionaries and cannibals must be >= 0, capacity >= 1")
+        if missionaries + cannibals == 0:
+            raise ValueError("at least one person must cross the river")
+        self.missionaries = missionaries
+        self.cannibals = cannibals
+        self.capacity = capacity
+        self.loads = boat_loads(capacity)
+        self.labels = [load_label(dm, dc) for dm, dc in self.loads]
+        self.label_ids = {
+            label: load_id for load_id, label in enumerate(self.labels)}
+        self.state_count = 2 * (missionaries + 1) * (cannibals + 1)
+        self.start = self.encode((missionaries, cannibals, 1))
+        self.goal = self.encode((0, 0, 0))
+
+    @classmethod
+    def from_arrays(cls, missionaries, cannibals, capacity, kind, offsets,
+                    targets, moves, reachable):
+        """
+        Wrap arrays built earlier, for instance mapped from a graph file,
+        without building anything.
+
+        Parameters:
+        missionaries: Number of missionaries
+        cannibals: Number of cannibals
+        capacity: Maximum number of people on the boat
+        kind, offsets, targets, moves, reachable: Indexable arrays laid
+        out like the attributes of the same name
+
+        Returns:
+        graph: StateGraph using the given arrays
+        """
+        graph = cls.__new__(cls)
+        graph._set_size(missionaries, cannibals, capacity)
+        graph.kind = kind
+        graph.offsets = offsets
+        graph.targets = targets
+        graph.moves = moves
+        graph.reachable = reachable
+        return graph
+
+    def encode(self, gamestate):
+        """
+        Encode a (missionaries, cannibals, boat) tuple as an integer.
+
+        Parameters:
+        gamestate: Tuple (missionaries, cannibals, boat)
+
+        Returns:
+        state_id: Integer index of the state
+        """
+        m, c, b = gamestate
+        if not (0 <= m <= self.missionaries and 0 <= c <= self.cannibals
+                and b in (0, 1)):
+            raise KeyError(gamestate)
+        return (m * (self.cannibals + 1) + c) * 2 + b
+
+    def decode(self, state_id):
+        """
+        Decode an integer state back into a (m, c, boat) tuple.
+
+        Parameters:
+        state_id: Integer index of the state
+
+        Returns:
+        gamestate: Tuple (missionaries, cannibals, boat)
+        """
+        m, c = divmod(state_id >> 1, self.cannibals + 1)
+        return (m, c, state_id & 1)
+
+    def _build(self):
+        """
+        Classify every state and fill the CSR transition arrays.
+        """
+        total_m = self.missionaries
+        total_c = self.cannibals
+        row = total_c + 1
+        loads = self.loads
+        shifts = [2 * (dm * row + dc) + 1 for dm, dc in loads]
+        kind = bytearray(self.state_count)
+        offsets = array(
+            _compact_typecode(self.state_count * len(loads)), [0])
+        targets = array(_compact_typecode(self.state_count))
+        moves = array(_compact_typecode(len(loads)))
+        append_offset = offsets.append
+        append_target = targets.append
+        append_move = moves.append
+        load_range = range(len(loads))
+        state_id = 0
+        for m in range(total_m + 1):
+            right_m = total_m - m
+            # Safe cannibal counts form one range for every m: no more
+            # cannibals than missionaries on either occupied bank.
+            low = max(total_c - right_m, 0) if right_m else 0
+            high = min(m, total_c) if m else total_c
+            if low > high:
+                state_id = self._fill_failures(
+                    state_id, row * 2, kind, offsets, len(targets))
+                continue
+            state_id = self._fill_failures(
+                state_id, low * 2, kind, offsets, len(targets))
+            for c in range(low, high + 1):
+                right_c = total_c - c
+                # Boat on the far bank: people travel back to the start.
+                if m == 0 and c == 0:
+                    kind[state_id] = SUCCESS
+                else:
+                    for load_id in load_range:
+                        dm, dc = loads[load_id]
+                        if dm <= right_m and dc <= right_c:
+                            append_target(state_id + shifts[load_id])
+                            append_move(load_id)
+                append_offset(len(targets))
+                state_id += 1
+                # Boat on the starting bank: people travel across.
+                for load_id in load_range:
+                    dm, dc = loads[load_id]
+                    if dm <= m and dc <= c:
+                        append_target(state_id - shifts[load_id])
+                        append_move(load_id)
+                append_offset(len(targets))
+                state_id += 1
+            state_id = self._fill_failures(
+                state_id, (total_c - high) * 2, kind, offsets, len(targets))
+        self.kind = kind
+        self.offsets = offsets
+        self.targets = targets
+        self.moves = moves
+
+    def _build_vectorized(self, kernel):
+        """
+        Build the same arrays as _build and _mark_reachable with the
+        NumPy kernels, a block of states at a time.
+        """
+        kind, offsets, targets, moves = kernel.build(
+            self.missionaries, self.cannibals, self.loads)
+        self.kind = bytearray(kind.tobytes())
+        self.offsets = kernel.to_array(
+            offsets, _compact_typecode(self.state_count * len(self.loads)))
+        self.targets = kernel.to_array(
+            targets, _compact_typecode(self.state_count))
+        self.moves = kernel.to_array(
+            moves, _compact_typecode(len(self.loads)))
+        self.reachable = kernel.reachable(
+            self.offsets, self.targets, self.start, self.state_count)
+
+    @staticmethod
+    def _fill_failures(state_id, count, kind, offsets, edge_count):
+        """
+        Mark count consecutive states as failures with no transitions.
+
+        Returns:
+        state_id: Index of the first state after the filled range
+        """
+        if count > 0:
+            kind[state_id:state_id + count] = bytes([FAILURE]) * count
+            offsets.extend(repeat(edge_count, count))
+        return state_id + count
+
+    def _mark_reachable(self):
+        """
+        Flag every state reachable from the start state.
+        """
+        reachable = bytearray(self.state_count)
+        reachable[self.start] = 1
+        offsets = self.offsets
+        targets = self.targets
+        frontier = [self.start]
+        while frontier:
+            next_frontier = []
+            for state_id in frontier:
+                for edge in range(offsets[state_id], offsets[state_id + 1]):
+                    target = targets[edge]
+                    if not reachable[target]:
+                        reachable[target] = 1
+                        next_frontier.append(target)
+            frontier = next_frontier
+        self.reachable = reachable
+
+    def transition(self, state_id, load_id):
+        """
+        Return the state reached by moving a boat load, in O(1).
+
+        Parameters:
+        state_id: Integer index of the current state
+        load_id: Index of the boat load in loads
+
+        Returns:
+        target: Integer index of the next state, or -1 if the move
+        is not allowed from this state
+        """
+        if self.kind[state_id] != NORMAL:
+            return -1
+        dm, dc = self.loads[load_id]
+        m, c, b = self.decode(state_id)
+        if b:
+            if dm > m or dc > c:
+                return -1
+            return state_id - 2 * (dm * (self.cannibals + 1) + dc) - 1
+        if dm > self.missionaries - m or dc > self.cannibals - c:
+            return -1
+        return state_id + 2 * (dm * (self.cannibals + 1) + dc) + 1
+
+    def edges(self, state_id):
+        """
+        Iterate over the transitions leaving a state.
+
+        Parameters:
+        state_id: Integer index of the state
+
+        Returns:
+        iterator of (load_id, target) tuples
+        """
+        for edge in range(self.offsets[state_id], self.offsets[state_id + 1]):
+            yield self.moves[edge], self.targets[edge]
+
+    @property
+    def edge_count(self):
+        """
+        Number of transitions stored in the graph.
+        """
+        return len(self.targets)
+
+    @property
+    def nbytes(self):
+        """
+        Memory used by the state and transition arrays, in bytes.
+        """
+        return (len(self.kind) + len(self.reachable)
+                + self.offsets.itemsize * len(self.offsets)
+                + self.targets.itemsize * len(self.targets)
+                + self.moves.itemsize * len(self.moves))
+
+    def as_gamegraph(self):
+        """
+        Return a dictionary compatible view of the graph.
+
+        Returns:
+        gamegraph: GameGraphView usable as gamegraph[gamestate][move]
+        """
+        return GameGraphView(self)
+
+
+class GameGraphView(Mapping):
+    """
+    Read-only view mapping reachable states to their moves, with the
+    same shape as the original hand-written game graph: failure states
+    map to "failure", the goal maps to "success" and every other state
+    maps to a {move label: next state} mapping.
+
+    Only states reachable from the start are keys. The hand-written 3/3/2
+    graph also listed the unreachable failure (2, 0, 1), so this view
+    has 25 keys instead of 26 and gamegraph[(2, 0, 1)] raises KeyError.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def _state_id(self, gamestate):
+        try:
+            state_id = self.graph.encode(gamestate)
+        except (TypeError, ValueError):
+            raise KeyError(gamestate) from None
+        if not self.graph.reachable[state_id]:
+            raise KeyError(gamestate)
+        return state_id
+
+    def __getitem__(self, gamestate):
+        state_id = self._state_id(gamestate)
+        kind = self.graph.kind[state_id]
+        if kind == FAILURE:
+            return "failure"
+        if kind == SUCCESS:
+            return "success"
+        return MovesView(self.graph, state_id)
+
+    def __contains__(self, gamestate):
+        try:
+            self._state_id(gamestate)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        reachable = self.graph.reachable
+        for state_id in range(self.graph.state_count):
+            if reachable[state_id]:
+                yield self.graph.decode(state_id)
+
+    def __len__(self):
+        # bytes() also accepts the memoryviews of a mapped graph file.
+        return bytes(self.graph.reachable).count(1)
+
+
+class MovesView(Mapping):
+    """
+    Read-only view mapping move labels of one state to next states.
+    """
+
+    def __init__(self, graph, state_id):
+        self.graph = graph
+        self.state_id = state_id
+
+    def __getitem__(self, label):
+        load_id = self.graph.label_ids.get(label)
+        if load_id is None:
+            raise KeyError(label)
+        target = self.graph.transition(self.state_id, load_id)
+        if target < 0:
+            raise KeyError(label)
+        return self.graph.decode(target)
+
+    def __iter__(self):
+        for load_id, _ in self.graph.edges(self.state_id):
+            yield self.graph.labels[load_id]
+
+    def __len__(self):
+        offsets = self.graph.offsets
+        return offsets[self.state_id + 1] - offsets[self.state_id]
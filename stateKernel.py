@@ -0,0 +1,238 @@
+"""
+State Kernel Module
+
+This module contains the vectorized kernels of the state graph. They take
+whole arrays of encoded states and every boat load of a capacity, and in
+one batched NumPy operation per block of states compute the next states,
+the mask of legal moves and the failure or success class of every state,
+instead of looping over states in Python. StateGraph uses them for large
+instances when NumPy is installed and falls back to its pure Python build
+otherwise.
+
+Author: MONEEB ABDALBADIE NASRALLAH ALI KARRAR
+Date: 18/12/2023
+
+"""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # StateGraph keeps its pure Python build
+    np = None
+
+from stateGraph import FAILURE, NORMAL, SUCCESS
+
+BLOCK_STATES = 1 << 16
+SMALL_FRONTIER = 64
+
+
+def decode(state_ids, cannibals):
+    """
+    Decode arrays of state ids into (missionaries, cannibals, boat).
+
+    Parameters:
+    state_ids: Integer array of encoded states
+    cannibals: Total number of cannibals
+
+    Returns:
+    m, c, b: Integer arrays counted on the starting bank
+    """
+    m, c = np.divmod(state_ids >> 1, cannibals + 1)
+    return m, c, state_ids & 1
+
+
+def classify(state_ids, missionaries, cannibals):
+    """
+    Classify states as NORMAL, FAILURE or SUCCESS.
+
+    A state fails when the missionaries of a bank are outnumbered by the
+    cannibals of that bank; it succeeds when everyone and the boat are on
+    the far bank.
+
+    Parameters:
+    state_ids: Integer array of encoded states
+    missionaries: Total number of missionaries
+    cannibals: Total number of cannibals
+
+    Returns:
+    kind: uint8 array with the class of every state
+    """
+    m, c, b = decode(state_ids, cannibals)
+    right_m = missionaries - m
+    failure = ((m > 0) & (c > m)) | \
+        ((right_m > 0) & (cannibals - c > right_m))
+    kind = np.where(failure, FAILURE, NORMAL).astype(np.uint8)
+    kind[(m == 0) & (c == 0) & (b == 0) & ~failure] = SUCCESS
+    return kind
+
+
+def expand(state_ids, loads, missionaries, cannibals, kind=None):
+    """
+    Apply every boat load to every state of a frontier.
+
+    Parameters:
+    state_ids: Integer array of encoded states
+    loads: Array of shape (loads, 2) with the (dm, dc) boat loads
+    missionaries: Total number of missionaries
+    cannibals: Total number of cannibals
+    kind: Optional classes of state_ids, computed when omitted
+
+    Returns:
+    targets: Array of shape (states, loads) with the next state ids,
+    only meaningful where valid is True
+    valid: Boolean array of the same shape, True for legal moves; only
+    NORMAL states have legal moves
+    """
+    if kind is None:
+        kind = classify(state_ids, missionaries, cannibals)
+    m, c, b = decode(state_ids, cannibals)
+    dm = loads[:, 0]
+    dc = loads[:, 1]
+    shifts = 2 * (dm * (cannibals + 1) + dc) + 1
+    start_bank = (b == 1)[:, None]
+    # With the boat on the starting bank people cross from there,
+    # otherwise they come back from the far bank.
+    available_m = np.where(start_bank, m[:, None], (missionaries - m)[:, None])
+    available_c = np.where(start_bank, c[:, None], (cannibals - c)[:, None])
+    valid = (dm <= available_m) & (dc <= available_c) & \
+        (kind == NORMAL)[:, None]
+    targets = np.where(start_bank, state_ids[:, None] - shifts,
+                       state_ids[:, None] + shifts)
+    return targets, valid
+
+
+def safe_states(missionaries, cannibals):
+    """
+    Return every state where no missionaries are outnumbered.
+
+    For every missionary count the safe cannibal counts form one range,
+    so the safe states are generated from per-count bounds without
+    looking at the failure states at all.
+
+    Parameters:
+    missionaries: Total number of missionaries
+    cannibals: Total number of cannibals
+
+    Returns:
+    state_ids: Sorted int64 array of encoded safe states, both boat
+    sides included
+    """
+    m = np.arange(missionaries + 1, dtype=np.int64)
+    right_m = missionaries - m
+    low = np.where(right_m > 0, np.maximum(cannibals - right_m, 0), 0)
+    high = np.where(m > 0, np.minimum(m, cannibals), cannibals)
+    counts = np.maximum(high - low + 1, 0)
+    firsts = np.cumsum(counts) - counts
+    c = np.arange(int(counts.sum()), dtype=np.int64) + \
+        np.repeat(low - firsts, counts)
+    base = (np.repeat(m, counts) * (cannibals + 1) + c) * 2
+    return np.stack([base, base + 1], axis=1).ravel()
+
+
+def build(missionaries, cannibals, loads, block=BLOCK_STATES):
+    """
+    Build the state classes and CSR transition arrays of a graph.
+
+    Only safe states are expanded, a block at a time, so the
+    (states, loads) intermediate arrays stay bounded whatever the
+    instance size.
+
+    Parameters:
+    missionaries: Total number of missionaries
+    cannibals: Total number of cannibals
+    loads: List of (missionaries, cannibals) boat loads
+    block: Number of states expanded at a time
+
+    Returns:
+    kind, offsets, targets, moves: NumPy arrays laid out like the
+    StateGraph arrays, transitions of a state ordered by load index
+    """
+    load_array = np.array(loads, dtype=np.int64).reshape(-1, 2)
+    load_ids = np.arange(len(loads), dtype=np.int64)
+    state_count = 2 * (missionaries + 1) * (cannibals + 1)
+    safe = safe_states(missionaries, cannibals)
+    kind = np.full(state_count, FAILURE, dtype=np.uint8)
+    kind[safe] = NORMAL
+    if kind[0] == NORMAL:
+        kind[0] = SUCCESS
+    counts = np.zeros(state_count + 1, dtype=np.int64)
+    target_blocks = []
+    move_blocks = []
+    for first in range(0, len(safe), block):
+        state_ids = safe[first:first + block]
+        targets, valid = expand(state_ids, load_array, missionaries,
+                                cannibals, kind[state_ids])
+        counts[state_ids + 1] = valid.sum(axis=1)
+        target_blocks.append(targets[valid])
+        move_blocks.append(np.broadcast_to(load_ids, valid.shape)[valid])
+    offsets = np.cumsum(counts)
+    return (kind, offsets, np.concatenate(target_blocks),
+            np.concatenate(move_blocks))
+
+
+def to_array(values, typecode):
+    """
+    Copy a NumPy array into an array.array of the given typecode.
+
+    Parameters:
+    values: NumPy array
+    typecode: array module typecode such as "B" or "I"
+
+    Returns:
+    array: array.array holding the same values
+    """
+    result = array(typecode)
+    result.frombytes(values.astype(np.dtype(typecode)).tobytes())
+    return result
+
+
+def reachable(offsets, targets, start, state_count):
+    """
+    Flag the states reachable from start, one frontier at a time.
+
+    Frontiers of at least SMALL_FRONTIER states are expanded in one
+    batched operation; smaller ones, common in deep and narrow graphs
+    where a NumPy call costs more than the work it does, are expanded
+    edge by edge.
+
+    Parameters:
+    offsets: CSR row offsets of the graph, an array.array
+    targets: CSR transition targets of the graph, an array.array
+    start: Encoded start state
+    state_count: Number of states
+
+    Returns:
+    reachable: bytearray, 1 for every reachable state
+    """
+    seen = bytearray(state_count)
+    seen_view = np.frombuffer(seen, dtype=np.uint8)
+    offset_view = np.frombuffer(offsets, dtype=offsets.typecode)
+    target_view = np.frombuffer(targets, dtype=targets.typecode)
+    seen[start] = 1
+    frontier = [start]
+    while len(frontier):
+        if len(frontier) < SMALL_FRONTIER:
+            next_frontier = []
+            for state_id in frontier:
+                for edge in range(offsets[state_id], offsets[state_id + 1]):
+                    target = targets[edge]
+                    if not seen[target]:
+                        seen[target] = 1
+                        next_frontier.append(target)
+            frontier = next_frontier
+            continue
+        frontier = np.asarray(frontier, dtype=np.int64)
+        begins = offset_view[frontier].astype(np.int64)
+        lengths = offset_view[frontier + 1].astype(np.int64) - begins
+        total = int(lengths.sum())
+        # Edge indexes of the whole frontier: each row's begin repeated
+        # over its length, plus the position inside the row.
+        row_starts = np.cumsum(lengths) - lengths
+        edges = np.repeat(begins - row_starts, lengths) + \
+            np.arange(total, dtype=np.int64)
+        found = np.unique(target_view[edges])
+        frontier = found[seen_view[found] == 0]
+        seen_view[frontier] = 1
+        if len(frontier) < SMALL_FRONTIER:
+            frontier = frontier.tolist()
+    return seen
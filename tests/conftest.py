@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture()
+def display(monkeypatch):
+    """
+    Window of the game's size on SDL's dummy video driver, with fonts
+    and the working directory at the repository root, so assets load
+    by name. The sprite atlas is rebuilt for every display.
+    """
+    pygame = pytest.importorskip("pygame")
+    import gameFunctions
+    from gameAtlas import load_atlas
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.chdir(ROOT)
+    pygame.display.init()
+    pygame.font.init()
+    load_atlas.cache_clear()
+    yield pygame.display.set_mode((gameFunctions.SCREEN_WIDTH,
+                                   gameFunctions.SCREEN_HEIGHT))
+    load_atlas.cache_clear()
+    pygame.display.quit()
@@ -0,0 +1,35 @@
+from gameActors import Actor, BoatOccupancy, Role
+
+
+def make_actors():
+    return [Actor(Role.CANNIBAL) for _ in range(3)] + \
+        [Actor(Role.MISSIONARY) for _ in range(3)] + [Actor(Role.BOAT)]
+
+
+def test_initial_counts():
+    occupancy = BoatOccupancy(make_actors())
+    assert occupancy.banks == ([3, 3], [0, 0])
+    assert occupancy.load == (0, 0)
+    assert occupancy.count == 0
+
+
+def test_board_cross_and_unboard():
+    actors = make_actors()
+    occupancy = BoatOccupancy(actors)
+    occupancy.board(actors[0])
+    occupancy.board(actors[3])
+    assert occupancy.load == (1, 1)
+    assert occupancy.banks == ([2, 2], [0, 0])
+    occupancy.cross()
+    assert occupancy.boat.right_side and actors[0].right_side
+    occupancy.unboard(actors[0])
+    assert occupancy.load == (1, 0)
+    assert occupancy.banks == ([2, 2], [0, 1])
+    assert not actors[0].on_boat and actors[0].right_side
+    assert occupancy.passengers == [actors[3]]
+    assert BoatOccupancy(actors).banks == occupancy.banks
+
+
+def test_role_files():
+    assert Actor(Role.BOAT).file == "boat.png"
+    assert Role.MISSIONARY.file == "missionary.png"
@@ -0,0 +1,29 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from gameAssets import AssetCache  # noqa: E402
+
+@pytest.fixture()
+def cache(display):
+    cache = AssetCache()
+    yield cache
+    cache.shutdown()
+
+
+def test_images_are_decoded_once(cache, monkeypatch):
+    calls = []
+    load = pygame.image.load
+    monkeypatch.setattr(pygame.image, "load",
+                        lambda path: calls.append(path) or load(path))
+    first = cache.image("cannibal.png", alpha=True)
+    assert cache.image("cannibal.png", alpha=True) is first
+    assert calls == ["cannibal.png"]
+
+
+def test_prefetched_image_is_shared(cache):
+    deferred = cache.prefetch_image("winner.jpg")
+    surface = cache.image("winner.jpg")
+    assert deferred.get() is surface
+    assert deferred.ready()
+    assert cache.prefetch_image("winner.jpg").get() is surface
@@ -0,0 +1,69 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+import gameFunctions  # noqa: E402
+from gameActors import BoatOccupancy, Role  # noqa: E402
+from gameAtlas import load_atlas, pack  # noqa: E402
+
+
+def pixels(surface):
+    return pygame.image.tobytes(surface, "RGBA")
+
+
+def test_pack_places_rectangles_without_overlap():
+    sizes = [(300, 40), (500, 90), (400, 60), (200, 90)]
+    positions, size = pack(sizes, width=800)
+    rects = [pygame.Rect(position, wh)
+             for position, wh in zip(positions, sizes)]
+    assert all(not a.colliderect(b)
+               for i, a in enumerate(rects) for b in rects[i + 1:])
+    assert pygame.Rect((0, 0), size).unionall(rects) == \
+        pygame.Rect((0, 0), size)
+    assert size == (700, 150)
+
+
+def test_atlas_holds_the_sprites_and_the_mirrored_boat(display):
+    atlas = load_atlas()
+    assert load_atlas() is atlas
+    for role in Role:
+        image = pygame.image.load(role.file).convert_alpha()
+        area, flipped = atlas.sprites(role)
+        assert pixels(atlas.surface.subsurface(area)) == pixels(image)
+        if role is Role.BOAT:
+            mirrored = pygame.transform.flip(image, True, False)
+            assert pixels(atlas.surface.subsurface(flipped)) == \
+                pixels(mirrored)
+        else:
+            assert flipped is area
+
+
+def test_ferry_turns_the_boat_without_new_surfaces(display, monkeypatch):
+    actors = gameFunctions.create_actors(display.get_rect())[0]
+    occupancy = BoatOccupancy(actors)
+    boat = occupancy.boat
+    monkeypatch.setattr(pygame.transform, "flip", None)
+    done = False
+    boat_x = float(boat.rect.x)
+    while not done:
+        done, boat_x = gameFunctions.ferry(occupancy, 1, 0.1, boat_x)
+    assert boat.flipped and boat.area is boat.sprites[1]
+    gameFunctions.reset_actors(actors, display.get_rect())
+    assert not boat.flipped
+
+
+def test_renderer_redraws_a_turned_boat(display):
+    atlas = load_atlas()
+    actors = gameFunctions.create_actors(display.get_rect())[0]
+    background = pygame.Surface(display.get_size()).convert()
+    renderer = gameFunctions.Renderer(display, background,
+                                      background.get_rect(), 24)
+    renderer.draw(actors, 0)
+    assert renderer.draw(actors, 0) == []
+    boat = actors[-1]
+    boat.flip()
+    assert renderer.draw(actors, 0) == [boat.rect]
+    drawn = display.subsurface(boat.rect).copy()
+    expected = background.subsurface(boat.rect).copy()
+    expected.blit(atlas.surface, (0, 0), boat.area)
+    assert pixels(drawn) == pixels(expected)
@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("pygame")
+
+from gameBench import compare, timed  # noqa: E402
+
+
+def test_timed_reports_per_call_seconds():
+    calls = []
+    result = timed(lambda: calls.append(1), number=10, repeat=3)
+    assert len(calls) == 30
+    assert result["number"] == 10
+    assert 0 <= result["best"] <= result["median"]
+
+
+def test_compare_flags_slowdowns_over_threshold():
+    baseline = {"a": {"best": 1.0}, "b": {"best": 2.0}, "gone": {"best": 1}}
+    results = {"a": {"best": 1.2}, "b": {"best": 3.0}, "new": {"best": 1}}
+    rows = {row[0]: row for row in compare(results, baseline, 0.25)}
+    assert set(rows) == {"a", "b"}
+    assert not rows["a"][4]
+    assert rows["b"][4]
+    assert rows["b"][3] == 1.5
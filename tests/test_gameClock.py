@@ -0,0 +1,59 @@
+from time import perf_counter
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from gameClock import FrameScheduler  # noqa: E402
+
+pytestmark = pytest.mark.usefixtures("display")
+
+
+def test_idle_frames_block_until_the_timeout():
+    scheduler = FrameScheduler(idle_timeout=60)
+    pygame.event.clear()
+    start = perf_counter()
+    events, _ = scheduler.next_frame(False)
+    assert events == []
+    assert perf_counter() - start >= 0.05
+    assert scheduler.waited >= 0.05
+
+
+def test_idle_frames_return_with_the_first_event():
+    scheduler = FrameScheduler(idle_timeout=5000)
+    pygame.event.clear()
+    pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+    start = perf_counter()
+    events, _ = scheduler.next_frame(False)
+    assert perf_counter() - start < 1
+    assert [event.type for event in events] == [pygame.USEREVENT]
+
+
+def test_active_frames_tick_at_the_frame_rate():
+    scheduler = FrameScheduler(active_fps=50, max_frame_time=1)
+    scheduler.next_frame(True)
+    start = perf_counter()
+    dts = [scheduler.next_frame(True)[1] for _ in range(5)]
+    assert perf_counter() - start >= 5 * 0.02 * 0.9
+    assert all(dt >= 0.018 for dt in dts)
+
+
+def test_frame_time_is_capped():
+    scheduler = FrameScheduler(idle_timeout=100, max_frame_time=0.05)
+    pygame.event.clear()
+    _, dt = scheduler.next_frame(False)
+    assert dt <= 0.05
+
+
+def test_zero_timeout_polls_instead_of_blocking():
+    # pygame.event.wait(0) blocks until the next event; a scene whose
+    # deadline has passed must not wait for the player to move.
+    scheduler = FrameScheduler()
+    pygame.event.clear()
+    start = perf_counter()
+    events, _ = scheduler.next_frame(False, 0)
+    assert events == []
+    assert perf_counter() - start < 0.1
+    pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+    events, _ = scheduler.next_frame(False, -5)
+    assert [event.type for event in events] == [pygame.USEREVENT]
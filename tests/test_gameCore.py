@@ -0,0 +1,61 @@
+from gameCore import (FAILURE, ILLEGAL, MOVED, SUCCESS, GameCore, GameState,
+                      create_core, create_gamegraph, headless_passengers,
+                      passengersCombination)
+
+WINNING_GAME = ["m1c1", "m1", "c1c2", "c1", "m1m2", "m1c1", "m1m2", "c1",
+                "c1c2", "c1", "c1c2"]
+
+
+def test_step_moves_and_counts():
+    core = create_core()
+    state, outcome = core.step(core.initial_state(), "m1c1")
+    assert outcome == MOVED
+    assert state == GameState((2, 2, 0), 1)
+
+
+def test_step_accepts_boat_loads():
+    core = create_core()
+    assert core.step(core.initial_state(), (1, 1)) == \
+        core.step(core.initial_state(), "m2c3")
+
+
+def test_step_failure_and_success():
+    core = create_core()
+    assert core.step(core.initial_state(), "m1")[1] == FAILURE
+    state, outcome = core.replay(WINNING_GAME)
+    assert outcome == SUCCESS
+    assert state == GameState((0, 0, 0), 11)
+
+
+def test_illegal_moves_keep_the_state():
+    core = create_core()
+    start = core.initial_state()
+    assert core.step(start, "zz") == (start, ILLEGAL)
+    assert core.step(start, (3, 0)) == (start, ILLEGAL)
+    state, _ = core.step(start, "c1")
+    # Only one cannibal is on the far bank, two cannot come back.
+    assert core.step(state, "c1c2") == (state, ILLEGAL)
+
+
+def test_unknown_and_finished_states_are_illegal():
+    core = create_core()
+    for gamestate in [(3, 3, 0), (2, 0, 1), (7, 7, 1), (2, 3, 0),
+                      (0, 0, 0)]:
+        state = GameState(gamestate, 0)
+        assert core.step(state, "m1") == (state, ILLEGAL)
+
+
+def test_replay_stops_at_the_end_of_the_game():
+    core = create_core()
+    state, outcome = core.replay(["m1", "c1"])
+    assert outcome == FAILURE
+    assert state.movement_count == 1
+    assert core.replay([]) == (core.initial_state(), MOVED)
+
+
+def test_start_follows_generated_graph():
+    core = GameCore(create_gamegraph(5, 5, 3), headless_passengers(),
+                    passengersCombination())
+    assert core.initial_state() == GameState((5, 5, 1), 0)
+    assert core.step(core.initial_state(), (0, 3))[0].gamestate == (5, 2, 0)
+    assert core.step(core.initial_state(), (2, 1))[1] == FAILURE
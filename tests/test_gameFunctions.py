@@ -0,0 +1,65 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from gameActors import Actor, BoatOccupancy, Role  # noqa: E402
+from gameFunctions import (BOAT_LEFT_X, BOAT_RIGHT_X, BOAT_SPEED,  # noqa: E402
+                           BOAT_START_X, ferry)
+
+
+def make_occupancy():
+    boat = Actor(Role.BOAT, rect=pygame.Rect(BOAT_START_X, 500, 100, 40))
+    people = [Actor(Role.MISSIONARY, rect=pygame.Rect(500, 460, 30, 60)),
+              Actor(Role.CANNIBAL, rect=pygame.Rect(570, 460, 30, 60))]
+    occupancy = BoatOccupancy(people + [boat])
+    for actor in people:
+        occupancy.board(actor)
+    return occupancy
+
+
+def cross(occupancy, direction, steps):
+    boat_x = float(occupancy.boat.rect.x)
+    frames = 0
+    for dt in steps:
+        done, boat_x = ferry(occupancy, direction, dt, boat_x)
+        frames += 1
+        if done:
+            return frames, boat_x
+    return None, boat_x
+
+
+def test_ferry_moves_by_speed_times_dt():
+    occupancy = make_occupancy()
+    done, boat_x = ferry(occupancy, 1, 0.1, float(BOAT_START_X))
+    assert not done
+    assert boat_x == BOAT_START_X + BOAT_SPEED * 0.1
+    assert occupancy.boat.rect.x == int(boat_x)
+    # Passengers move with the boat.
+    assert [actor.rect.x for actor in occupancy.passengers] == \
+        [500 + 60, 570 + 60]
+
+
+def test_ferry_docks_at_the_banks():
+    occupancy = make_occupancy()
+    boat = occupancy.boat
+    frames, boat_x = cross(occupancy, 1, [0.3] * 10)
+    assert frames == 3
+    assert boat_x == BOAT_RIGHT_X and boat.rect.x == BOAT_RIGHT_X
+    assert boat.right_side and boat.flipped
+    assert all(actor.right_side for actor in occupancy.passengers)
+    frames, boat_x = cross(occupancy, -1, [1.0])
+    assert frames == 1
+    assert boat_x == BOAT_LEFT_X and boat.rect.x == BOAT_LEFT_X
+    assert not boat.right_side and not boat.flipped
+
+
+def test_crossing_does_not_depend_on_the_frame_rate():
+    positions = []
+    for dt in (1 / 30, 1 / 60, 1 / 144, 0.007):
+        occupancy = make_occupancy()
+        frames, boat_x = cross(occupancy, 1, [dt] * 1000)
+        positions.append((boat_x, [actor.rect.x
+                                   for actor in occupancy.passengers]))
+        assert frames * dt == pytest.approx(
+            (BOAT_RIGHT_X - BOAT_START_X) / BOAT_SPEED, abs=dt)
+    assert all(position == positions[0] for position in positions)
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from gameActors import Actor, Role  # noqa: E402
+from gameInput import InputDispatcher, SpatialGrid  # noqa: E402
+
+
+def make_actors(count, seed=1):
+    rng = random.Random(seed)
+    actors = []
+    for _ in range(count):
+        actor = Actor(Role.CANNIBAL)
+        actor.rect = pygame.Rect(rng.randrange(1200), rng.randrange(600),
+                                 rng.randrange(5, 120), rng.randrange(5, 120))
+        actors.append(actor)
+    return actors
+
+
+def linear_hit(actors, pos):
+    for actor in actors:
+        if actor.rect.collidepoint(pos):
+            return actor
+    return None
+
+
+def test_grid_matches_linear_scan():
+    actors = make_actors(300)
+    grid = SpatialGrid(actors)
+    rng = random.Random(2)
+    for _ in range(2000):
+        pos = (rng.randrange(1300), rng.randrange(700))
+        assert grid.hit(pos) is linear_hit(actors, pos)
+
+
+def test_grid_follows_moved_actors():
+    actors = make_actors(50)
+    grid = SpatialGrid(actors)
+    for actor in actors[::3]:
+        actor.rect.move_ip(400, -200)
+        grid.update(actor)
+    rng = random.Random(3)
+    for _ in range(1000):
+        pos = (rng.randrange(1700), rng.randrange(-200, 700))
+        assert grid.hit(pos) is linear_hit(actors, pos)
+
+
+def test_every_click_of_a_burst_is_queued_once():
+    dispatcher = InputDispatcher([])
+    events = [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1,
+                                 pos=(i, i)) for i in range(20)]
+    events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=3,
+                                     pos=(0, 0)))
+    dispatcher.dispatch(events)
+    assert list(dispatcher.clicks) == [(i, i) for i in range(20)]
+    assert not dispatcher.quit_requested
+    dispatcher.dispatch([pygame.event.Event(pygame.QUIT)],
+                        accept_clicks=False)
+    assert dispatcher.quit_requested
+    assert len(dispatcher.clicks) == 20
@@ -0,0 +1,65 @@
+import csv
+import json
+
+import gameProfiler
+from gameProfiler import PHASES, FrameProfiler, percentile
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_frames(profiler, clock, count, waited=0.0):
+    for _ in range(count):
+        profiler.begin_frame()
+        clock.now += 0.010
+        profiler.mark("events", waited)
+        clock.now += 0.002
+        profiler.mark("input")
+        clock.now += 0.001
+        profiler.mark("display")
+    profiler.end_frame()
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3, 1, 2], 0.5) == 2
+    assert percentile(range(100), 0.99) == 99
+
+
+def test_phases_exclude_waiting(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(gameProfiler, "perf_counter", clock)
+    profiler = FrameProfiler(history=4)
+    run_frames(profiler, clock, 10, waited=0.009)
+    stats = profiler.stats()
+    assert profiler.frames == 10
+    assert abs(stats["phases"]["events"] - 1.0) < 1e-6
+    assert abs(stats["phases"]["input"] - 2.0) < 1e-6
+    assert stats["phases"]["ferry"] == 0
+    assert abs(stats["p50"] - 4.0) < 1e-6
+    assert abs(stats["fps"] - 1 / 0.013) < 1e-6
+
+
+def test_export_csv_and_json(tmp_path, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(gameProfiler, "perf_counter", clock)
+    profiler = FrameProfiler(record=True)
+    run_frames(profiler, clock, 3)
+    csv_path = str(tmp_path / "trace.csv")
+    json_path = str(tmp_path / "trace.json")
+    profiler.export(csv_path)
+    profiler.export(json_path)
+    with open(csv_path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [int(row["frame"]) for row in rows] == [0, 1, 2]
+    assert set(PHASES) <= set(rows[0])
+    with open(json_path) as file:
+        trace = json.load(file)
+    assert trace["phases"] == list(PHASES)
+    assert len(trace["frames"]) == 3
+    assert abs(trace["frames"][1]["input"] - 0.002) < 1e-9
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from gameCore import GameCore, create_gamegraph, headless_passengers, \
+    passengersCombination
+from gameRecord import (HEADER, RECORD, GameRecorder, RecordError,
+                        read_records, validate)
+from stateGraph import StateGraph
+
+SOLUTION = [(1, 1), (1, 0), (0, 2), (0, 1), (2, 0), (1, 1),
+            (2, 0), (0, 1), (0, 2), (1, 0), (1, 1)]
+
+
+def play(recorder, core, loads):
+    recorder.new_game()
+    state = core.initial_state()
+    for load in loads:
+        previous = state.gamestate
+        state, outcome = core.step(state, load)
+        recorder.record(previous, load, state.gamestate, outcome)
+
+
+@pytest.fixture
+def core():
+    return GameCore(create_gamegraph(), headless_passengers(),
+                    passengersCombination())
+
+
+def test_recorded_games_validate(tmp_path, core):
+    path = str(tmp_path / "games.mcr")
+    with GameRecorder(path, core.gamegraph.graph) as recorder:
+        play(recorder, core, SOLUTION)
+        play(recorder, core, [(0, 2), (2, 2), (0, 1), (2, 0)])
+        play(recorder, core, [(1, 1), (1, 0)])
+    assert os.path.getsize(path) == HEADER.size + 17 * RECORD.size
+    stats = validate(path, chunk_records=3).as_dict()
+    assert stats["games"] == 3
+    assert stats["successes"] == 1
+    assert stats["failures"] == 1
+    assert stats["abandoned"] == 1
+    assert stats["illegal"] == 1
+    assert stats["invalid"] == 0
+    assert stats["move_counts"] == {11: 1}
+
+
+def test_appending_continues_game_numbers(tmp_path, core):
+    path = str(tmp_path / "games.mcr")
+    with GameRecorder(path, core.gamegraph.graph) as recorder:
+        play(recorder, core, SOLUTION)
+    with open(path, "ab") as file:
+        file.write(b"\x01\x02\x03")
+    with GameRecorder(path, core.gamegraph.graph) as recorder:
+        play(recorder, core, SOLUTION)
+    games = {record[0] for record in read_records(path)}
+    assert games == {0, 1}
+    assert validate(path).successes == 2
+    with pytest.raises(RecordError):
+        GameRecorder(path, StateGraph(4, 4, 3))
+
+
+def test_tampered_record_is_invalid(tmp_path, core):
+    path = str(tmp_path / "games.mcr")
+    with GameRecorder(path, core.gamegraph.graph) as recorder:
+        play(recorder, core, SOLUTION)
+        play(recorder, core, SOLUTION)
+    with open(path, "r+b") as file:
+        file.seek(HEADER.size + 2 * RECORD.size)
+        game, source, target, dm, dc, code = RECORD.unpack(
+            file.read(RECORD.size))
+        file.seek(-RECORD.size, os.SEEK_CUR)
+        file.write(RECORD.pack(game, source, target, 2, 0, code))
+    stats = validate(path)
+    assert stats.invalid == 1
+    assert stats.successes == 1
+    assert stats.errors[0][0] == 2
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a record file at all")
+    with pytest.raises(RecordError):
+        validate(str(path))
@@ -0,0 +1,51 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+import gameFunctions  # noqa: E402
+from gameRender import Renderer, get_font, render_text  # noqa: E402
+
+
+@pytest.fixture()
+def scene(display):
+    background = pygame.Surface(display.get_size()).convert()
+    background.fill((40, 90, 160))
+    renderer = Renderer(display, background, background.get_rect(), 24)
+    actors = gameFunctions.create_actors(display.get_rect())[0]
+    renderer.draw(actors, 0)
+    return renderer, actors
+
+
+def test_first_frame_and_invalidate_redraw_the_whole_window(display, scene):
+    renderer, actors = scene
+    assert renderer.draw(actors, 0) == []
+    renderer.invalidate()
+    assert renderer.draw(actors, 0) == [display.get_rect()]
+    assert renderer.draw(actors, 0) == []
+
+
+def test_only_moved_sprites_are_redrawn(display, scene):
+    renderer, actors = scene
+    moved = actors[0]
+    before = moved.rect.copy()
+    moved.rect.move_ip(5, 0)
+    dirty = renderer.draw(actors, 0)
+    assert dirty == [before.union(moved.rect)]
+    # The old position shows the background again, the new one the sprite.
+    assert display.get_at((before.x, before.centery)) == \
+        renderer.background.get_at((before.x, before.centery))
+    assert renderer.draw(actors, 0) == []
+
+
+def test_move_counter_change_redraws_only_the_counter(scene):
+    renderer, actors = scene
+    old = render_text("Moves: 0", 24, (0, 0, 0)).get_rect(topleft=(10, 10))
+    new = render_text("Moves: 1", 24, (0, 0, 0)).get_rect(topleft=(10, 10))
+    assert renderer.draw(actors, 1) == [old.union(new)]
+
+
+def test_fonts_and_texts_are_cached(display):
+    assert get_font(24) is get_font(24)
+    first = render_text("Moves: 3", 24, (0, 0, 0))
+    assert render_text("Moves: 3", 24, (0, 0, 0)) is first
+    assert render_text("Moves: 4", 24, (0, 0, 0)) is not first
@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from gameCore import create_gamegraph  # noqa: E402
+from gameRollout import RolloutTables, rollouts, simulate  # noqa: E402
+from stateGraph import StateGraph  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return RolloutTables(create_gamegraph())
+
+
+def test_random_players_add_up(tables):
+    stats = simulate(tables, 20000, rng=np.random.default_rng(1))
+    assert stats.games == stats.successes + stats.failures + stats.abandoned
+    assert stats.failure_edges.sum() == stats.failures
+    assert stats.success_moves.sum() == stats.successes
+    # The boat alternates banks, so games are won in an odd move count.
+    assert not stats.success_moves[::2].any()
+    summary = stats.summary(tables.graph, top=2)
+    assert [(move["state"], move["move"])
+            for move in summary["losing_moves"]] in (
+        [((3, 3, 1), "2m"), ((3, 3, 1), "m")],
+        [((3, 3, 1), "m"), ((3, 3, 1), "2m")])
+
+
+def test_skilled_players_win_in_the_minimum(tables):
+    stats = simulate(tables, 1000, skill=1.0)
+    assert stats.successes == 1000
+    assert stats.summary(tables.graph)["moves_to_success"]["histogram"] \
+        == {11: 1000}
+
+
+def test_careful_players_never_lose(tables):
+    stats = simulate(tables, 1000, caution=1.0, max_moves=50)
+    assert stats.failures == 0
+    assert stats.successes + stats.abandoned == 1000
+
+
+def test_unsolvable_puzzles_are_never_won():
+    stats = simulate(RolloutTables(StateGraph(4, 4, 2)), 5000, skill=0.5)
+    assert stats.successes == 0
+    assert stats.failures + stats.abandoned == 5000
+
+
+def test_results_do_not_depend_on_the_workers():
+    inline = rollouts(games=3000, batch=1000, workers=1, seed=7)
+    pooled = rollouts(games=3000, batch=1000, workers=2, seed=7)
+    assert inline.games == pooled.games == 3000
+    assert inline.successes == pooled.successes
+    assert (inline.failure_edges == pooled.failure_edges).all()
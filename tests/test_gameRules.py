@@ -0,0 +1,96 @@
+import pytest
+
+from gameRules import (RuleGraph, RuleSet, classic, jealous_couples,
+                       outnumbered, variant)
+from gameSolver import Solver
+from graphStore import GraphCache
+from stateGraph import StateGraph
+
+
+@pytest.mark.parametrize("size", [(3, 3, 2), (4, 4, 3), (5, 5, 3),
+                                  (4, 4, 2), (10, 10, 4), (6, 3, 2)])
+def test_classic_rules_match_the_state_graph(size):
+    rules = RuleGraph(classic(*size))
+    graph = StateGraph(*size)
+    assert Solver(rules).min_moves() == Solver(graph).min_moves()
+    assert sum(rules.reachable) == sum(graph.reachable)
+    assert rules.edge_count == sum(
+        graph.offsets[state_id + 1] - graph.offsets[state_id]
+        for state_id in range(graph.state_count)
+        if graph.reachable[state_id])
+
+
+@pytest.mark.parametrize("couples, capacity, moves", [
+    (3, 2, 11), (4, 2, None), (4, 3, 9), (5, 3, 11), (6, 3, None)])
+def test_jealous_couples(couples, capacity, moves):
+    assert Solver(RuleGraph(jealous_couples(couples, capacity))) \
+        .min_moves() == moves
+
+
+def test_an_island_makes_four_couples_solvable():
+    graph = RuleGraph(variant("jealous-island", 4, 4, 2))
+    solution = Solver(graph).solution()
+    assert solution is not None
+    assert all(label[-1] in "<>" for label in solution)
+
+
+def test_every_move_respects_crew_and_leg_capacity():
+    rules = RuleSet("wide-leg", ("m", "c"), (3, 3),
+                    outnumbered((0,), (1,)), (2, 3), min_crew=2)
+    graph = RuleGraph(rules)
+    for state_id in range(graph.state_count):
+        _, boat = graph.decode(state_id)
+        for load_id, target in graph.edges(state_id):
+            load, _ = graph.loads[load_id]
+            there = graph.decode(target)[1]
+            assert abs(there - boat) == 1
+            assert 2 <= sum(load) <= rules.capacities[min(boat, there)]
+    assert Solver(RuleGraph(variant("two-rowers"))).min_moves() is None
+
+
+def test_states_views_and_transitions():
+    graph = RuleGraph(jealous_couples(3, 2))
+    start = (((1,) * 6, (0,) * 6), 0)
+    assert graph.decode(graph.encode(start)) == start
+    view = graph.as_gamegraph()
+    assert view[start]["h1w1"] == (((0, 0, 1, 1, 1, 1),
+                                    (1, 1, 0, 0, 0, 0)), 1)
+    # A husband leaving his wife with other husbands loses.
+    assert view[view[start]["h1"]] == "failure"
+    # Nobody rows alone with someone else's wife.
+    assert "h1w2" not in graph.label_ids
+    assert graph.transition(graph.goal, graph.label_ids["h1w1"]) == -1
+    with pytest.raises(ValueError):
+        graph.encode((((1,) * 6, (1,) * 6), 0))
+
+
+def test_rule_graphs_are_cached(tmp_path):
+    cache = GraphCache(str(tmp_path))
+    cache.load(3, 3, 2, rules="jealous-couples")
+    graph, solver = cache.load(3, 3, 2, rules="jealous-couples")
+    assert isinstance(graph, RuleGraph)
+    assert isinstance(graph.targets, memoryview)
+    assert solver.min_moves() == 11
+    assert solver.solution() == \
+        Solver(RuleGraph(jealous_couples(3, 2))).solution()
+    assert solver.hint(graph.decode(graph.start)) == "h1w1"
+    with pytest.raises(ValueError):
+        cache.load(3, 2, 2, rules="jealous-couples")
+
+
+@pytest.mark.parametrize("rules", [jealous_couples(3, 2, islands=1),
+                                   classic(5, 5, 3, islands=1)])
+def test_transition_table_matches_the_rows(rules):
+    graph = RuleGraph(rules)
+    for state_id in range(graph.state_count):
+        row = {graph.moves[edge]: graph.targets[edge]
+               for edge in range(graph.offsets[state_id],
+                                 graph.offsets[state_id + 1])}
+        for load_id in range(len(graph.loads)):
+            assert graph.transition(state_id, load_id) == \
+                row.get(load_id, -1)
+
+
+def test_rule_sets_beyond_the_safety_table_are_refused():
+    with pytest.raises(ValueError, match="safety table"):
+        RuleGraph(jealous_couples(13, 2))
@@ -0,0 +1,51 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from gameScenes import Scene, SceneQueue  # noqa: E402
+
+CLICK = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(0, 0))
+
+
+pytestmark = pytest.mark.usefixtures("display")
+
+
+def make_queue(shown):
+    scenes = SceneQueue()
+    scenes.push(Scene(lambda: shown.append("welcome"), 1000))
+    scenes.push(Scene(lambda: shown.append("rules"), 7000))
+    return scenes
+
+
+def test_scenes_follow_their_deadlines():
+    shown = []
+    scenes = make_queue(shown)
+    assert scenes.time_left(now=0) == 1000
+    assert scenes.update([], now=0)
+    assert shown == ["welcome"]
+    assert scenes.time_left(now=400) == 600
+    assert scenes.update([], now=999)
+    assert scenes.update([], now=1000)
+    assert shown == ["welcome", "rules"]
+    assert scenes.update([], now=7999)
+    assert not scenes.update([], now=8000)
+    assert not scenes.active
+    assert scenes.time_left() is None
+
+
+def test_click_ends_the_current_scene_early():
+    shown = []
+    scenes = make_queue(shown)
+    scenes.update([], now=0)
+    assert scenes.update([CLICK], now=10)
+    assert shown == ["welcome", "rules"]
+    assert not scenes.update([CLICK], now=20)
+    assert shown == ["welcome", "rules"]
+
+
+def test_time_left_of_a_queued_scene_is_its_duration():
+    scenes = make_queue([])
+    assert scenes.time_left(now=5000) == 1000
+    scenes.update([], now=5000)
+    assert scenes.time_left(now=5400) == 600
+    assert scenes.time_left(now=9000) == 0
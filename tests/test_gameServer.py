@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import pytest
+
+from gameLoadTest import load_test
+from gameServer import (MAX_LINE_BYTES, GameServer, create_server_core,
+                        start_server)
+
+
+@pytest.fixture
+def server():
+    return GameServer(create_server_core())
+
+
+def new_session(server, sessions):
+    return server.handle(sessions, {"op": "new"})["session"]
+
+
+def test_boat_follows_game_loop_rules(server):
+    sessions = {}
+    session = new_session(server, sessions)
+
+    def request(op, **fields):
+        return server.handle(sessions, {"op": op, "session": session,
+                                        **fields})
+
+    assert request("cross")["error"] == "the boat is empty"
+    assert request("board", role="m")["boat"] == [1, 0]
+    assert request("board", role="c")["boat"] == [1, 1]
+    assert request("board", role="c")["error"] == "the boat is full"
+    assert request("unboard", role="m")["boat"] == [0, 1]
+    assert request("board", role="c")["boat"] == [0, 2]
+    reply = request("cross")
+    assert reply["state"] == (3, 1, 0)
+    assert reply["moves"] == 1
+    # Passengers stay on the boat after crossing, like in game_loop.
+    assert reply["boat"] == [0, 2]
+    assert request("board", role="m")["error"] == "the boat is full"
+    request("unboard", role="c")
+    assert request("board", role="m")["error"] == "nobody left to board"
+    assert request("move", load=[2, 0])["error"] == \
+        "these people cannot board"
+    assert request("move", load=[0, 1])["state"] == (3, 2, 1)
+
+
+def test_finished_games_and_errors(server):
+    sessions = {}
+    session = new_session(server, sessions)
+    reply = server.handle(sessions, {"op": "move", "session": session,
+                                     "passengers": "m1"})
+    assert reply["outcome"] == "failure"
+    assert server.handle(sessions, {"op": "board", "session": session,
+                                    "role": "m"})["error"] == \
+        "the game is over"
+    reply = server.handle(sessions, {"op": "reset", "session": session})
+    assert reply["state"] == (3, 3, 1) and reply["outcome"] is None
+    assert server.handle(sessions, {"op": "fly"})["error"] == "unknown op"
+    assert server.handle(sessions, {"op": "state", "session": 99})[
+        "error"] == "unknown session"
+    assert server.handle(sessions, {"op": "move", "session": session,
+                                    "load": ["1", 1]})["error"] == \
+        "unknown load"
+    assert server.handle(sessions, {"op": "close", "session": session})["ok"]
+    assert server.sessions == 0
+
+
+def test_load_test_against_local_server(server):
+    async def run():
+        listener = await start_server(server, port=0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            return await load_test(sessions=50, connections=5, games=2,
+                                   port=port)
+
+    report = asyncio.run(run())
+    assert report["moves"] == 50 * 2 * 11
+    assert report["requests"] == 50 * (1 + 2 * 11 + 1)
+    assert server.moves == report["moves"]
+    assert server.sessions == 0
+
+
+@pytest.mark.parametrize("request_, error", [
+    ({"op": ["new"]}, "unknown op"),
+    ({"op": "state", "session": [1]}, "unknown session"),
+    ({"op": "state", "session": {"id": 1}}, "unknown session"),
+    ({"op": "state", "session": True}, "unknown session"),
+    ({"op": "board", "session": 1, "role": ["m"]},
+     'role must be "m" or "c"'),
+    ({"op": "move", "session": 1, "passengers": ["m1"]}, "unknown load"),
+    ({"op": "move", "session": 1, "load": {"m": 1}}, "unknown load"),
+])
+def test_malformed_requests_are_answered(server, request_, error):
+    sessions = {}
+    assert new_session(server, sessions) == 1
+    reply = server.handle(sessions, request_)
+    assert reply["ok"] is False and reply["error"] == error
+    assert server.handle(sessions, {"op": "state", "session": 1})["ok"]
+
+
+def test_bad_lines_do_not_drop_the_connection(server, monkeypatch):
+    def broken(*args):
+        raise RuntimeError("bug")
+
+    monkeypatch.setitem(server._handlers, "reset", broken)
+
+    async def run():
+        listener = await start_server(server, port=0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b'{"op":"new"}\n'
+                         b'{"op":"state","session":[1]}\n[1]\n{\n'
+                         b'{"op":"reset","session":1}\n'
+                         b'{"op":"state","session":1}\n')
+            replies = [json.loads(await reader.readline())
+                       for _ in range(6)]
+            writer.write(b"x" * (MAX_LINE_BYTES + 1))
+            too_long = json.loads(await reader.readline())
+            closed = await reader.read() == b""
+            writer.close()
+            return replies, too_long, closed
+
+    replies, too_long, closed = asyncio.run(run())
+    assert [reply["ok"] for reply in replies] == \
+        [True, False, False, False, False, True]
+    assert [reply.get("error") for reply in replies[1:5]] == \
+        ["unknown session", "invalid request", "invalid JSON",
+         "server error"]
+    assert too_long == {"ok": False, "error": "line too long"}
+    assert closed
+    assert server.sessions == 0
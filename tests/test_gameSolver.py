@@ -0,0 +1,67 @@
+from collections import deque
+
+import pytest
+
+from gameSolver import Solver, solve
+from stateGraph import NORMAL, StateGraph
+
+
+def forward_distance(graph, state_id):
+    """Moves from state_id to the goal found by a plain forward BFS."""
+    seen = {state_id: 0}
+    queue = deque([state_id])
+    while queue:
+        current = queue.popleft()
+        if current == graph.goal:
+            return seen[current]
+        for _, target in graph.edges(current):
+            if target not in seen:
+                seen[target] = seen[current] + 1
+                queue.append(target)
+    return None
+
+
+@pytest.mark.parametrize("missionaries, cannibals, capacity",
+                         [(3, 3, 2), (4, 4, 2), (4, 4, 3), (5, 3, 2),
+                          (6, 6, 4)])
+def test_distances_match_forward_bfs(missionaries, cannibals, capacity):
+    graph = StateGraph(missionaries, cannibals, capacity)
+    solver = Solver(graph)
+    for state_id in range(graph.state_count):
+        gamestate = graph.decode(state_id)
+        expected = forward_distance(graph, state_id)
+        assert solver.distance(gamestate) == expected
+        assert solver.is_solvable(gamestate) == (expected is not None)
+
+
+def test_known_minimum_moves():
+    assert solve(3, 3, 2).min_moves() == 11
+    assert solve(4, 4, 2).min_moves() is None
+    assert solve(4, 4, 3).min_moves() == 9
+    assert solve(5, 5, 3).min_moves() == 11
+
+
+def test_hints_follow_an_optimal_path():
+    graph = StateGraph(3, 3, 2)
+    solver = Solver(graph.as_gamegraph())
+    gamegraph = graph.as_gamegraph()
+    gamestate = (3, 3, 1)
+    moves = solver.solution()
+    assert len(moves) == 11
+    for move in moves:
+        assert solver.hint(gamestate) == move
+        gamestate = gamegraph[gamestate][move]
+    assert gamestate == (0, 0, 0)
+    assert solver.hint(gamestate) is None
+
+
+def test_unsolvable_states_have_no_hint():
+    solver = solve(3, 3, 2)
+    assert solver.hint((2, 3, 0)) is None
+    assert solver.solution((2, 3, 0)) is None
+    assert not solver.is_solvable((2, 3, 0))
+    graph = solver.graph
+    for state_id in range(graph.state_count):
+        if graph.kind[state_id] == NORMAL and \
+                solver.distance(graph.decode(state_id)) is not None:
+            assert solver.hint(graph.decode(state_id)) is not None
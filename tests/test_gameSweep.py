@@ -0,0 +1,43 @@
+import csv
+
+from gameSweep import configurations, main, parse_range, sweep
+
+
+def test_parse_range_includes_bounds():
+    assert list(parse_range("3")) == [3]
+    assert list(parse_range("1-4")) == [1, 2, 3, 4]
+    assert list(parse_range("0-10:5")) == [0, 5, 10]
+
+
+def test_configurations_skip_empty_puzzles():
+    configs = list(configurations(range(0, 2), range(0, 2), [2]))
+    assert configs == [(0, 1, 2), (1, 0, 2), (1, 1, 2)]
+    assert list(configurations(range(1, 3), range(1, 3), [2],
+                               equal=True)) == [(1, 1, 2), (2, 2, 2)]
+
+
+def test_pool_matches_inline_sweep():
+    configs = list(configurations(range(1, 6), range(1, 6), range(1, 4)))
+
+    def results(workers):
+        return sorted((row["missionaries"], row["cannibals"],
+                       row["capacity"], row["min_moves"])
+                      for row in sweep(configs, workers, chunk_size=7))
+
+    inline = results(1)
+    assert len(inline) == len(configs)
+    assert results(2) == inline
+    assert (3, 3, 2, 11) in inline
+    assert (4, 4, 2, "") in inline
+
+
+def test_main_writes_csv(tmp_path):
+    path = tmp_path / "sweep.csv"
+    main(["--missionaries", "3-4", "--cannibals", "3-4", "--capacity", "2-3",
+          "--equal", "--workers", "1", "--output", str(path)])
+    with open(path, newline="") as file:
+        rows = {(row["missionaries"], row["capacity"]): row
+                for row in csv.DictReader(file)}
+    assert rows[("3", "2")]["min_moves"] == "11"
+    assert rows[("4", "2")]["solvable"] == "False"
+    assert rows[("4", "3")]["min_moves"] == "9"
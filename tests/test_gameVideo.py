@@ -0,0 +1,125 @@
+import io
+import os
+import threading
+import zlib
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+import gameVideo  # noqa: E402
+
+FRAME_BYTES = gameVideo.FRAME_SIZE[0] * gameVideo.FRAME_SIZE[1] * 3
+
+
+def test_encode_png_round_trips(tmp_path):
+    data = bytes(range(5 * 3 * 3))
+    path = tmp_path / "small.png"
+    path.write_bytes(gameVideo.encode_png(data, 5, 3))
+    assert pygame.image.tobytes(pygame.image.load(str(path)), "RGB") == data
+
+
+def test_adler32_combine_matches_zlib():
+    first, second = bytes(range(256)) * 3, b"boat" * 1000
+    assert gameVideo.adler32_combine(
+        zlib.adler32(first), zlib.adler32(second), len(second)) == \
+        zlib.adler32(first + second)
+
+
+def test_shared_bands_are_reused(tmp_path):
+    width, height = 40, gameVideo.BAND_ROWS * 3 + 5
+    data = os.urandom(width * height * 3)
+    bands = {}
+    png = gameVideo.encode_png(data, width, height, bands=bands)
+    assert png == gameVideo.encode_png(data, width, height)
+    assert len(bands) == 4
+    # Changing one row only adds the band holding it.
+    changed = bytearray(data)
+    changed[:3] = b"\xff\xff\xff"
+    png = gameVideo.encode_png(bytes(changed), width, height, bands=bands)
+    assert len(bands) == 5
+    path = tmp_path / "changed.png"
+    path.write_bytes(png)
+    assert pygame.image.tobytes(pygame.image.load(str(path)), "RGB") == \
+        bytes(changed)
+
+
+def test_png_and_raw_frames_match(display, tmp_path):
+    moves = [(1, 1)]
+    frames = gameVideo.export(gameVideo.PngSink(str(tmp_path)), moves,
+                              fps=10, pause=0.1, workers=2, queue_size=2)
+    stream = io.BytesIO()
+    assert gameVideo.export(gameVideo.RawSink(stream), moves, fps=10,
+                            pause=0.1) == frames
+    raw = stream.getvalue()
+    assert len(raw) == frames * FRAME_BYTES
+    assert len(os.listdir(tmp_path)) == frames
+    for index in (0, frames // 2, frames - 1):
+        image = pygame.image.load(
+            str(tmp_path / gameVideo.FRAME_PATTERN.format(index)))
+        assert pygame.image.tobytes(image, "RGB") == \
+            raw[index * FRAME_BYTES:(index + 1) * FRAME_BYTES]
+    # The boat crossed: the last frame is not the first one.
+    assert raw[:FRAME_BYTES] != raw[-FRAME_BYTES:]
+
+
+def test_solution_stops_at_the_outcome(display):
+    losing = list(gameVideo.solution_frames([(2, 0)], fps=10))
+    assert len(list(gameVideo.solution_frames([(2, 0), (1, 0)],
+                                              fps=10))) == len(losing)
+    with pytest.raises(ValueError):
+        list(gameVideo.solution_frames([(0, 1), (1, 0)], fps=10))
+
+
+def test_optimal_solution_is_the_default(display):
+    frames = list(gameVideo.solution_frames(fps=5, pause=0))
+    changed = [changed for _, changed in frames]
+    # The first frame is drawn in full; the closing hold repeats the
+    # last position.
+    assert changed[0] and not any(changed[-4:])
+
+
+class _BlockingSink:
+    ordered = False
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.written = []
+
+    def write(self, index, data):
+        self.release.wait(5)
+        if data == b"bad":
+            raise OSError("disk full")
+        self.written.append(index)
+
+    def repeat(self, index, source, data):
+        self.written.append(index)
+
+    def close(self):
+        pass
+
+
+def test_frame_writer_bounds_the_frames_in_flight():
+    sink = _BlockingSink()
+    writer = gameVideo.FrameWriter(sink, workers=2, queue_size=3)
+    feeder = threading.Thread(
+        target=lambda: [writer.write(bytes([i])) for i in range(4)])
+    feeder.start()
+    feeder.join(0.3)
+    assert feeder.is_alive() and writer.frames == 3
+    sink.release.set()
+    feeder.join()
+    data = b"same"
+    writer.write(data)
+    writer.write(data)
+    writer.close()
+    assert sorted(sink.written) == list(range(6))
+
+
+def test_frame_writer_raises_sink_errors():
+    sink = _BlockingSink()
+    sink.release.set()
+    writer = gameVideo.FrameWriter(sink, workers=1)
+    writer.write(b"bad")
+    with pytest.raises(OSError):
+        writer.close()
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from gameCore import create_gamegraph
+from gameSolver import Solver
+from graphStore import GraphCache, GraphFileError, open_graph, write_graph
+from stateGraph import StateGraph
+
+FIELDS = ("kind", "offsets", "targets", "moves", "reachable")
+
+
+@pytest.mark.parametrize("size", [(3, 3, 2), (4, 4, 2), (20, 15, 4)])
+def test_mapped_graph_matches_built_graph(tmp_path, size):
+    built = StateGraph(*size)
+    solver = Solver(built)
+    path = str(tmp_path / "graph.mcg")
+    write_graph(path, built, solver)
+    graph, mapped, rules = open_graph(path)
+    assert rules == "classic"
+    for field in FIELDS:
+        assert list(getattr(graph, field)) == list(getattr(built, field))
+    assert list(mapped.distance_table) == list(solver.distance_table)
+    assert mapped.min_moves() == solver.min_moves()
+    assert mapped.solution() == solver.solution()
+    assert dict(graph.as_gamegraph()) == dict(built.as_gamegraph())
+
+
+def test_cache_reuses_files(tmp_path):
+    cache = GraphCache(str(tmp_path))
+    graph, solver = cache.load(3, 3, 2)
+    assert solver.min_moves() == 11
+    path = cache.path(3, 3, 2)
+    os.utime(path, (0, 0))
+    cache.load(3, 3, 2)
+    assert os.path.getmtime(path) > 0
+    gamegraph = create_gamegraph(cache=cache)
+    assert gamegraph[(3, 3, 1)]["mc"] == (2, 2, 0)
+    with pytest.raises(ValueError):
+        cache.load(3, 3, 2, rules="unknown")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = GraphCache(str(tmp_path))
+    for size, age in (((3, 3, 2), 100), ((4, 4, 3), 200), ((5, 5, 3), 300)):
+        cache.load(*size)
+        os.utime(cache.path(*size), (age, age))
+    sizes = [size for _, size, _ in cache.entries()]
+    cache.max_bytes = sum(sizes[1:])
+    assert cache.evict() == [cache.path(3, 3, 2)]
+    cache.max_bytes = 0
+    cache.load(6, 6, 3)
+    assert [path for _, _, path in cache.entries()] == [cache.path(6, 6, 3)]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.mcg"
+    path.write_bytes(b"x" * 100)
+    with pytest.raises(GraphFileError):
+        open_graph(str(path))
+    path.write_bytes(b"")
+    with pytest.raises(GraphFileError):
+        open_graph(str(path))
+
+
+@pytest.mark.parametrize("damage", ["truncate", "version", "labels"])
+def test_cache_rebuilds_damaged_files(tmp_path, damage):
+    cache = GraphCache(str(tmp_path))
+    cache.load(4, 4, 3)
+    path = cache.path(4, 4, 3)
+    with open(path, "r+b") as file:
+        data = file.read()
+        if damage == "truncate":
+            file.truncate(len(data) // 2)
+        elif damage == "version":
+            file.seek(7)
+            file.write(b"\x00")
+        else:
+            # Overwrite the JSON move labels at the end of the file.
+            file.seek(data.rindex(b'"]'))
+            file.write(b"\xff\xff")
+    with pytest.raises(GraphFileError):
+        open_graph(path)
+    graph, solver = cache.load(4, 4, 3)
+    assert solver.min_moves() == Solver(StateGraph(4, 4, 3)).min_moves()
+    assert open_graph(path)[1].solution() == solver.solution()
@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(*arguments):
+    # A fresh interpreter, to see which modules a command imports.
+    script = ("import json, sys, main; status = main.main(sys.argv[1:]); "
+              "print(json.dumps({'status': status, 'pygame': "
+              "'pygame' in sys.modules}))")
+    result = subprocess.run([sys.executable, "-c", script, *arguments],
+                            cwd=ROOT, capture_output=True, text=True,
+                            check=True)
+    *lines, summary = result.stdout.splitlines()
+    return json.loads(summary), lines
+
+
+def test_solve_prints_the_solution_without_pygame():
+    summary, lines = run("solve", "--missionaries", "3", "--cannibals", "3")
+    assert summary == {"status": 0, "pygame": False}
+    solved = json.loads(lines[0])
+    assert solved["min_moves"] == 11
+    assert len(solved["solution"]) == 11
+
+
+def test_solve_reports_unsolvable_variants():
+    summary, lines = run("solve", "--rules", "jealous-couples",
+                         "--missionaries", "4", "--cannibals", "4")
+    assert summary == {"status": 1, "pygame": False}
+    assert json.loads(lines[0])["solution"] is None
+
+
+def test_headless_bench_does_not_import_pygame(tmp_path):
+    output = str(tmp_path / "bench.json")
+    summary, _ = run("bench", "--headless", "--quick", "--output", output)
+    assert summary == {"status": 0, "pygame": False}
+    with open(output) as file:
+        assert "solver.solve[3,3,2]" in json.load(file)["results"]
+
+
+def test_unknown_commands_are_refused():
+    with pytest.raises(subprocess.CalledProcessError):
+        run("fly")
+
+
+@pytest.mark.parametrize("arguments", [
+    ("--rules", "jealous-couples", "--cannibals", "4"),
+    ("--missionaries", "0", "--cannibals", "0"),
+    ("--capacity", "0"),
+])
+def test_solve_reports_invalid_puzzles(arguments):
+    result = subprocess.run([sys.executable, "main.py", "solve", *arguments],
+                            cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "Traceback" not in result.stderr
+    assert "main.py solve: error:" in result.stderr
@@ -0,0 +1,92 @@
+import pytest
+
+from stateGraph import FAILURE, NORMAL, SUCCESS, StateGraph, boat_loads
+
+# The hand-written graph that create_gamegraph() returned before it was
+# generated, minus the unreachable failure (2, 0, 1).
+BASELINE = {
+    (3, 3, 1): {"m": (2, 3, 0), "c": (3, 2, 0), "2m": (1, 3, 0),
+                "2c": (3, 1, 0), "mc": (2, 2, 0)},
+    (3, 2, 0): {"c": (3, 3, 1)},
+    (3, 1, 0): {"c": (3, 2, 1), "2c": (3, 3, 1)},
+    (2, 2, 0): {"m": (3, 2, 1), "c": (2, 3, 1), "mc": (3, 3, 1)},
+    (3, 2, 1): {"m": (2, 2, 0), "c": (3, 1, 0),
+                "2m": (1, 2, 0), "2c": (3, 0, 0), "mc": (2, 1, 0)},
+    (3, 0, 0): {"c": (3, 1, 1), "2c": (3, 2, 1)},
+    (3, 1, 1): {"m": (2, 1, 0), "c": (3, 0, 0),
+                "2m": (1, 1, 0), "mc": (2, 0, 0)},
+    (2, 2, 1): {"m": (1, 2, 0), "c": (2, 1, 0),
+                "2m": (0, 2, 0), "2c": (2, 0, 0), "mc": (1, 1, 0)},
+    (1, 1, 0): {"m": (2, 1, 1), "c": (1, 2, 1),
+                "2m": (3, 1, 1), "2c": (1, 3, 1), "mc": (2, 2, 1)},
+    (1, 1, 1): {"m": (0, 1, 0), "c": (1, 0, 0), "mc": (0, 0, 0)},
+    (0, 3, 1): {"c": (0, 2, 0), "2c": (0, 1, 0)},
+    (0, 2, 0): {"m": (1, 2, 1), "c": (0, 3, 1),
+                "2m": (2, 2, 1), "mc": (1, 3, 1)},
+    (0, 1, 0): {"m": (1, 1, 1), "c": (0, 2, 1),
+                "2m": (2, 1, 1), "2c": (0, 3, 1), "mc": (1, 2, 1)},
+    (0, 2, 1): {"c": (0, 1, 0), "2c": (0, 0, 0)},
+    (2, 3, 0): "failure",
+    (2, 3, 1): "failure",
+    (1, 3, 0): "failure",
+    (1, 3, 1): "failure",
+    (1, 2, 0): "failure",
+    (1, 2, 1): "failure",
+    (2, 1, 0): "failure",
+    (2, 1, 1): "failure",
+    (1, 0, 0): "failure",
+    (2, 0, 0): "failure",
+    (0, 0, 0): "success"}
+
+
+def test_generated_graph_matches_baseline():
+    gamegraph = StateGraph(3, 3, 2).as_gamegraph()
+    assert len(gamegraph) == len(BASELINE)
+    for gamestate, moves in BASELINE.items():
+        generated = gamegraph[gamestate]
+        if isinstance(moves, str):
+            assert generated == moves
+        else:
+            assert dict(generated) == moves
+            assert list(generated) == list(moves)
+
+
+def test_unreachable_states_are_not_keys():
+    gamegraph = StateGraph(3, 3, 2).as_gamegraph()
+    assert (2, 0, 1) not in gamegraph
+    with pytest.raises(KeyError):
+        gamegraph[(3, 3, 0)]
+    with pytest.raises(KeyError):
+        gamegraph[(4, 0, 1)]
+
+
+@pytest.mark.parametrize("missionaries, cannibals, capacity",
+                         [(1, 0, 1), (2, 3, 1), (4, 4, 3), (5, 2, 4)])
+def test_graph_matches_naive_enumeration(missionaries, cannibals, capacity):
+    graph = StateGraph(missionaries, cannibals, capacity)
+    for state_id in range(graph.state_count):
+        m, c, b = graph.decode(state_id)
+        right_m, right_c = missionaries - m, cannibals - c
+        if 0 < m < c or 0 < right_m < right_c:
+            expected_kind = FAILURE
+        elif (m, c, b) == (0, 0, 0):
+            expected_kind = SUCCESS
+        else:
+            expected_kind = NORMAL
+        assert graph.kind[state_id] == expected_kind
+        expected = set()
+        if expected_kind == NORMAL:
+            sign = -1 if b else 1
+            bank_m, bank_c = (m, c) if b else (right_m, right_c)
+            for load_id, (dm, dc) in enumerate(boat_loads(capacity)):
+                if dm <= bank_m and dc <= bank_c:
+                    target = (m + sign * dm, c + sign * dc, 1 - b)
+                    expected.add((load_id, graph.encode(target)))
+        assert set(graph.edges(state_id)) == expected
+
+
+def test_invalid_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        StateGraph(0, 0, 2)
+    with pytest.raises(ValueError):
+        StateGraph(3, 3, 0)
@@ -0,0 +1,49 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import stateGraph  # noqa: E402
+import stateKernel  # noqa: E402
+from stateGraph import NORMAL, StateGraph, boat_loads  # noqa: E402
+
+FIELDS = ("kind", "offsets", "targets", "moves", "reachable")
+
+
+def build(monkeypatch, vectorize, *size):
+    monkeypatch.setattr(stateGraph, "VECTORIZE_MIN_STATES",
+                        0 if vectorize else float("inf"))
+    return StateGraph(*size)
+
+
+@pytest.mark.parametrize("size", [(3, 3, 2), (4, 4, 3), (1, 2, 2), (0, 3, 1),
+                                  (7, 2, 4), (2, 9, 3), (12, 12, 5)])
+def test_vectorized_build_matches_pure_build(monkeypatch, size):
+    pure = build(monkeypatch, False, *size)
+    vectorized = build(monkeypatch, True, *size)
+    for field in FIELDS:
+        assert getattr(vectorized, field) == getattr(pure, field), field
+        assert getattr(getattr(vectorized, field), "typecode", None) == \
+            getattr(getattr(pure, field), "typecode", None)
+
+
+def test_expand_matches_transition():
+    graph = StateGraph(5, 4, 3)
+    state_ids = np.arange(graph.state_count, dtype=np.int64)
+    kind = stateKernel.classify(state_ids, 5, 4)
+    assert kind.tolist() == list(graph.kind)
+    targets, valid = stateKernel.expand(
+        state_ids, np.array(boat_loads(3)), 5, 4)
+    for state_id in range(graph.state_count):
+        for load_id in range(len(graph.loads)):
+            expected = graph.transition(state_id, load_id)
+            assert valid[state_id, load_id] == (expected != -1)
+            if expected != -1:
+                assert targets[state_id, load_id] == expected
+
+
+def test_reachable_switches_to_batches(monkeypatch):
+    monkeypatch.setattr(stateKernel, "SMALL_FRONTIER", 2)
+    graph = StateGraph(6, 6, 4)
+    assert stateKernel.reachable(graph.offsets, graph.targets, graph.start,
+                                 graph.state_count) == graph.reachable
+    assert graph.kind[graph.start] == NORMAL